@@ -0,0 +1,107 @@
+import threading
+import time
+
+
+class DataVersionTracker:
+    # Cheap identity for "the data the analytics were computed from", kept
+    # per key (a data partition). Writes in this process bump the keys they
+    # touched so the next read of those keys misses immediately; writes from
+    # other workers are picked up by re-reading the key's fingerprint at
+    # most once per revalidate window.
+
+    def __init__(self, fingerprint_fn, revalidate_seconds=5.0):
+        self._fingerprint_fn = fingerprint_fn
+        self._revalidate_seconds = revalidate_seconds
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._fingerprints = {}
+
+    def bump(self, keys):
+        # Returns the version each key had before the bump (None if it was
+        # never read), which is the version its cached artifacts carry.
+        with self._lock:
+            before = {}
+            for key in keys:
+                checked = self._fingerprints.pop(key, None)
+                before[key] = (self._counters.get(key, 0), checked[0]) if checked is not None else None
+                self._counters[key] = self._counters.get(key, 0) + 1
+            return before
+
+    def current(self, session, key=None):
+        with self._lock:
+            checked = self._fingerprints.get(key)
+            stale = checked is None or time.monotonic() - checked[1] >= self._revalidate_seconds
+        if not stale:
+            fingerprint = checked[0]
+        else:
+            fingerprint = self._fingerprint_fn(session, key)
+            with self._lock:
+                self._fingerprints[key] = (fingerprint, time.monotonic())
+        with self._lock:
+            return (self._counters.get(key, 0), fingerprint)
+
+
+class VersionedCache:
+    # Holds one value per key, valid for exactly one data version of that
+    # key, so a write to one partition leaves the others' entries in place.
+    # Builds are serialized per cache so concurrent misses compute the value
+    # only once.
+
+    def __init__(self, name):
+        self.name = name
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._last_rebuild_seconds = 0.0
+        self._total_rebuild_seconds = 0.0
+
+    def _lookup(self, version, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return True, entry[1]
+        return False, None
+
+    def get_or_build(self, version, key, builder):
+        with self._lock:
+            found, value = self._lookup(version, key)
+            if found:
+                self._hits += 1
+                return value
+
+        with self._build_lock:
+            with self._lock:
+                found, value = self._lookup(version, key)
+                if found:
+                    self._hits += 1
+                    return value
+                self._misses += 1
+
+            start = time.perf_counter()
+            value = builder()
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                # Replaces the key's entry from an older version, if any.
+                self._entries[key] = (version, value)
+                self._last_rebuild_seconds = elapsed
+                self._total_rebuild_seconds += elapsed
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "last_rebuild_ms": round(self._last_rebuild_seconds * 1000, 3),
+                "avg_rebuild_ms": round(self._total_rebuild_seconds * 1000 / self._misses, 3) if self._misses else 0.0,
+                "total_rebuild_ms": round(self._total_rebuild_seconds * 1000, 3),
+            }
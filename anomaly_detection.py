@@ -0,0 +1,153 @@
+import math
+import os
+import threading
+from collections import deque
+
+from sortedcontainers import SortedList
+
+DEMAND_RISK = "Demand Risk"
+DEMAND_SPIKE = "Demand Spike"
+RISK_PERCENTILE = 20
+SPIKE_PERCENTILE = 80
+
+# Thresholds need this many games of a club season; its first MIN_HISTORY
+# games are labelled together once they have all arrived. Rolling thresholds
+# look back over at most ROLLING_WINDOW games.
+MIN_HISTORY = int(os.getenv("ANOMALY_MIN_HISTORY", "5"))
+ROLLING_WINDOW = int(os.getenv("ANOMALY_ROLLING_WINDOW", "10"))
+THRESHOLD_MODES = ("expanding", "rolling")
+
+
+def _percentile(ordered, q):
+    # Linear interpolation between closest ranks, as np.percentile does; each
+    # index into a SortedList is O(log n).
+    idx = (len(ordered) - 1) * (q / 100)
+    lo = int(math.floor(idx))
+    hi = int(math.ceil(idx))
+    weight = idx - lo
+    return float(ordered[lo]) * (1 - weight) + float(ordered[hi]) * weight
+
+
+class PercentileThresholds:
+    # Attendance of every game seen so far, or of only the last `window`
+    # games, kept sorted. Reading the P20/P80 cut-offs is a few index lookups
+    # and adding a game is one insert (plus one removal once the window is
+    # full), all O(log n).
+
+    __slots__ = ("window", "_ordered", "_recent")
+
+    def __init__(self, window=None):
+        self.window = window
+        self._ordered = SortedList()
+        self._recent = deque()
+
+    def thresholds(self):
+        if len(self._ordered) < MIN_HISTORY:
+            return None, None
+        return _percentile(self._ordered, RISK_PERCENTILE), _percentile(self._ordered, SPIKE_PERCENTILE)
+
+    def label(self, value):
+        low, high = self.thresholds()
+        tag = None
+        if low is not None:
+            if value <= low:
+                tag = DEMAND_RISK
+            elif value >= high:
+                tag = DEMAND_SPIKE
+        return tag, low, high
+
+    def add(self, value):
+        self._ordered.add(value)
+        if self.window:
+            self._recent.append(value)
+            if len(self._recent) > self.window:
+                self._ordered.remove(self._recent.popleft())
+
+
+class AnomalyDetector:
+    # Expanding and rolling thresholds of one club season. Each game is
+    # labelled against the games before it (in date order) and then added,
+    # so a stored label never changes when later games arrive. The season's
+    # first MIN_HISTORY games are held back and labelled against the
+    # thresholds of those games once the last of them arrives.
+
+    __slots__ = ("games", "last_game_id", "_thresholds", "_pending")
+
+    def __init__(self):
+        self.games = 0
+        self.last_game_id = None
+        self._thresholds = {
+            "expanding": PercentileThresholds(),
+            "rolling": PercentileThresholds(ROLLING_WINDOW),
+        }
+        self._pending = []
+
+    @classmethod
+    def from_history(cls, game_ids, attendance):
+        # Rebuilds the state after already-stored games without labelling
+        # them again; the rolling window only needs the most recent values,
+        # and games still held back are the whole history.
+        detector = cls()
+        detector._thresholds["expanding"]._ordered.update(attendance)
+        for value in attendance[-ROLLING_WINDOW:]:
+            detector._thresholds["rolling"].add(value)
+        if len(attendance) < MIN_HISTORY:
+            detector._pending = list(zip(game_ids, attendance))
+        detector.games = len(attendance)
+        detector.last_game_id = game_ids[-1] if game_ids else None
+        return detector
+
+    def _label(self, game_id, attendance):
+        rows = []
+        for mode, thresholds in self._thresholds.items():
+            tag, low, high = thresholds.label(attendance)
+            rows.append(
+                {"game_id": game_id, "mode": mode, "tag": tag, "low_threshold": low, "high_threshold": high}
+            )
+        return rows
+
+    def observe(self, game_id, attendance):
+        # Label rows ready to insert into anomaly_labels: one per threshold
+        # mode for this game, none while it is held back, and those of every
+        # held-back game when it completes the season's first MIN_HISTORY.
+        rows = [] if self.games < MIN_HISTORY else self._label(game_id, attendance)
+        for thresholds in self._thresholds.values():
+            thresholds.add(attendance)
+        self.games += 1
+        self.last_game_id = game_id
+        if self.games <= MIN_HISTORY:
+            self._pending.append((game_id, attendance))
+            if self.games == MIN_HISTORY:
+                rows = [row for pending in self._pending for row in self._label(*pending)]
+                self._pending = []
+        return rows
+
+
+class DetectorRegistry:
+    # The live detector of each club season in this process. A writer takes
+    # the detector out, labels its new games and puts it back after commit,
+    # so a rolled-back write never leaves a detector ahead of the database;
+    # a detector that does not match the stored games is rebuilt by the caller.
+
+    def __init__(self):
+        self._detectors = {}
+        self._lock = threading.Lock()
+        self._reused = 0
+        self._reloaded = 0
+
+    def take(self, partition, games, last_game_id):
+        with self._lock:
+            detector = self._detectors.pop(partition, None)
+            if detector is not None and (detector.games, detector.last_game_id) == (games, last_game_id):
+                self._reused += 1
+                return detector
+            self._reloaded += 1
+        return None
+
+    def put(self, detectors):
+        with self._lock:
+            self._detectors.update(detectors)
+
+    def stats(self):
+        with self._lock:
+            return {"partitions": len(self._detectors), "reused": self._reused, "reloaded": self._reloaded}
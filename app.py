@@ -1,32 +1,91 @@
+import base64
+import gzip
+import hashlib
 import math
 import os
-import random
-from collections import defaultdict
 from datetime import datetime
-from statistics import median
 
 try:
     import boto3
 except Exception:  # pragma: no cover - optional dependency at runtime
     boto3 = None
 
+try:
+    import brotli
+except Exception:  # pragma: no cover - optional dependency at runtime
+    brotli = None
+
 try:
     from dotenv import load_dotenv
 except Exception:  # pragma: no cover - optional dependency at runtime
     def load_dotenv():
         return False
-from flask import Flask, jsonify, request
+import numpy as np
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from sqlalchemy import func
+from sqlalchemy import and_, func, insert, literal, select, tuple_, union_all, update
 from sqlalchemy.exc import SQLAlchemyError
-
-from database import Session
-from models import Game, MerchSale, Promotion, Ticket
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+from analytics_cache import DataVersionTracker, VersionedCache
+from anomaly_detection import (
+    DEMAND_RISK,
+    DEMAND_SPIKE,
+    MIN_HISTORY,
+    ROLLING_WINDOW,
+    THRESHOLD_MODES,
+    AnomalyDetector,
+    DetectorRegistry,
+)
+from cube import GameCube
+from descriptive_stats import DistributionSet, StreamingDistribution, sorted_percentile
+from game_frame import Categorical, GameFrame, date_strings, month_labels, weekday_labels
+from database import ReadSession, Session, engine
+from forecasting import forecast_attendance
+from migrations import (
+    DEFAULT_CLUB_NAME,
+    DEFAULT_VENUE_CAPACITY,
+    SKETCH_DIMENSIONS,
+    SKETCH_METRICS,
+    merge_sketches,
+    price_digest,
+    rebuild_anomaly_labels,
+    rebuild_attendance_trend,
+    register_venues,
+    upgrade as upgrade_schema,
+)
+from models import (
+    AnomalyLabel,
+    AttendanceTrend,
+    Club,
+    Game,
+    GameSummary,
+    MerchSale,
+    Promotion,
+    QuantileSketch,
+    Ticket,
+    Venue,
+)
+from online_regression import RegressionSums
+from quantile_sketch import DEFAULT_COMPRESSION, TDigest, max_rank_error
+from segmentation import segment_groupings
+from snapshot_worker import SnapshotWorker
+from resampling import (
+    DEFAULT_ITERATIONS,
+    DEFAULT_SEED,
+    bootstrap_diff_ci,
+    bootstrap_mean_diffs,
+    bootstrap_means,
+    joint_permutation_test,
+    permutation_p_value,
+)
 
 load_dotenv()
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True, resources={r"/*": {"origins": "*"}})
+# Response headers the dashboard reads from other origins; asgi.py sends the same list.
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "X-Analytics-Snapshot-Age"]
+CORS(app, supports_credentials=True, resources={r"/*": {"origins": "*"}}, expose_headers=CORS_EXPOSE_HEADERS)
 
 # Optional S3 wiring (kept for future ingestion workflows)
 s3 = None
@@ -43,7 +102,40 @@ if boto3 is not None:
 BUCKET_NAME = "tripsbucket01"
 FILE_KEY = "Attendance.csv"
 
-STADIUM_CAPACITY = 30000
+# "per_promotion" shuffles each promotion separately; "joint" scores every
+# promotion from one shared set of shuffles and adds max-T adjusted p-values.
+INFERENCE_MODES = ("per_promotion", "joint")
+
+MAX_SCENARIO_GRID_CELLS = 250_000
+MAX_MONTE_CARLO_DRAWS = 1_000_000
+MAX_BATCH_GAMES = 5000
+MAX_GAME_DETAIL_BATCH = 200
+MAX_ATTENDANCE_PAGE = 10_000
+# Bounds on written integers, so the values and the running sums and SUMs
+# built from them (attendance squares and cross-products, line items per
+# game and season) fit SQLite's 64-bit integers.
+MAX_GAME_ATTENDANCE = 1_000_000
+MAX_LINE_ITEM_VALUE = 2**31 - 1
+SQLITE_MAX_INT = 2**63 - 1
+ATTENDANCE_STREAM_ROWS = 2000
+FORECAST_FEATURES = ("competition", "weekday", "month", "promotion_name")
+
+# Dimensions /api/segments can group by, mapped to their game frame columns.
+SEGMENT_DIMENSIONS = {
+    "season": "season",
+    "competition": "competition",
+    "weekday": "weekday",
+    "month": "month",
+    "opponent": "opponent",
+    "venue": "venue",
+    "promotion": "promotion_name",
+}
+SEGMENT_MEASURES = ("attendance", "total_revenue", "occupancy_rate", "revenue_per_attendee")
+MAX_SEGMENT_GROUPINGS = 20
+CUBE_DIMENSIONS = ("season", "month", "weekday", "competition", "opponent", "promotion")
+# Additive measures only; averages and per-attendee ratios are derived from
+# the rolled-up sums, so every cuboid answers them exactly.
+CUBE_MEASURES = ("attendance", "ticket_revenue", "merch_revenue", "total_revenue", "occupancy_rate")
 
 
 def _normalize_text(value, default="Unknown"):
@@ -61,15 +153,20 @@ def _safe_float(value, default=0.0):
     return float(value) if value is not None else default
 
 
+def _as_array(values):
+    return values if isinstance(values, np.ndarray) else np.asarray(values)
+
+
 def _mean(values):
-    return sum(values) / len(values) if values else 0.0
+    values = _as_array(values)
+    return float(values.mean()) if values.size else 0.0
 
 
 def _variance(values):
-    if len(values) < 2:
+    values = _as_array(values)
+    if values.size < 2:
         return 0.0
-    avg = _mean(values)
-    return sum((v - avg) ** 2 for v in values) / (len(values) - 1)
+    return float(values.var(ddof=1))
 
 
 def _std_dev(values):
@@ -77,11 +174,11 @@ def _std_dev(values):
 
 
 def _covariance(a_vals, b_vals):
-    if len(a_vals) != len(b_vals) or len(a_vals) < 2:
+    a_vals = _as_array(a_vals)
+    b_vals = _as_array(b_vals)
+    if a_vals.size != b_vals.size or a_vals.size < 2:
         return 0.0
-    a_mean = _mean(a_vals)
-    b_mean = _mean(b_vals)
-    return sum((a - a_mean) * (b - b_mean) for a, b in zip(a_vals, b_vals)) / (len(a_vals) - 1)
+    return float(np.dot(a_vals - a_vals.mean(), b_vals - b_vals.mean()) / (a_vals.size - 1))
 
 
 def _correlation(a_vals, b_vals):
@@ -92,26 +189,31 @@ def _correlation(a_vals, b_vals):
     return _covariance(a_vals, b_vals) / (sd_a * sd_b)
 
 
+def _median(values):
+    values = _as_array(values)
+    return float(np.median(values)) if values.size else 0.0
+
+
 def _percentile(values, q):
-    if not values:
+    values = _as_array(values)
+    if not values.size:
         return 0.0
     if q <= 0:
-        return min(values)
+        return values.min().item()
     if q >= 100:
-        return max(values)
-
-    ordered = sorted(values)
-    idx = (len(ordered) - 1) * (q / 100)
-    lo = int(math.floor(idx))
-    hi = int(math.ceil(idx))
-    if lo == hi:
-        return ordered[lo]
-    weight = idx - lo
-    return ordered[lo] * (1 - weight) + ordered[hi] * weight
+        return values.max().item()
+    return sorted_percentile(np.sort(values), q)
 
 
 def _distribution_summary(values):
-    if not values:
+    # Accepts raw values, a prebuilt StreamingDistribution or a TDigest; raw
+    # values are sorted once and every statistic is read from that pass.
+    if isinstance(values, (StreamingDistribution, TDigest)):
+        distribution = values
+    else:
+        distribution = StreamingDistribution(_as_array(values))
+    stats = distribution.summary()
+    if stats is None:
         return {
             "count": 0,
             "mean": 0.0,
@@ -127,22 +229,19 @@ def _distribution_summary(values):
             "coefficient_of_variation": 0.0,
         }
 
-    mean_val = _mean(values)
-    q1 = _percentile(values, 25)
-    q3 = _percentile(values, 75)
     return {
-        "count": len(values),
-        "mean": round(mean_val, 2),
-        "median": round(float(median(values)), 2),
-        "std_dev": round(_std_dev(values), 2),
-        "min": round(min(values), 2),
-        "max": round(max(values), 2),
-        "q1": round(q1, 2),
-        "q3": round(q3, 2),
-        "iqr": round(q3 - q1, 2),
-        "p10": round(_percentile(values, 10), 2),
-        "p90": round(_percentile(values, 90), 2),
-        "coefficient_of_variation": round((_std_dev(values) / mean_val) if mean_val else 0.0, 4),
+        "count": stats["count"],
+        "mean": round(stats["mean"], 2),
+        "median": round(stats["median"], 2),
+        "std_dev": round(stats["std_dev"], 2),
+        "min": round(stats["min"], 2),
+        "max": round(stats["max"], 2),
+        "q1": round(stats["q1"], 2),
+        "q3": round(stats["q3"], 2),
+        "iqr": round(stats["q3"] - stats["q1"], 2),
+        "p10": round(stats["p10"], 2),
+        "p90": round(stats["p90"], 2),
+        "coefficient_of_variation": round((stats["std_dev"] / stats["mean"]) if stats["mean"] else 0.0, 4),
     }
 
 
@@ -164,7 +263,7 @@ def _interpret_correlation(r_value):
     return strength
 
 
-def _methodology_notes():
+def _methodology_notes(forecast):
     return {
         "descriptive_statistics": {
             "method": "Univariate summaries (mean, median, standard deviation, quartiles, IQR, percentile bands, coefficient of variation).",
@@ -172,14 +271,16 @@ def _methodology_notes():
             "interpretation": "Median and quartiles help reduce sensitivity to outliers; CV contextualizes variability relative to average attendance.",
         },
         "trend_and_forecast": {
-            "method": "Simple ordinary least squares linear regression over game sequence, plus 3-game forecast with 80% prediction intervals using residual standard error.",
-            "why_it_is_used": "Intentionally interpretable baseline that admissions reviewers can audit quickly.",
-            "interpretation": "Slope estimates directional attendance trend per game; R^2 indicates in-sample fit; prediction intervals communicate uncertainty.",
+            "method": f"Four candidate forecasters (ordinary least squares linear trend over game sequence, seasonal-naive, simple exponential smoothing, and a competition/weekday/month/promotion regression) each produce a 3-game forecast with 80% prediction intervals from their residual standard error. The published forecast comes from the selected model: {forecast['model_label']}.",
+            "model_selection": "Each candidate is scored by rolling-origin backtest MAPE; the lowest-error model produces the published forecast, and the linear trend is used when there is too little history to backtest.",
+            "why_it_is_used": "Every candidate is a simple baseline that admissions reviewers can audit quickly; the backtest picks the one that has forecast this history best instead of assuming a linear trend.",
+            "interpretation": "The OLS slope estimates directional attendance trend per game and its R^2 the trend's in-sample fit; model_r_squared is the selected model's in-sample fit; prediction intervals communicate uncertainty.",
         },
         "promotion_inference": {
             "method": "Observed mean attendance difference versus non-promo games, with bootstrap 80% confidence intervals and permutation-test p-values.",
             "why_it_is_used": "Small-sample, nonparametric inference is more robust than strict normality assumptions for this dataset size.",
             "interpretation": "Uplift is associative, not causal. p-values quantify extremeness under a no-difference shuffle null; CI reflects plausible uplift range.",
+            "multiple_comparisons": "With inference=joint, every promotion is scored against one shared set of label shuffles and a max-T adjusted p-value controls the family-wise error rate across promotions.",
         },
         "segmentation_and_mix": {
             "method": "Grouped averages by competition, weekday, and month, plus ticket/merch mix decomposition.",
@@ -187,25 +288,32 @@ def _methodology_notes():
             "interpretation": "Use segment comparisons for prioritization, not causal claims.",
         },
         "anomaly_flagging": {
-            "method": "Percentile-based rule: bottom 20% attendance = demand risk, top 20% = demand spike.",
+            "method": f"Percentile-based rule: attendance at or below the season's P20 = demand risk, at or above its P80 = demand spike (the reported cut-offs). Each game is also labelled as it arrives against the P20/P80 of the season's earlier games, under expanding thresholds (every earlier game) and rolling thresholds (the last {ROLLING_WINDOW}); a season's first {MIN_HISTORY} games are labelled together against those games once the last of them arrives.",
             "why_it_is_used": "Transparent screening rule for triage and review in small datasets.",
             "interpretation": "Flags are prompts for investigation, not errors or definitive root-cause labels.",
         },
+        "quantile_sketches": {
+            "method": f"Ticket and merchandise unit prices (weighted by quantity) and attendance are summarized by mergeable t-digests stored per game, per segment and per season (compression {DEFAULT_COMPRESSION}); season and segment digests are merged from game digests on write and across seasons on read.",
+            "why_it_is_used": "Percentiles of transaction-level histories come from a bounded number of centroids instead of sorting every row on each request.",
+            "interpretation": f"Counts, means, standard deviations, minima and maxima are exact. Attendance quantiles are exact for up to about {int(2 * DEFAULT_COMPRESSION / math.pi)} games; beyond that, and for prices, quantile rank error is at most {max_rank_error(50):.1%} of the values at the median and {max_rank_error(10):.1%} at P10/P90.",
+        },
         "marketing_simulator": {
             "method": "Scenario model combining expected attendance uplift with historical revenue-per-attendee and user-provided media/variable costs.",
             "why_it_is_used": "Translates analytics output into operational and budgeting decisions.",
             "interpretation": "Outputs are decision-support estimates contingent on assumptions, not forecasts of guaranteed realized profit.",
+            "uncertainty": "Monte Carlo mode resamples the bootstrap distributions of uplift and revenue per attendee to report profit/ROI percentiles and the probability of a positive profit.",
         },
     }
 
 
-def _analysis_caveats():
+def _analysis_caveats(forecast):
     return [
         "Attendance records are observed outcomes; promotion comparisons are not randomized experiments.",
         "Promotion names and game-level promotion assignments are simulated for portfolio demonstration and are not verified historical club campaigns.",
         "Ticket and merchandise transaction data are synthetic and intended for scenario analysis/portfolio demonstration.",
-        "Forecasting model is a linear baseline for interpretability; it does not model opponent strength, weather, pricing, or injuries.",
+        f"The forecast comes from the simple baseline with the lowest backtest error ({forecast['model_label']}); no candidate models opponent strength, weather, pricing, or injuries.",
         "Small sample sizes for some promotions can produce wide intervals and unstable p-values.",
+        f"Ingest-time anomaly labels (anomalies_expanding, anomalies_rolling) start once a season has {MIN_HISTORY} games: a shorter season has none, and its first {MIN_HISTORY} games are judged against only each other.",
     ]
 
 
@@ -248,7 +356,7 @@ def _workflow_steps():
     ]
 
 
-def _build_recommendations(rows, promotion_effects, forecast, corr_matrix):
+def _build_recommendations(promotion_effects, forecast, corr_matrix, anomalies):
     recommendations = []
 
     if promotion_effects:
@@ -290,8 +398,7 @@ def _build_recommendations(rows, promotion_effects, forecast, corr_matrix):
             }
         )
 
-    risk_games = [r for r in rows if r["attendance"] <= _percentile([x["attendance"] for x in rows], 20)]
-    if risk_games:
+    if any(game["tag"] == DEMAND_RISK for game in anomalies):
         recommendations.append(
             {
                 "category": "Demand management",
@@ -304,33 +411,11 @@ def _build_recommendations(rows, promotion_effects, forecast, corr_matrix):
     return recommendations[:5]
 
 
-def _linear_regression(values):
-    n = len(values)
-    if n < 2:
-        return 0.0, float(values[0]) if values else 0.0, 0.0, 0.0
-
-    x_vals = list(range(1, n + 1))
-    x_mean = _mean(x_vals)
-    y_mean = _mean(values)
-
-    sxy = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, values))
-    sxx = sum((x - x_mean) ** 2 for x in x_vals)
-    slope = sxy / sxx if sxx else 0.0
-    intercept = y_mean - slope * x_mean
-
-    fitted = [intercept + slope * x for x in x_vals]
-    residuals = [actual - pred for actual, pred in zip(values, fitted)]
-    sse = sum(r ** 2 for r in residuals)
-    sst = sum((y - y_mean) ** 2 for y in values)
-    r_squared = 1 - (sse / sst) if sst else 0.0
-    residual_std_error = math.sqrt(sse / max(1, n - 2))
-
-    return slope, intercept, r_squared, residual_std_error
-
-
 def _forecast_with_intervals(values, horizon=3):
-    slope, intercept, r_squared, residual_se = _linear_regression(values)
-    n = len(values)
+    # Accepts raw values in game order or prebuilt RegressionSums.
+    sums = values if isinstance(values, RegressionSums) else RegressionSums.from_values(_as_array(values))
+    slope, intercept, r_squared, residual_se = sums.fit()
+    n = sums.n
     z_80 = 1.2816
 
     predictions = []
@@ -354,65 +439,99 @@ def _forecast_with_intervals(values, horizon=3):
     }
 
 
-def _bootstrap_diff_ci(sample_a, sample_b, iterations=2000, seed=42):
-    if not sample_a or not sample_b:
-        return 0.0, 0.0
+def _forecast_history(frame, trend_sums=None):
+    # Seasons come from the stored season column, not the calendar year, so
+    # a season that crosses New Year still counts as one.
+    games_per_season = np.bincount(frame["season"].codes)
+    games_per_season = games_per_season[games_per_season > 0]
+    columns = [frame[name] for name in FORECAST_FEATURES]
+    return {
+        "y": frame["attendance"].astype(float),
+        "features": np.column_stack([column.codes for column in columns]),
+        "levels": [len(column.categories) for column in columns],
+        "season_length": int(np.median(games_per_season)) if games_per_season.size else 1,
+        "linear_sums": trend_sums,
+    }
 
-    rng = random.Random(seed)
-    boot_diffs = []
-    for _ in range(iterations):
-        resample_a = [rng.choice(sample_a) for _ in range(len(sample_a))]
-        resample_b = [rng.choice(sample_b) for _ in range(len(sample_b))]
-        boot_diffs.append(_mean(resample_a) - _mean(resample_b))
 
-    boot_diffs.sort()
-    lower = boot_diffs[int(0.1 * len(boot_diffs))]
-    upper = boot_diffs[int(0.9 * len(boot_diffs))]
-    return lower, upper
+def _future_features(frame, horizon):
+    # Upcoming fixtures are not stored, so future games are assumed to share the
+    # most common competition and weekday and the latest game's month, with no promotion.
+    competition = frame["competition"].codes
+    weekday = frame["weekday"].codes
+    row = [
+        int(np.bincount(competition).argmax()),
+        int(np.bincount(weekday).argmax()),
+        int(frame["month"].codes[-1]),
+        frame["promotion_name"].code_of("None"),
+    ]
+    return np.array([row] * horizon, dtype=np.int64)
 
 
-def _permutation_p_value(sample_a, sample_b, iterations=2000, seed=42):
-    if not sample_a or not sample_b:
-        return 1.0
+def _compute_forecast(frame, trend_sums=None, horizon=3):
+    return forecast_attendance(_forecast_history(frame, trend_sums), _future_features(frame, horizon), horizon=horizon)
 
-    rng = random.Random(seed)
-    observed = abs(_mean(sample_a) - _mean(sample_b))
-    pooled = sample_a + sample_b
-    size_a = len(sample_a)
-    extreme_count = 0
 
-    for _ in range(iterations):
-        shuffled = pooled[:]
-        rng.shuffle(shuffled)
-        perm_a = shuffled[:size_a]
-        perm_b = shuffled[size_a:]
-        diff = abs(_mean(perm_a) - _mean(perm_b))
-        if diff >= observed:
-            extreme_count += 1
+def _bootstrap_diff_ci(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    return bootstrap_diff_ci(sample_a, sample_b, iterations=iterations, seed=seed)
 
-    return (extreme_count + 1) / (iterations + 1)
 
+def _permutation_p_value(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    return permutation_p_value(sample_a, sample_b, iterations=iterations, seed=seed)
 
-def _load_game_frame(session):
-    ticket_subquery = (
-        session.query(
-            Ticket.game_id.label("game_id"),
-            func.sum(Ticket.revenue).label("ticket_revenue"),
-            func.sum(Ticket.quantity).label("tickets_sold"),
-        )
-        .group_by(Ticket.game_id)
-        .subquery()
-    )
-    merch_subquery = (
-        session.query(
-            MerchSale.game_id.label("game_id"),
-            func.sum(MerchSale.total_revenue).label("merch_revenue"),
-            func.sum(MerchSale.quantity).label("merch_units"),
-        )
-        .group_by(MerchSale.game_id)
-        .subquery()
-    )
 
+def _partition_scope(club=None, season=None, club_id=None):
+    # The club and season a request names. A club is named by club (its
+    # name, whatever characters that holds) or by club_id, not both. Either
+    # left out means the default: the default club and its latest season;
+    # season=all keeps every season.
+    club = str(club).strip() if club not in (None, "") else None
+    club_id = str(club_id).strip() if club_id not in (None, "") else None
+    season = str(season).strip() if season not in (None, "") else None
+    if club is not None and club_id is not None:
+        raise ValueError("give club or club_id, not both")
+    if club_id is not None and not club_id.isdigit():
+        raise ValueError("club_id must be an integer")
+    if season is not None and season != "all" and not season.isdigit():
+        raise ValueError("season must be a year or 'all'")
+    return {"club": club, "club_id": int(club_id) if club_id is not None else None, "season": season}
+
+
+def _partition_scope_arg(args):
+    return _partition_scope(args.get("club"), args.get("season"), args.get("club_id"))
+
+
+def _resolve_partition(session, club=None, season=None, club_id=None):
+    # (club_id, season) for a scope, where a None season is every season of
+    # the club; None when the club is unknown. Both lookups are index seeks.
+    if club_id is not None:
+        condition = Club.id == club_id
+    else:
+        condition = Club.name == (club if club is not None else DEFAULT_CLUB_NAME)
+    club_id = session.execute(select(Club.id).where(condition)).scalar()
+    if club_id is None:
+        return None
+    if season == "all":
+        return (club_id, None)
+    if season is None:
+        latest = session.execute(select(func.max(Game.season)).where(Game.club_id == club_id)).scalar()
+        return (club_id, latest)
+    return (club_id, int(season))
+
+
+def _partition_clause(partition, model=Game):
+    club_id, season = partition
+    if season is None:
+        return model.club_id == club_id
+    return and_(model.club_id == club_id, model.season == season)
+
+
+def _partition_meta(partition):
+    club_id, season = partition
+    return {"club_id": club_id, "season": season if season is not None else "all"}
+
+
+def _load_game_frame(session, partition):
     games = (
         session.query(
             Game.id,
@@ -422,152 +541,623 @@ def _load_game_frame(session):
             Game.competition,
             Game.venue,
             Promotion.name.label("promotion_name"),
-            ticket_subquery.c.ticket_revenue,
-            ticket_subquery.c.tickets_sold,
-            merch_subquery.c.merch_revenue,
-            merch_subquery.c.merch_units,
+            GameSummary.ticket_revenue,
+            GameSummary.tickets_sold,
+            GameSummary.merch_revenue,
+            GameSummary.merch_units,
+            Venue.capacity,
+            Game.season,
         )
         .outerjoin(Promotion, Promotion.id == Game.promotion_id)
-        .outerjoin(ticket_subquery, ticket_subquery.c.game_id == Game.id)
-        .outerjoin(merch_subquery, merch_subquery.c.game_id == Game.id)
+        .outerjoin(GameSummary, GameSummary.game_id == Game.id)
+        .outerjoin(Venue, Venue.name == Game.venue)
+        .where(_partition_clause(partition))
         .order_by(Game.game_date, Game.id)
         .all()
     )
+    return _enforce_low_attendance_no_promo(_build_game_frame(games), min_games=3)
 
-    rows = []
-    for g in games:
-        attendance = _safe_int(g.attendance)
-        ticket_revenue = _safe_float(g.ticket_revenue)
-        merch_revenue = _safe_float(g.merch_revenue)
-        tickets_sold = _safe_int(g.tickets_sold)
-        merch_units = _safe_int(g.merch_units)
-        total_revenue = ticket_revenue + merch_revenue
 
-        rows.append(
-            {
-                "id": g.id,
-                "game_date": g.game_date,
-                "opponent": g.opponent,
-                "attendance": attendance,
-                "competition": _normalize_text(g.competition, "Unknown"),
-                "venue": _normalize_text(g.venue, "Unknown"),
-                "promotion_name": _normalize_text(g.promotion_name, "None"),
-                "ticket_revenue": ticket_revenue,
-                "tickets_sold": tickets_sold,
-                "merch_revenue": merch_revenue,
-                "merch_units": merch_units,
-                "total_revenue": total_revenue,
-                "occupancy_rate": attendance / STADIUM_CAPACITY if STADIUM_CAPACITY else 0.0,
-                "ticket_price_per_seat": ticket_revenue / tickets_sold if tickets_sold else 0.0,
-                "revenue_per_attendee": total_revenue / attendance if attendance else 0.0,
-                "merch_rev_per_attendee": merch_revenue / attendance if attendance else 0.0,
-                "ticket_rev_per_attendee": ticket_revenue / attendance if attendance else 0.0,
-                "merch_attach_rate": merch_units / attendance if attendance else 0.0,
-                "weekday": g.game_date.strftime("%A") if g.game_date else "Unknown",
-                "month": g.game_date.strftime("%b") if g.game_date else "Unknown",
-            }
-        )
+def _ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator != 0)
+
+
+def _build_game_frame(games):
+    columns = list(zip(*games)) if games else [()] * 13
+    ids, dates, opponents, attendance, competitions, venues, promotions = columns[:7]
+    ticket_revenue, tickets_sold, merch_revenue, merch_units, capacities, seasons = columns[7:]
+
+    game_date = np.array(dates, dtype="datetime64[D]")
+    attendance = np.array([_safe_int(v) for v in attendance], dtype=np.int64)
+    ticket_revenue = np.array([_safe_float(v) for v in ticket_revenue], dtype=float)
+    tickets_sold = np.array([_safe_int(v) for v in tickets_sold], dtype=np.int64)
+    merch_revenue = np.array([_safe_float(v) for v in merch_revenue], dtype=float)
+    merch_units = np.array([_safe_int(v) for v in merch_units], dtype=np.int64)
+    capacity = np.array([_safe_int(v, DEFAULT_VENUE_CAPACITY) for v in capacities], dtype=np.int64)
+    total_revenue = ticket_revenue + merch_revenue
+
+    return GameFrame(
+        {
+            "id": np.array(ids, dtype=np.int64),
+            "game_date": game_date,
+            "opponent": Categorical.from_values([_normalize_text(v, "") for v in opponents]),
+            "attendance": attendance,
+            "competition": Categorical.from_values([_normalize_text(v, "Unknown") for v in competitions]),
+            "venue": Categorical.from_values([_normalize_text(v, "Unknown") for v in venues]),
+            "promotion_name": Categorical.from_values([_normalize_text(v, "None") for v in promotions]),
+            "ticket_revenue": ticket_revenue,
+            "tickets_sold": tickets_sold,
+            "merch_revenue": merch_revenue,
+            "merch_units": merch_units,
+            "total_revenue": total_revenue,
+            "capacity": capacity,
+            "occupancy_rate": _ratio(attendance, capacity),
+            "ticket_price_per_seat": _ratio(ticket_revenue, tickets_sold),
+            "revenue_per_attendee": _ratio(total_revenue, attendance),
+            "merch_rev_per_attendee": _ratio(merch_revenue, attendance),
+            "ticket_rev_per_attendee": _ratio(ticket_revenue, attendance),
+            "merch_attach_rate": _ratio(merch_units.astype(float), attendance),
+            "weekday": Categorical.from_values(weekday_labels(game_date)),
+            "month": Categorical.from_values(month_labels(game_date)),
+            "season": Categorical.from_values([_normalize_text(v, "Unknown") for v in seasons]),
+        }
+    )
+
+
+def _data_fingerprint(session, partition):
+    # Size and newest game of one partition: a range of ix_games_partition,
+    # so checking a season costs the same however many other seasons are
+    # stored. Tickets, merch and promotions are only written with games.
+    return tuple(
+        session.execute(select(func.count(Game.id), func.max(Game.id)).where(_partition_clause(partition))).one()
+    )
+
+
+DATA_VERSION = DataVersionTracker(
+    _data_fingerprint,
+    revalidate_seconds=float(os.getenv("ANALYTICS_CACHE_REVALIDATE_SECONDS", "5")),
+)
+GAME_FRAME_CACHE = VersionedCache("game_frame")
+PROMOTION_EFFECTS_CACHE = VersionedCache("promotion_effects")
+MARKETING_MODEL_CACHE = VersionedCache("marketing_model")
+HOLISTIC_PAYLOAD_CACHE = VersionedCache("holistic_payload")
+FORECAST_CACHE = VersionedCache("forecast")
+CUBE_CACHE = VersionedCache("cube")
+ANOMALY_DETECTORS = DetectorRegistry()
+DESCRIPTIVE_DISTRIBUTIONS = DistributionSet(
+    {
+        "attendance": "attendance",
+        "total_revenue": "total_revenue",
+        "revenue_per_attendee": "revenue_per_attendee",
+        "ticket_revenue_per_attendee": "ticket_rev_per_attendee",
+        "merch_revenue_per_attendee": "merch_rev_per_attendee",
+        "occupancy_rate": "occupancy_rate",
+    }
+)
+
+
+def _current_data_version():
+    # The default partition moves to a new season as soon as one is stored.
+    with ReadSession() as session:
+        partition = _resolve_partition(session)
+        return partition, DATA_VERSION.current(session, partition)
+
+
+def _build_analytics_snapshot(snapshot_version):
+    partition, version = snapshot_version
+    with ReadSession() as session:
+        return {
+            "partition": partition,
+            "holistic": {
+                mode: _load_holistic_entry(session, version, partition, inference=mode) for mode in INFERENCE_MODES
+            },
+            "advanced": {
+                mode: _build_advanced_analysis(session, version, partition, inference=mode) for mode in INFERENCE_MODES
+            },
+            "marketing_model": _load_marketing_model(session, version, partition),
+            "cube": _load_cube(session, version, partition),
+        }
+
+
+# Heavy analytics for the default partition are precomputed off the request
+# path; until the first snapshot is published (or with ANALYTICS_PRECOMPUTE=0),
+# and for any partition a request names, endpoints compute through the
+# per-partition version caches inline.
+ANALYTICS_PRECOMPUTE = os.getenv("ANALYTICS_PRECOMPUTE", "1") != "0"
+ANALYTICS_SNAPSHOTS = SnapshotWorker(
+    _current_data_version,
+    _build_analytics_snapshot,
+    poll_seconds=float(os.getenv("ANALYTICS_PRECOMPUTE_POLL_SECONDS", "1")),
+)
+
+
+def _default_snapshot(scope):
+    # The snapshot only holds the default partition, so it answers requests
+    # that name neither a club nor a season.
+    if scope["club"] is None and scope["club_id"] is None and scope["season"] is None:
+        return ANALYTICS_SNAPSHOTS.latest()
+    return None
+
+
+def _partition_artifact(session, scope, load, **kwargs):
+    # (partition, artifact) for a request scope, built through the
+    # per-partition caches; partition is None when the club is unknown.
+    partition = _resolve_partition(session, **scope)
+    if partition is None:
+        return None, None
+    return partition, load(session, DATA_VERSION.current(session, partition), partition, **kwargs)
+
+
+def _unknown_club_payload(scope):
+    if scope["club_id"] is not None:
+        return {"error": f"Unknown club_id: {scope['club_id']}"}
+    return {"error": f"Unknown club: {scope['club'] or DEFAULT_CLUB_NAME}"}
+
+
+# Every cache below is keyed by partition, so each club season is loaded,
+# cached and invalidated as its own unit of work.
+def _load_cached_game_frame(session, version, partition):
+    # The cached frame is shared between requests and must be treated as read-only.
+    return GAME_FRAME_CACHE.get_or_build(version, partition, lambda: _load_game_frame(session, partition))
+
+
+def _load_cached_promotion_effects(version, partition, frame, inference="per_promotion"):
+    return PROMOTION_EFFECTS_CACHE.get_or_build(
+        version, (partition, inference), lambda: _compute_promotion_effects(frame, inference=inference)
+    )
+
+
+def _load_cached_forecast(version, partition, frame, trend_sums):
+    return FORECAST_CACHE.get_or_build(version, partition, lambda: _compute_forecast(frame, trend_sums))
+
+
+def _load_marketing_model(session, version, partition):
+    def build():
+        frame = _load_cached_game_frame(session, version, partition)
+        if not frame:
+            return None
+        return _build_marketing_model(frame, _load_cached_promotion_effects(version, partition, frame))
+
+    return MARKETING_MODEL_CACHE.get_or_build(version, partition, build)
+
+
+def _load_cube(session, version, partition):
+    def build():
+        frame = _load_cached_game_frame(session, version, partition)
+        return GameCube(frame, [SEGMENT_DIMENSIONS[key] for key in CUBE_DIMENSIONS], CUBE_MEASURES)
+
+    return CUBE_CACHE.get_or_build(version, partition, build)
+
+
+def _encode_json_entry(payload):
+    # Compact separators, as jsonify writes them outside debug mode.
+    body = (app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    encodings = {"gzip": gzip.compress(body, compresslevel=6, mtime=0)}
+    if brotli is not None:
+        encodings["br"] = brotli.compress(body)
+    return {"body": body, "etag": digest, "encodings": encodings}
+
+
+def _snapshot_headers(snapshot):
+    return {"X-Analytics-Snapshot-Age": f"{snapshot.age_seconds():.3f}"} if snapshot is not None else {}
+
+
+def _with_snapshot_headers(response, snapshot):
+    response.headers.update(_snapshot_headers(snapshot))
+    return response
+
+
+def _negotiate_json_entry(entry, accept_encoding, if_none_match):
+    # Each content-coding is a distinct representation, so it gets its own
+    # strong validator; a match on any of them means the payload is unchanged.
+    # Returns (status, body, headers) so the WSGI and ASGI apps share it.
+    accepted = parse_accept_header(accept_encoding)
+    encoding = accepted.best_match([name for name in ("br", "gzip") if name in entry["encodings"]])
+    etag = entry["etag"] if encoding is None else f"{entry['etag']}-{encoding}"
+    known_etags = [entry["etag"]] + [f"{entry['etag']}-{name}" for name in entry["encodings"]]
+    headers = {"ETag": quote_etag(etag), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if any(parse_etags(if_none_match).contains(tag) for tag in known_etags):
+        return 304, b"", headers
+    headers["Content-Type"] = "application/json"
+    if encoding is None:
+        return 200, entry["body"], headers
+    headers["Content-Encoding"] = encoding
+    return 200, entry["encodings"][encoding], headers
+
+
+def _conditional_json_response(entry):
+    status, body, headers = _negotiate_json_entry(
+        entry, request.headers.get("Accept-Encoding"), request.headers.get("If-None-Match")
+    )
+    return Response(body, status=status, headers=headers)
+
+
+def _enforce_low_attendance_no_promo(frame, min_games=3):
+    if not len(frame) or min_games <= 0:
+        return frame
 
-    return _enforce_low_attendance_no_promo(rows, min_games=3)
+    order = np.lexsort((frame["id"], frame["game_date"], frame["attendance"]))
+    lowest = order[: min(min_games, len(frame))]
+    return frame.with_column("promotion_name", frame["promotion_name"].with_label(lowest, "None"))
 
 
-def _enforce_low_attendance_no_promo(rows, min_games=3):
-    if not rows or min_games <= 0:
-        return rows
+def _inference_mode_arg(mode=None):
+    if mode is None:
+        mode = request.args.get("inference", INFERENCE_MODES[0])
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"inference must be one of: {', '.join(INFERENCE_MODES)}")
+    return mode
 
-    sorted_rows = sorted(rows, key=lambda r: (r["attendance"], r["game_date"], r["id"]))
-    for row in sorted_rows[: min(min_games, len(sorted_rows))]:
-        row["promotion_name"] = "None"
 
-    return rows
+def _promotion_names(frame):
+    return [name for name in frame["promotion_name"].categories if name != "None" and frame["promotion_name"].mask(name).any()]
 
-def _compute_promotion_effects(rows):
-    promo_names = sorted(set(r["promotion_name"] for r in rows if r["promotion_name"] != "None"))
+
+def _compute_promotion_effects(frame, inference="per_promotion"):
+    promo_names = _promotion_names(frame)
     promotion_effects = []
+    attendance = frame["attendance"]
+
+    joint_results = {}
+    if inference == "joint":
+        joint_results = joint_permutation_test(attendance, frame["promotion_name"].labels(), promo_names)
 
     for promo_name in promo_names:
-        with_promo = [r["attendance"] for r in rows if r["promotion_name"] == promo_name]
-        without_promo = [r["attendance"] for r in rows if r["promotion_name"] != promo_name]
-        if not with_promo or not without_promo:
+        mask = frame["promotion_name"].mask(promo_name)
+        with_promo = attendance[mask]
+        without_promo = attendance[~mask]
+        if not with_promo.size or not without_promo.size:
             continue
 
         uplift = _mean(with_promo) - _mean(without_promo)
         ci_low, ci_high = _bootstrap_diff_ci(with_promo, without_promo)
-        p_value = _permutation_p_value(with_promo, without_promo)
+        joint = joint_results.get(promo_name)
+        p_value = joint["p_value"] if joint else _permutation_p_value(with_promo, without_promo)
         baseline = _mean(without_promo)
 
-        with_promo_rows = [r for r in rows if r["promotion_name"] == promo_name]
-        without_promo_rows = [r for r in rows if r["promotion_name"] != promo_name]
-
-        mean_total_rev_with = _mean([r["total_revenue"] for r in with_promo_rows])
-        mean_total_rev_without = _mean([r["total_revenue"] for r in without_promo_rows])
-        mean_rev_per_att_with = _mean([r["revenue_per_attendee"] for r in with_promo_rows])
-        mean_rev_per_att_without = _mean([r["revenue_per_attendee"] for r in without_promo_rows])
+        mean_total_rev_with = _mean(frame["total_revenue"][mask])
+        mean_total_rev_without = _mean(frame["total_revenue"][~mask])
+        mean_rev_per_att_with = _mean(frame["revenue_per_attendee"][mask])
+        mean_rev_per_att_without = _mean(frame["revenue_per_attendee"][~mask])
         modeled_incremental_revenue = uplift * mean_rev_per_att_without
 
-        promotion_effects.append(
-            {
-                "promotion": promo_name,
-                "n_games_with_promo": len(with_promo),
-                "mean_with_promo": int(round(_mean(with_promo))),
-                "mean_without_promo": int(round(_mean(without_promo))),
-                "uplift_attendance": int(round(uplift)),
-                "uplift_pct": round((uplift / baseline) * 100, 2) if baseline else 0.0,
-                "ci80_low": int(round(ci_low)),
-                "ci80_high": int(round(ci_high)),
-                "permutation_p_value": round(p_value, 4),
-                "is_significant_at_10pct": p_value < 0.10,
-                "avg_total_revenue_with_promo": int(round(mean_total_rev_with)),
-                "avg_total_revenue_without_promo": int(round(mean_total_rev_without)),
-                "avg_revenue_per_attendee_with_promo": round(mean_rev_per_att_with, 2),
-                "avg_revenue_per_attendee_without_promo": round(mean_rev_per_att_without, 2),
-                "raw_avg_total_revenue_diff": int(round(mean_total_rev_with - mean_total_rev_without)),
-                "modeled_revenue_lift_from_uplift": int(round(modeled_incremental_revenue)),
-            }
-        )
+        effect = {
+            "promotion": promo_name,
+            "n_games_with_promo": int(with_promo.size),
+            "mean_with_promo": int(round(_mean(with_promo))),
+            "mean_without_promo": int(round(_mean(without_promo))),
+            "uplift_attendance": int(round(uplift)),
+            "uplift_pct": round((uplift / baseline) * 100, 2) if baseline else 0.0,
+            "ci80_low": int(round(ci_low)),
+            "ci80_high": int(round(ci_high)),
+            "permutation_p_value": round(p_value, 4),
+            "is_significant_at_10pct": p_value < 0.10,
+            "avg_total_revenue_with_promo": int(round(mean_total_rev_with)),
+            "avg_total_revenue_without_promo": int(round(mean_total_rev_without)),
+            "avg_revenue_per_attendee_with_promo": round(mean_rev_per_att_with, 2),
+            "avg_revenue_per_attendee_without_promo": round(mean_rev_per_att_without, 2),
+            "raw_avg_total_revenue_diff": int(round(mean_total_rev_with - mean_total_rev_without)),
+            "modeled_revenue_lift_from_uplift": int(round(modeled_incremental_revenue)),
+        }
+        if joint:
+            effect["max_t_adjusted_p_value"] = round(joint["max_t_adjusted_p_value"], 4)
+            effect["is_significant_at_10pct_adjusted"] = joint["max_t_adjusted_p_value"] < 0.10
+        promotion_effects.append(effect)
 
     promotion_effects.sort(key=lambda x: x["uplift_attendance"], reverse=True)
     return promotion_effects
 
 
-def _segment_summary(rows, key):
-    grouped = defaultdict(list)
-    for row in rows:
-        grouped[row.get(key, "Unknown")].append(row)
+def _build_marketing_model(frame, promotion_effects):
+    # Everything the simulator needs that depends only on the data, so each
+    # scenario is plain arithmetic on top of it.
+    default_avg_ticket_per_att = _mean(frame["ticket_rev_per_attendee"])
+    default_avg_merch_per_att = _mean(frame["merch_rev_per_attendee"])
+    attendance = frame["attendance"]
+
+    # Bootstrap draws of each assumption feed the Monte Carlo simulation mode.
+    uplift_samples = {}
+    for effect in promotion_effects:
+        mask = frame["promotion_name"].mask(effect["promotion"])
+        uplift_samples[effect["promotion"]] = bootstrap_mean_diffs(attendance[mask], attendance[~mask])
+
+    default = {
+        "expected_uplift": int(round(_mean([p["uplift_attendance"] for p in promotion_effects]))) if promotion_effects else 0,
+        "ci80_low": None,
+        "ci80_high": None,
+        "avg_ticket_per_att": default_avg_ticket_per_att,
+        "avg_merch_per_att": default_avg_merch_per_att,
+        "avg_total_per_att": default_avg_ticket_per_att + default_avg_merch_per_att,
+        "uplift_samples": np.mean(list(uplift_samples.values()), axis=0) if uplift_samples else np.zeros(1),
+        "rev_per_att_samples": bootstrap_means(frame["revenue_per_attendee"]),
+    }
 
-    summary = []
-    for group, items in grouped.items():
-        attendance = [r["attendance"] for r in items]
-        revenue = [r["total_revenue"] for r in items]
-        summary.append(
-            {
-                "segment": group,
-                "games": len(items),
-                "avg_attendance": int(round(_mean(attendance))),
-                "avg_total_revenue": int(round(_mean(revenue))),
-                "avg_occupancy_rate": round(_mean([r["occupancy_rate"] for r in items]), 4),
-                "avg_revenue_per_attendee": round(_mean([r["revenue_per_attendee"] for r in items]), 2),
-            }
+    promotions = {}
+    for effect in promotion_effects:
+        others = ~frame["promotion_name"].mask(effect["promotion"])
+        promotions[effect["promotion"]] = {
+            "expected_uplift": effect["uplift_attendance"],
+            "ci80_low": effect["ci80_low"],
+            "ci80_high": effect["ci80_high"],
+            "avg_ticket_per_att": _mean(frame["ticket_rev_per_attendee"][others]),
+            "avg_merch_per_att": _mean(frame["merch_rev_per_attendee"][others]),
+            "avg_total_per_att": effect["avg_revenue_per_attendee_without_promo"],
+            "uplift_samples": uplift_samples[effect["promotion"]],
+            "rev_per_att_samples": bootstrap_means(frame["revenue_per_attendee"][others]),
+        }
+
+    return {"default": default, "promotions": promotions}
+
+
+def _marketing_assumptions(model, promotion):
+    if promotion and promotion in model["promotions"]:
+        return model["promotions"][promotion]
+    return model["default"]
+
+
+def _simulate_scenario(assumptions, base_attendance, media_spend, variable_cost_per_incremental_fan):
+    expected_uplift = assumptions["expected_uplift"]
+    avg_total_per_att = assumptions["avg_total_per_att"]
+
+    projected_attendance = base_attendance + expected_uplift
+    incremental_revenue = expected_uplift * avg_total_per_att
+    positive_uplift = max(0, expected_uplift)
+    campaign_variable_cost = positive_uplift * variable_cost_per_incremental_fan
+    total_cost = media_spend + campaign_variable_cost
+    incremental_profit = incremental_revenue - total_cost
+
+    margin_per_incremental_fan = avg_total_per_att - variable_cost_per_incremental_fan
+    break_even_uplift = math.ceil(media_spend / margin_per_incremental_fan) if margin_per_incremental_fan > 0 else None
+    break_even_media_spend = (
+        expected_uplift * margin_per_incremental_fan
+        if expected_uplift > 0 and margin_per_incremental_fan > 0
+        else None
+    )
+    roi = (incremental_profit / total_cost) if total_cost > 0 else None
+
+    return {
+        "projected_attendance": int(round(projected_attendance)),
+        "incremental_revenue": round(incremental_revenue, 2),
+        "total_campaign_cost": round(total_cost, 2),
+        "incremental_profit": round(incremental_profit, 2),
+        "roi": round(roi, 4) if roi is not None else None,
+        "break_even_uplift_attendance": break_even_uplift,
+        "break_even_media_spend": round(break_even_media_spend, 2) if break_even_media_spend is not None else None,
+        "margin_per_incremental_fan": margin_per_incremental_fan,
+    }
+
+
+def _grid_axis(payload, key, default, integer=False):
+    # Accepts a scalar, a list, or an inclusive {"start", "stop", "step"} range.
+    spec = payload.get(key, default)
+    if isinstance(spec, dict):
+        if "start" not in spec or "stop" not in spec:
+            raise ValueError(f"{key} range requires start and stop")
+        start = float(spec["start"])
+        stop = float(spec["stop"])
+        step = float(spec.get("step", 1))
+        if step <= 0:
+            raise ValueError(f"{key}.step must be positive")
+        if (stop - start) / step >= MAX_SCENARIO_GRID_CELLS:
+            raise ValueError(f"{key} range has more than {MAX_SCENARIO_GRID_CELLS} values")
+        values = np.arange(start, stop + step / 2, step)
+    elif isinstance(spec, list):
+        values = np.asarray([float(v) for v in spec], dtype=float)
+    else:
+        values = np.asarray([float(spec)])
+
+    if not values.size:
+        raise ValueError(f"{key} must contain at least one value")
+    return values.astype(np.int64) if integer else values
+
+
+def _nullable_column(values, valid, decimals=None):
+    if decimals is not None:
+        values = np.round(values, decimals)
+    return [v if ok else None for v, ok in zip(values.tolist(), valid.tolist())]
+
+
+def _scenario_arrays(uplift, avg_total_per_att, media_spend, variable_cost):
+    # Array form of the _simulate_scenario arithmetic; inputs broadcast together.
+    incremental_revenue = uplift * avg_total_per_att
+    total_cost = media_spend + np.maximum(0, uplift) * variable_cost
+    incremental_profit = incremental_revenue - total_cost
+    margin = avg_total_per_att - variable_cost
+    has_cost = total_cost > 0
+    return {
+        "incremental_revenue": incremental_revenue,
+        "total_cost": total_cost,
+        "incremental_profit": incremental_profit,
+        "margin": margin,
+        "has_cost": has_cost,
+        "roi": incremental_profit / np.where(has_cost, total_cost, 1.0),
+    }
+
+
+def _simulate_scenario_grid(model, promotions, base_attendance, media_spend, variable_cost):
+    # Vectorized twin of _simulate_scenario over the full cartesian grid.
+    assumptions = [_marketing_assumptions(model, promotion) for promotion in promotions]
+    promo_idx, base, media, var_cost = (
+        axis.ravel()
+        for axis in np.meshgrid(
+            np.arange(len(promotions)), base_attendance, media_spend, variable_cost, indexing="ij"
         )
+    )
+    uplift = np.array([a["expected_uplift"] for a in assumptions], dtype=float)[promo_idx]
+    avg_total_per_att = np.array([a["avg_total_per_att"] for a in assumptions], dtype=float)[promo_idx]
 
+    scenario = _scenario_arrays(uplift, avg_total_per_att, media, var_cost)
+    margin = scenario["margin"]
+    has_margin = margin > 0
+    safe_margin = np.where(has_margin, margin, 1.0)
+    break_even_spend_valid = (uplift > 0) & has_margin
+
+    return {
+        "count": int(promo_idx.size),
+        "promotion_labels": [promotion or "Blended historical avg" for promotion in promotions],
+        "columns": {
+            "promotion": promo_idx.tolist(),
+            "base_attendance": base.tolist(),
+            "media_spend": np.round(media, 2).tolist(),
+            "variable_cost_per_incremental_fan": np.round(var_cost, 2).tolist(),
+            "projected_attendance": np.round(base + uplift).astype(np.int64).tolist(),
+            "incremental_revenue": np.round(scenario["incremental_revenue"], 2).tolist(),
+            "total_campaign_cost": np.round(scenario["total_cost"], 2).tolist(),
+            "incremental_profit": np.round(scenario["incremental_profit"], 2).tolist(),
+            "roi": _nullable_column(scenario["roi"], scenario["has_cost"], 4),
+            "break_even_uplift_attendance": _nullable_column(
+                np.ceil(media / safe_margin).astype(np.int64), has_margin
+            ),
+            "break_even_media_spend": _nullable_column(uplift * margin, break_even_spend_valid, 2),
+        },
+    }
+
+
+def _percentile_summary(values, decimals):
+    if not values.size:
+        return None
+    cuts = np.percentile(values, [5, 10, 25, 50, 75, 90, 95])
+    summary = {f"p{q}": round(float(v), decimals) for q, v in zip((5, 10, 25, 50, 75, 90, 95), cuts)}
+    summary["mean"] = round(float(values.mean()), decimals)
+    return summary
+
+
+def _simulate_monte_carlo(assumptions, media_spend, variable_cost_per_incremental_fan, draws, seed):
+    # Resamples the bootstrap distributions of uplift and revenue per attendee
+    # independently, then pushes every draw through the scenario arithmetic.
+    rng = np.random.default_rng(seed)
+    uplift_samples = assumptions["uplift_samples"]
+    rev_samples = assumptions["rev_per_att_samples"]
+    uplift = uplift_samples[rng.integers(0, uplift_samples.size, size=draws)]
+    rev_per_att = rev_samples[rng.integers(0, rev_samples.size, size=draws)]
+
+    scenario = _scenario_arrays(uplift, rev_per_att, media_spend, variable_cost_per_incremental_fan)
+    profit = scenario["incremental_profit"]
+    return {
+        "draws": draws,
+        "seed": seed,
+        "incremental_profit": _percentile_summary(profit, 2),
+        "roi": _percentile_summary(scenario["roi"][scenario["has_cost"]], 4),
+        "probability_profit_positive": round(float(np.count_nonzero(profit > 0)) / draws, 4),
+        "expected_uplift_attendance": _percentile_summary(uplift, 1),
+    }
+
+
+def _segment_rows(rollup, keys):
+    summary = []
+    for group in rollup:
+        games = group["games"]
+        sums = group["sums"]
+        row = {
+            "segment": " / ".join(group["labels"]),
+            "games": games,
+            "avg_attendance": int(round(sums["attendance"] / games)),
+            "avg_total_revenue": int(round(sums["total_revenue"] / games)),
+            "avg_occupancy_rate": round(sums["occupancy_rate"] / games, 4),
+            "avg_revenue_per_attendee": round(sums["revenue_per_attendee"] / games, 2),
+        }
+        if len(keys) > 1:
+            row["keys"] = dict(zip(keys, group["labels"]))
+        summary.append(row)
+    # Stable sort, so ties keep the order in which they first occur in the season.
     summary.sort(key=lambda x: x["avg_attendance"], reverse=True)
     return summary
 
 
-def _build_holistic_analysis(rows, session):
-    attendance_values = [r["attendance"] for r in rows]
-    total_attendance = sum(attendance_values)
-    total_ticket_revenue = sum(r["ticket_revenue"] for r in rows)
-    total_merch_revenue = sum(r["merch_revenue"] for r in rows)
+def _segment_summaries(frame, groupings):
+    # groupings are tuples of SEGMENT_DIMENSIONS names; all of them come from
+    # a single scan over the frame.
+    columns = [tuple(SEGMENT_DIMENSIONS[key] for key in grouping) for grouping in groupings]
+    rollups = segment_groupings(frame, columns, SEGMENT_MEASURES)
+    return [_segment_rows(rollups[column_keys], grouping) for grouping, column_keys in zip(groupings, columns)]
+
+
+def _segment_groupings_arg(values):
+    if not values:
+        raise ValueError("pass at least one by=<dimension>[,<dimension>...]")
+    if len(values) > MAX_SEGMENT_GROUPINGS:
+        raise ValueError(f"at most {MAX_SEGMENT_GROUPINGS} groupings per request")
+    groupings = []
+    for value in values:
+        grouping = tuple(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+        unknown = [key for key in grouping if key not in SEGMENT_DIMENSIONS]
+        if not grouping or unknown:
+            raise ValueError(f"by must list dimensions from: {', '.join(SEGMENT_DIMENSIONS)}")
+        groupings.append(grouping)
+    return list(dict.fromkeys(groupings))
+
+
+def _mix_rows(session, partition, model, label, quantity, revenue):
+    # Ticket or merch totals by label over the partition's games only.
+    return (
+        session.query(label, func.sum(quantity), func.sum(revenue))
+        .join(Game, Game.id == model.game_id)
+        .where(_partition_clause(partition))
+        .group_by(label)
+        .all()
+    )
+
+
+def _stored_anomalies(session, partition):
+    # The flagged games of the partition as labelled at ingest.
+    return session.execute(
+        select(
+            AnomalyLabel.game_id,
+            AnomalyLabel.mode,
+            AnomalyLabel.tag,
+            AnomalyLabel.low_threshold,
+            AnomalyLabel.high_threshold,
+        )
+        .join(Game, Game.id == AnomalyLabel.game_id)
+        .where(_partition_clause(partition), AnomalyLabel.tag.is_not(None))
+    ).all()
+
+
+def _partition_sketches(session, partition, dimension=None, metric=None):
+    # The stored season digests (or one dimension's segment digests) of the
+    # partition, keyed by (metric, segment) and merged across seasons when
+    # the partition spans several.
+    conditions = [
+        _partition_clause(partition, QuantileSketch),
+        QuantileSketch.game_id.is_(None),
+        QuantileSketch.dimension.is_(None) if dimension is None else QuantileSketch.dimension == dimension,
+    ]
+    if metric is not None:
+        conditions.append(QuantileSketch.metric == metric)
+    rows = session.execute(
+        select(QuantileSketch.metric, QuantileSketch.segment, QuantileSketch.digest)
+        .where(*conditions)
+        .order_by(QuantileSketch.season, QuantileSketch.id)
+    ).all()
+    grouped = {}
+    for row_metric, segment, digest in rows:
+        grouped.setdefault((row_metric, segment), []).append(TDigest.from_bytes(digest))
+    return {key: digests[0] if len(digests) == 1 else TDigest.merge_all(digests) for key, digests in grouped.items()}
+
+
+def _build_holistic_analysis(
+    frame, session, partition, inference="per_promotion", promotion_effects=None, distributions=None, forecast=None
+):
+    attendance_values = frame["attendance"]
+    total_attendance = int(attendance_values.sum())
+    total_ticket_revenue = float(frame["ticket_revenue"].sum())
+    total_merch_revenue = float(frame["merch_revenue"].sum())
     total_revenue = total_ticket_revenue + total_merch_revenue
-    total_merch_units = sum(r["merch_units"] for r in rows)
+    total_merch_units = int(frame["merch_units"].sum())
 
     attendance_sd = _std_dev(attendance_values)
-    forecast = _forecast_with_intervals(attendance_values, horizon=3)
-    promotion_effects = _compute_promotion_effects(rows)
+    trend_sums = _load_attendance_trend(session, frame, partition)
+    trend = _forecast_with_intervals(trend_sums, horizon=3)
+    if forecast is None:
+        forecast = _compute_forecast(frame, trend_sums)
+    if promotion_effects is None:
+        promotion_effects = _compute_promotion_effects(frame, inference=inference)
+    by_competition, by_weekday, by_month = _segment_summaries(frame, [("competition",), ("weekday",), ("month",)])
 
-    ticket_rows = session.query(Ticket.type, func.sum(Ticket.quantity), func.sum(Ticket.revenue)).group_by(Ticket.type).all()
-    merch_rows = session.query(MerchSale.item, func.sum(MerchSale.quantity), func.sum(MerchSale.total_revenue)).group_by(MerchSale.item).all()
+    ticket_rows = _mix_rows(session, partition, Ticket, Ticket.type, Ticket.quantity, Ticket.revenue)
+    merch_rows = _mix_rows(session, partition, MerchSale, MerchSale.item, MerchSale.quantity, MerchSale.total_revenue)
 
     ticket_mix = []
     total_ticket_units = sum(_safe_int(r[1]) for r in ticket_rows)
@@ -600,11 +1190,17 @@ def _build_holistic_analysis(rows, session):
     ticket_mix.sort(key=lambda x: x["revenue"], reverse=True)
     merch_mix.sort(key=lambda x: x["revenue"], reverse=True)
 
-    rev_per_att_values = [r["revenue_per_attendee"] for r in rows]
-    occ_values = [r["occupancy_rate"] for r in rows]
-    merch_per_att_values = [r["merch_rev_per_attendee"] for r in rows]
-    ticket_per_att_values = [r["ticket_rev_per_attendee"] for r in rows]
-    total_revenue_values = [r["total_revenue"] for r in rows]
+    rev_per_att_values = frame["revenue_per_attendee"]
+    occ_values = frame["occupancy_rate"]
+    merch_per_att_values = frame["merch_rev_per_attendee"]
+    ticket_per_att_values = frame["ticket_rev_per_attendee"]
+    total_revenue_values = frame["total_revenue"]
+
+    game_ids = frame["id"].tolist()
+    game_dates = date_strings(frame["game_date"])
+    opponents = frame.labels("opponent")
+    attendance_list = attendance_values.tolist()
+    total_revenue_list = total_revenue_values.tolist()
 
     corr_matrix = {
         "attendance_vs_total_revenue": round(_correlation(attendance_values, total_revenue_values), 4),
@@ -612,29 +1208,45 @@ def _build_holistic_analysis(rows, session):
         "occupancy_vs_revenue_per_attendee": round(_correlation(occ_values, rev_per_att_values), 4),
     }
 
-    low_threshold = _percentile(attendance_values, 20)
-    high_threshold = _percentile(attendance_values, 80)
-    anomaly_games = []
-    for r in rows:
-        label = None
-        if r["attendance"] <= low_threshold:
-            label = "Demand Risk"
-        elif r["attendance"] >= high_threshold:
-            label = "Demand Spike"
-
-        if label:
-            anomaly_games.append(
-                {
-                    "game_id": r["id"],
-                    "game_date": r["game_date"].strftime("%Y-%m-%d"),
-                    "opponent": r["opponent"],
-                    "attendance": r["attendance"],
-                    "total_revenue": int(round(r["total_revenue"])),
-                    "tag": label,
-                }
-            )
-
-    anomaly_games.sort(key=lambda x: x["attendance"])
+    if distributions is None:
+        distributions = DESCRIPTIVE_DISTRIBUTIONS.build(frame)
+    sketches = _partition_sketches(session, partition)
+    # The stored attendance digest gives the cut-offs when it covers exactly
+    # the frame's games; otherwise (rows written by another tool) the frame does.
+    attendance_sketch = sketches.get(("attendance", None))
+    if attendance_sketch is None or attendance_sketch.count != len(frame):
+        attendance_sketch = distributions["attendance"]
+    low_threshold = attendance_sketch.percentile(20)
+    high_threshold = attendance_sketch.percentile(80)
+    # The default anomalies are labelled against the season-wide cut-offs
+    # reported in the descriptive statistics; the labels stored at ingest,
+    # against each game's earlier games, are reported alongside them.
+    row_of = {game_id: i for i, game_id in enumerate(game_ids)}
+    flagged = {mode: [] for mode in ("season", *THRESHOLD_MODES)}
+    for i, attendance in enumerate(attendance_list):
+        if attendance <= low_threshold:
+            flagged["season"].append((i, DEMAND_RISK, low_threshold))
+        elif attendance >= high_threshold:
+            flagged["season"].append((i, DEMAND_SPIKE, high_threshold))
+    for game_id, mode, tag, low, high in _stored_anomalies(session, partition):
+        i = row_of.get(game_id)
+        if i is not None:
+            flagged[mode].append((i, tag, low if tag == DEMAND_RISK else high))
+    anomaly_games = {}
+    for mode, rows in flagged.items():
+        rows.sort(key=lambda row: (attendance_list[row[0]], row[0]))
+        anomaly_games[mode] = [
+            {
+                "game_id": game_ids[i],
+                "game_date": game_dates[i],
+                "opponent": opponents[i],
+                "attendance": attendance_list[i],
+                "total_revenue": int(round(total_revenue_list[i])),
+                "tag": tag,
+                "threshold": round(threshold, 2),
+            }
+            for i, tag, threshold in rows
+        ]
 
     season_story = []
     if promotion_effects:
@@ -644,7 +1256,7 @@ def _build_holistic_analysis(rows, session):
         )
 
     season_story.append(
-        f"Median attendance is {int(round(median(attendance_values))):,} with volatility (CV) {round(attendance_sd / _mean(attendance_values), 4) if _mean(attendance_values) else 0.0}."
+        f"Median attendance is {int(round(_median(attendance_values))):,} with volatility (CV) {round(attendance_sd / _mean(attendance_values), 4) if _mean(attendance_values) else 0.0}."
     )
     season_story.append(
         f"Forecasted next-game attendance is {forecast['predictions'][0]['predicted_attendance']:,} (80% PI {forecast['predictions'][0]['pi80_low']:,}-{forecast['predictions'][0]['pi80_high']:,})."
@@ -661,12 +1273,9 @@ def _build_holistic_analysis(rows, session):
         )
 
     descriptive_statistics = {
-        "attendance": _distribution_summary(attendance_values),
-        "total_revenue": _distribution_summary(total_revenue_values),
-        "revenue_per_attendee": _distribution_summary(rev_per_att_values),
-        "ticket_revenue_per_attendee": _distribution_summary(ticket_per_att_values),
-        "merch_revenue_per_attendee": _distribution_summary(merch_per_att_values),
-        "occupancy_rate": _distribution_summary(occ_values),
+        **{metric: _distribution_summary(distribution) for metric, distribution in distributions.items()},
+        "ticket_price": _distribution_summary(sketches.get(("ticket_price", None), TDigest())),
+        "merch_price": _distribution_summary(sketches.get(("merch_price", None), TDigest())),
         "thresholds": {
             "attendance_p20_demand_risk_cutoff": round(low_threshold, 2),
             "attendance_p80_demand_spike_cutoff": round(high_threshold, 2),
@@ -677,8 +1286,10 @@ def _build_holistic_analysis(rows, session):
         "context": _project_context(),
         "workflow": _workflow_steps(),
         "meta": {
-            "sample_size_games": len(rows),
-            "stadium_capacity": STADIUM_CAPACITY,
+            "sample_size_games": len(frame),
+            "partition": _partition_meta(partition),
+            "stadium_capacity": int(_median(frame["capacity"])),
+            "promotion_inference_mode": inference,
             "data_sources": {
                 "attendance_csv": FILE_KEY,
                 "database": "nashville_sc_business.db",
@@ -689,10 +1300,10 @@ def _build_holistic_analysis(rows, session):
         },
         "kpis": {
             "avg_attendance": int(round(_mean(attendance_values))),
-            "median_attendance": int(round(median(attendance_values))),
+            "median_attendance": int(round(_median(attendance_values))),
             "attendance_std_dev": round(attendance_sd, 2),
-            "attendance_trend_per_game": forecast["slope_per_game"],
-            "forecast_r_squared": forecast["r_squared"],
+            "attendance_trend_per_game": trend["slope_per_game"],
+            "forecast_r_squared": trend["r_squared"],
             "total_ticket_revenue": int(round(total_ticket_revenue)),
             "total_merch_revenue": int(round(total_merch_revenue)),
             "total_revenue": int(round(total_revenue)),
@@ -700,34 +1311,48 @@ def _build_holistic_analysis(rows, session):
             "ticket_revenue_per_attendee": round(total_ticket_revenue / total_attendance, 2) if total_attendance else 0.0,
             "merch_revenue_per_attendee": round(total_merch_revenue / total_attendance, 2) if total_attendance else 0.0,
             "merch_units_per_1000_attendees": round((total_merch_units / total_attendance) * 1000, 2) if total_attendance else 0.0,
-            "avg_occupancy_rate": round(_mean([r["occupancy_rate"] for r in rows]), 4),
+            "avg_occupancy_rate": round(_mean(occ_values), 4),
         },
         "attendance_time_series": [
             {
-                "game_id": r["id"],
-                "game_date": r["game_date"].strftime("%Y-%m-%d"),
-                "opponent": r["opponent"],
-                "attendance": r["attendance"],
-                "occupancy_rate": round(r["occupancy_rate"], 4),
-                "total_revenue": int(round(r["total_revenue"])),
-                "revenue_per_attendee": round(r["revenue_per_attendee"], 2),
-                "promotion_name": r["promotion_name"],
-                "competition": r["competition"],
-                "weekday": r["weekday"],
+                "game_id": game_id,
+                "game_date": game_date,
+                "opponent": opponent,
+                "attendance": attendance,
+                "occupancy_rate": round(occupancy, 4),
+                "total_revenue": int(round(revenue)),
+                "revenue_per_attendee": round(rev_per_att, 2),
+                "promotion_name": promotion_name,
+                "competition": competition,
+                "weekday": weekday,
             }
-            for r in rows
+            for game_id, game_date, opponent, attendance, occupancy, revenue, rev_per_att, promotion_name, competition, weekday in zip(
+                game_ids,
+                game_dates,
+                opponents,
+                attendance_list,
+                occ_values.tolist(),
+                total_revenue_list,
+                rev_per_att_values.tolist(),
+                frame.labels("promotion_name"),
+                frame.labels("competition"),
+                frame.labels("weekday"),
+            )
         ],
         "forecast": {
-            "history_labels": [r["game_date"].strftime("%Y-%m-%d") for r in rows],
-            "history_attendance": attendance_values,
+            "history_labels": game_dates,
+            "history_attendance": attendance_list,
             "predictions": forecast["predictions"],
+            "model": forecast["model"],
+            "model_label": forecast["model_label"],
             "model_r_squared": forecast["r_squared"],
+            "backtest": forecast["backtest"],
         },
         "promotion_effects": promotion_effects,
         "segments": {
-            "by_competition": _segment_summary(rows, "competition"),
-            "by_weekday": _segment_summary(rows, "weekday"),
-            "by_month": _segment_summary(rows, "month"),
+            "by_competition": by_competition,
+            "by_weekday": by_weekday,
+            "by_month": by_month,
         },
         "mix": {
             "ticket_mix": ticket_mix,
@@ -738,61 +1363,208 @@ def _build_holistic_analysis(rows, session):
             "descriptive": descriptive_statistics,
             "associations": association_summary,
         },
-        "methods": _methodology_notes(),
-        "caveats": _analysis_caveats(),
-        "recommendations": _build_recommendations(rows, promotion_effects, forecast, corr_matrix),
-        "anomalies": anomaly_games,
+        "methods": _methodology_notes(forecast),
+        "caveats": _analysis_caveats(forecast),
+        "recommendations": _build_recommendations(promotion_effects, forecast, corr_matrix, anomaly_games["season"]),
+        "anomalies": anomaly_games["season"],
+        "anomalies_expanding": anomaly_games["expanding"],
+        "anomalies_rolling": anomaly_games["rolling"],
         "insights": season_story,
     }
 
 
+@app.before_request
+def _start_snapshot_worker():
+    # Started lazily so importing app (scripts, the debug reloader parent)
+    # does not spawn a worker that never serves a request.
+    if ANALYTICS_PRECOMPUTE:
+        ANALYTICS_SNAPSHOTS.start()
+
+
+def _attendance_date_arg(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format") from None
+
+
+def _encode_attendance_cursor(row):
+    return base64.urlsafe_b64encode(f"{row.game_date.isoformat()},{row.id}".encode("ascii")).decode("ascii")
+
+
+def _decode_attendance_cursor(cursor):
+    try:
+        game_date, game_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii").split(",")
+        return datetime.strptime(game_date, "%Y-%m-%d").date(), int(game_id)
+    except ValueError:
+        raise ValueError("cursor is not valid") from None
+
+
+def _attendance_args(args):
+    limit = args.get("limit")
+    if limit is not None:
+        limit = int(limit) if limit.isdigit() else 0
+        if not 0 < limit <= MAX_ATTENDANCE_PAGE:
+            raise ValueError(f"limit must be an integer between 1 and {MAX_ATTENDANCE_PAGE}")
+    cursor = args.get("cursor")
+    return {
+        "start": _attendance_date_arg(args, "start"),
+        "end": _attendance_date_arg(args, "end"),
+        "after": _decode_attendance_cursor(cursor) if cursor else None,
+        "limit": limit,
+    }
+
+
+def _attendance_query(partition, start=None, end=None, after=None, limit=None):
+    # Keyset order on (game_date, id) within one club season, which
+    # ix_games_partition covers, so every page is an index range scan
+    # however deep the cursor is.
+    stmt = (
+        select(Game.id, Game.game_date, Game.opponent, Game.attendance)
+        .where(_partition_clause(partition))
+        .order_by(Game.game_date, Game.id)
+    )
+    if start is not None:
+        stmt = stmt.where(Game.game_date >= start)
+    if end is not None:
+        stmt = stmt.where(Game.game_date <= end)
+    if after is not None:
+        stmt = stmt.where(tuple_(Game.game_date, Game.id) > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _stream_attendance_rows(stmt):
+    with ReadSession() as session:
+        yield from session.execute(stmt.execution_options(yield_per=ATTENDANCE_STREAM_ROWS)).partitions()
+
+
+def _attendance_json(batches):
+    # Same bytes jsonify produces for the whole list, built one batch at a time.
+    yield "["
+    separator = ""
+    for rows in batches:
+        yield separator + ",".join(
+            app.json.dumps(
+                {"id": game_id, "game_date": game_date.isoformat(), "opponent": opponent, "attendance": attendance},
+                separators=(",", ":"),
+            )
+            for game_id, game_date, opponent, attendance in rows
+        )
+        separator = ","
+    yield "]\n"
+
+
 @app.route("/attendance")
 def get_attendance():
-    with Session() as session:
-        games = session.query(Game).order_by(Game.game_date).all()
-        return jsonify(
-            [
-                {
-                    "id": game.id,
-                    "game_date": game.game_date.strftime("%Y-%m-%d"),
-                    "opponent": game.opponent,
-                    "attendance": game.attendance,
-                }
-                for game in games
-            ]
-        )
+    try:
+        filters = _attendance_args(request.args)
+        scope = _partition_scope_arg(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with ReadSession() as session:
+        partition = _resolve_partition(session, **scope)
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+
+    limit = filters.pop("limit")
+    headers = {}
+    if limit is None:
+        batches = _stream_attendance_rows(_attendance_query(partition, **filters))
+    else:
+        # Reading one row past the page tells whether another page follows
+        # before any of the body has been sent.
+        with ReadSession() as session:
+            page = session.execute(_attendance_query(partition, limit=limit + 1, **filters)).all()
+        if len(page) > limit:
+            page = page[:limit]
+            headers["X-Next-Cursor"] = _encode_attendance_cursor(page[-1])
+        batches = [page] if page else []
+    return Response(_attendance_json(batches), mimetype="application/json", headers=headers)
+
+
+def _health_payload(game_count):
+    return {
+        "status": "ok",
+        "service": "nsc-analytics-api",
+        "port_hint": os.getenv("FLASK_PORT", "5000"),
+        "game_count": game_count,
+    }
+
+
+def _health_error_payload(error):
+    return {"status": "error", "service": "nsc-analytics-api", "error": str(error)}
+
+
+GAME_COUNT_QUERY = select(func.count()).select_from(Game)
 
 
 @app.route("/api/health", methods=["GET"])
 def api_health():
     try:
-        with Session() as session:
-            game_count = session.query(Game).count()
-        return jsonify(
-            {
-                "status": "ok",
-                "service": "nsc-analytics-api",
-                "port_hint": os.getenv("FLASK_PORT", "5000"),
-                "game_count": game_count,
-            }
-        )
+        with ReadSession() as session:
+            game_count = session.execute(GAME_COUNT_QUERY).scalar()
+        return jsonify(_health_payload(game_count))
     except Exception as e:
-        return jsonify({"status": "error", "service": "nsc-analytics-api", "error": str(e)}), 500
+        return jsonify(_health_error_payload(e)), 500
+
+
+@app.route("/api/metrics", methods=["GET"])
+def api_metrics():
+    return jsonify(
+        {
+            "caches": {
+                GAME_FRAME_CACHE.name: GAME_FRAME_CACHE.stats(),
+                PROMOTION_EFFECTS_CACHE.name: PROMOTION_EFFECTS_CACHE.stats(),
+                MARKETING_MODEL_CACHE.name: MARKETING_MODEL_CACHE.stats(),
+                HOLISTIC_PAYLOAD_CACHE.name: HOLISTIC_PAYLOAD_CACHE.stats(),
+                FORECAST_CACHE.name: FORECAST_CACHE.stats(),
+                CUBE_CACHE.name: CUBE_CACHE.stats(),
+            },
+            "descriptive_distributions": DESCRIPTIVE_DISTRIBUTIONS.stats(),
+            "anomaly_detectors": ANOMALY_DETECTORS.stats(),
+            "snapshot": ANALYTICS_SNAPSHOTS.status(),
+        }
+    )
 
 
 @app.route("/api/analysis", methods=["GET"])
 def get_dashboard_metrics():
-    with Session() as session:
-        total_attendance = session.query(func.sum(Game.attendance)).scalar()
-        game_count = session.query(Game).count()
+    try:
+        scope = _partition_scope_arg(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with ReadSession() as session:
+        partition = _resolve_partition(session, **scope)
+        if partition is None:
+            return jsonify(_unknown_club_payload(scope)), 404
+        in_partition = _partition_clause(partition)
+        total_attendance = session.query(func.sum(Game.attendance)).where(in_partition).scalar() or 0
+        game_count = session.query(func.count(Game.id)).where(in_partition).scalar()
         avg_attendance = total_attendance / game_count if game_count else 0
 
-        total_ticket_revenue = session.query(func.sum(Ticket.revenue)).scalar() or 0
-        total_merch_revenue = session.query(func.sum(MerchSale.total_revenue)).scalar() or 0
+        total_ticket_revenue = (
+            session.query(func.sum(Ticket.revenue)).join(Game, Game.id == Ticket.game_id).where(in_partition).scalar()
+            or 0
+        )
+        total_merch_revenue = (
+            session.query(func.sum(MerchSale.total_revenue))
+            .join(Game, Game.id == MerchSale.game_id)
+            .where(in_partition)
+            .scalar()
+            or 0
+        )
 
         promo_performance = (
             session.query(Promotion.name, func.avg(Game.attendance))
             .join(Game)
+            .where(in_partition)
             .group_by(Promotion.name)
             .all()
         )
@@ -809,183 +1581,751 @@ def get_dashboard_metrics():
         )
 
 
+def _build_advanced_analysis(session, version, partition, inference="per_promotion"):
+    frame = _load_cached_game_frame(session, version, partition)
+    if not frame:
+        return None
+    trend_sums = _load_attendance_trend(session, frame, partition)
+
+    attendance_values = frame["attendance"]
+    total_attendance = int(attendance_values.sum())
+    total_ticket_revenue = float(frame["ticket_revenue"].sum())
+    total_merch_revenue = float(frame["merch_revenue"].sum())
+    total_merch_units = int(frame["merch_units"].sum())
+
+    attendance_sd = _std_dev(attendance_values)
+    coefficient_of_variation = (attendance_sd / _mean(attendance_values)) if _mean(attendance_values) else 0.0
+
+    trend = _forecast_with_intervals(trend_sums, horizon=3)
+    forecast = _load_cached_forecast(version, partition, frame, trend_sums)
+    promotion_effects = _load_cached_promotion_effects(version, partition, frame, inference=inference)
+
+    return {
+        "sample_size_games": len(frame),
+        "partition": _partition_meta(partition),
+        "promotion_inference_mode": inference,
+        "attendance": {
+            "mean": int(round(_mean(attendance_values))),
+            "median": int(round(_median(attendance_values))),
+            "std_dev": round(attendance_sd, 2),
+            "min": attendance_values.min().item(),
+            "max": attendance_values.max().item(),
+            "coefficient_of_variation": round(coefficient_of_variation, 4),
+            "trend_per_game": trend["slope_per_game"],
+        },
+        "revenue": {
+            "total_ticket_revenue": int(round(total_ticket_revenue)),
+            "total_merch_revenue": int(round(total_merch_revenue)),
+            "ticket_revenue_per_attendee": round(total_ticket_revenue / total_attendance, 2)
+            if total_attendance
+            else 0.0,
+            "merch_revenue_per_attendee": round(total_merch_revenue / total_attendance, 2)
+            if total_attendance
+            else 0.0,
+            "merch_units_per_1000_attendees": round((total_merch_units / total_attendance) * 1000, 2)
+            if total_attendance
+            else 0.0,
+        },
+        "forecast": {
+            "history_labels": date_strings(frame["game_date"]),
+            "history_attendance": attendance_values.tolist(),
+            "predictions": forecast["predictions"],
+            "model": forecast["model"],
+            "model_label": forecast["model_label"],
+            "model_r_squared": forecast["r_squared"],
+            "backtest": forecast["backtest"],
+        },
+        "promotion_effects": promotion_effects,
+    }
+
+
 @app.route("/api/advanced_analysis", methods=["GET"])
 def advanced_analysis():
-    with Session() as session:
-        rows = _load_game_frame(session)
+    try:
+        inference = _inference_mode_arg()
+        scope = _partition_scope_arg(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    snapshot = _default_snapshot(scope)
+    if snapshot is not None:
+        partition, payload = snapshot.artifacts["partition"], snapshot.artifacts["advanced"][inference]
+    else:
+        with ReadSession() as session:
+            partition, payload = _partition_artifact(session, scope, _build_advanced_analysis, inference=inference)
 
-    if not rows:
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    if payload is None:
         return jsonify({"error": "No games available for analysis"}), 404
+    return _with_snapshot_headers(jsonify(payload), snapshot)
+
+
+def _load_holistic_entry(session, version, partition, inference="per_promotion"):
+    def build():
+        frame = _load_cached_game_frame(session, version, partition)
+        if not frame:
+            return None
+        promotion_effects = _load_cached_promotion_effects(version, partition, frame, inference=inference)
+        distributions = DESCRIPTIVE_DISTRIBUTIONS.get(version, frame, partition)
+        forecast = _load_cached_forecast(
+            version, partition, frame, _load_attendance_trend(session, frame, partition)
+        )
+        return _encode_json_entry(
+            _build_holistic_analysis(
+                frame,
+                session,
+                partition,
+                inference=inference,
+                promotion_effects=promotion_effects,
+                distributions=distributions,
+                forecast=forecast,
+            )
+        )
 
-    attendance_values = [row["attendance"] for row in rows]
-    total_attendance = sum(attendance_values)
-    total_ticket_revenue = sum(row["ticket_revenue"] for row in rows)
-    total_merch_revenue = sum(row["merch_revenue"] for row in rows)
-    total_merch_units = sum(row["merch_units"] for row in rows)
+    return HOLISTIC_PAYLOAD_CACHE.get_or_build(version, (partition, inference), build)
 
-    attendance_sd = _std_dev(attendance_values)
-    coefficient_of_variation = (attendance_sd / _mean(attendance_values)) if _mean(attendance_values) else 0.0
 
-    forecast = _forecast_with_intervals(attendance_values, horizon=3)
-    promotion_effects = _compute_promotion_effects(rows)
+@app.route("/api/holistic_analysis", methods=["GET"])
+def holistic_analysis():
+    try:
+        inference = _inference_mode_arg()
+        scope = _partition_scope_arg(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    snapshot = _default_snapshot(scope)
+    if snapshot is not None:
+        partition, entry = snapshot.artifacts["partition"], snapshot.artifacts["holistic"][inference]
+    else:
+        with ReadSession() as session:
+            partition, entry = _partition_artifact(session, scope, _load_holistic_entry, inference=inference)
+
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    if entry is None:
+        return jsonify({"error": "No games available for analysis"}), 404
+    return _with_snapshot_headers(_conditional_json_response(entry), snapshot)
+
 
+@app.route("/api/segments", methods=["GET"])
+def segments():
+    # /api/segments?by=opponent&by=competition,weekday: one scan over the
+    # cached game frame answers every grouping in the request.
+    try:
+        groupings = _segment_groupings_arg(request.args.getlist("by"))
+        scope = _partition_scope_arg(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with ReadSession() as session:
+        partition, frame = _partition_artifact(session, scope, _load_cached_game_frame)
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    summaries = _segment_summaries(frame, groupings)
     return jsonify(
         {
-            "sample_size_games": len(rows),
-            "attendance": {
-                "mean": int(round(_mean(attendance_values))),
-                "median": int(round(median(attendance_values))),
-                "std_dev": round(attendance_sd, 2),
-                "min": min(attendance_values),
-                "max": max(attendance_values),
-                "coefficient_of_variation": round(coefficient_of_variation, 4),
-                "trend_per_game": forecast["slope_per_game"],
-            },
-            "revenue": {
-                "total_ticket_revenue": int(round(total_ticket_revenue)),
-                "total_merch_revenue": int(round(total_merch_revenue)),
-                "ticket_revenue_per_attendee": round(total_ticket_revenue / total_attendance, 2)
-                if total_attendance
-                else 0.0,
-                "merch_revenue_per_attendee": round(total_merch_revenue / total_attendance, 2)
-                if total_attendance
-                else 0.0,
-                "merch_units_per_1000_attendees": round((total_merch_units / total_attendance) * 1000, 2)
-                if total_attendance
-                else 0.0,
-            },
-            "forecast": {
-                "history_labels": [row["game_date"].strftime("%Y-%m-%d") for row in rows],
-                "history_attendance": attendance_values,
-                "predictions": forecast["predictions"],
-                "model_r_squared": forecast["r_squared"],
-            },
-            "promotion_effects": promotion_effects,
+            "games": len(frame),
+            "partition": _partition_meta(partition),
+            "segments": {",".join(grouping): rows for grouping, rows in zip(groupings, summaries)},
         }
     )
 
 
-@app.route("/api/holistic_analysis", methods=["GET"])
-def holistic_analysis():
-    with Session() as session:
-        rows = _load_game_frame(session)
-        if not rows:
-            return jsonify({"error": "No games available for analysis"}), 404
-        payload = _build_holistic_analysis(rows, session)
-        return jsonify(payload)
+def _distribution_args(args):
+    metric = args.get("metric") or "ticket_price"
+    if metric not in SKETCH_METRICS:
+        raise ValueError(f"metric must be one of: {', '.join(SKETCH_METRICS)}")
+    by = args.get("by") or None
+    if by is not None and by not in SKETCH_DIMENSIONS:
+        raise ValueError(f"by must be one of: {', '.join(SKETCH_DIMENSIONS)}")
+    return metric, by, _partition_scope_arg(args)
 
 
-@app.route("/api/simulate_marketing", methods=["POST"])
-def simulate_marketing():
-    payload = request.get_json(silent=True) or {}
+def _sketch_error():
+    return {
+        "compression": DEFAULT_COMPRESSION,
+        "max_rank_error": {
+            name: round(max_rank_error(q), 4) for name, q in (("p10", 10), ("q1", 25), ("median", 50), ("q3", 75), ("p90", 90))
+        },
+    }
 
-    promotion = payload.get("promotion")
-    base_attendance = int(payload.get("base_attendance", 22000))
-    media_spend = float(payload.get("media_spend", 0))
-    variable_cost_per_incremental_fan = float(payload.get("variable_cost_per_incremental_fan", 0))
 
-    with Session() as session:
-        rows = _load_game_frame(session)
+@app.route("/api/distributions", methods=["GET"])
+def distributions():
+    # /api/distributions?metric=ticket_price&by=competition: summaries of the
+    # partition and of each segment, read from the stored digests alone.
+    try:
+        metric, by, scope = _distribution_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with ReadSession() as session:
+        partition = _resolve_partition(session, **scope)
+        if partition is None:
+            return jsonify(_unknown_club_payload(scope)), 404
+        overall = _partition_sketches(session, partition, metric=metric).get((metric, None), TDigest())
+        segments = _partition_sketches(session, partition, by, metric) if by is not None else {}
+    ordered = sorted(segments.items(), key=lambda item: (-item[1].count, item[0][1]))
+    return jsonify(
+        {
+            "metric": metric,
+            "partition": _partition_meta(partition),
+            "summary": _distribution_summary(overall),
+            "segments": [dict(segment=segment, **_distribution_summary(digest)) for (_, segment), digest in ordered],
+            "error": _sketch_error(),
+        }
+    )
 
-    if not rows:
-        return jsonify({"error": "No games available for analysis"}), 404
 
-    default_avg_ticket_per_att = _mean([r["ticket_rev_per_attendee"] for r in rows])
-    default_avg_merch_per_att = _mean([r["merch_rev_per_attendee"] for r in rows])
-    default_avg_total_per_att = default_avg_ticket_per_att + default_avg_merch_per_att
-
-    promo_effects = _compute_promotion_effects(rows)
-    selected = None
-    if promotion:
-        selected = next((p for p in promo_effects if p["promotion"] == promotion), None)
-
-    expected_uplift = selected["uplift_attendance"] if selected else int(round(_mean([p["uplift_attendance"] for p in promo_effects]))) if promo_effects else 0
-    ci_low = selected["ci80_low"] if selected else None
-    ci_high = selected["ci80_high"] if selected else None
-    avg_total_per_att = (
-        selected["avg_revenue_per_attendee_without_promo"]
-        if selected
-        else default_avg_total_per_att
-    )
-    avg_ticket_per_att = (
-        _mean([r["ticket_rev_per_attendee"] for r in rows if r["promotion_name"] != promotion])
-        if selected
-        else default_avg_ticket_per_att
-    )
-    avg_merch_per_att = (
-        _mean([r["merch_rev_per_attendee"] for r in rows if r["promotion_name"] != promotion])
-        if selected
-        else default_avg_merch_per_att
-    )
+def _cube_query_args(args):
+    # season picks the partition as on every analysis endpoint; repeating it
+    # builds the club's all-season cube and keeps just those seasons.
+    group_by = tuple(dict.fromkeys(part.strip() for part in args.get("by", "").split(",") if part.strip()))
+    filters = {key: args.getlist(key) for key in CUBE_DIMENSIONS if key != "season" and args.getlist(key)}
+    unknown = [key for key in group_by if key not in CUBE_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"by must list dimensions from: {', '.join(CUBE_DIMENSIONS)}")
+    seasons = list(dict.fromkeys(args.getlist("season")))
+    if len(seasons) > 1:
+        filters["season"] = [_partition_scope(season=season)["season"] for season in seasons]
+        return group_by, filters, _partition_scope(args.get("club"), "all", args.get("club_id"))
+    return group_by, filters, _partition_scope_arg(args)
+
+
+def _cube_row(group, group_by):
+    games = group["games"]
+    sums = group["sums"]
+    attendance = sums["attendance"]
+    return {
+        "keys": dict(zip(group_by, group["labels"])),
+        "games": games,
+        "attendance": int(round(attendance)),
+        "avg_attendance": round(attendance / games, 1),
+        "total_revenue": round(sums["total_revenue"], 2),
+        "ticket_revenue": round(sums["ticket_revenue"], 2),
+        "merch_revenue": round(sums["merch_revenue"], 2),
+        "avg_total_revenue": round(sums["total_revenue"] / games, 2),
+        "avg_occupancy_rate": round(sums["occupancy_rate"] / games, 4),
+        "revenue_per_attendee": round(sums["total_revenue"] / attendance, 2) if attendance else 0.0,
+        "ticket_rev_per_attendee": round(sums["ticket_revenue"] / attendance, 2) if attendance else 0.0,
+        "merch_rev_per_attendee": round(sums["merch_revenue"] / attendance, 2) if attendance else 0.0,
+    }
 
-    projected_attendance = base_attendance + expected_uplift
-    incremental_revenue = expected_uplift * avg_total_per_att
-    positive_uplift = max(0, expected_uplift)
-    campaign_variable_cost = positive_uplift * variable_cost_per_incremental_fan
-    total_cost = media_spend + campaign_variable_cost
-    incremental_profit = incremental_revenue - total_cost
 
-    margin_per_incremental_fan = avg_total_per_att - variable_cost_per_incremental_fan
-    break_even_uplift = math.ceil(media_spend / margin_per_incremental_fan) if margin_per_incremental_fan > 0 else None
-    break_even_media_spend = (
-        expected_uplift * margin_per_incremental_fan
-        if expected_uplift > 0 and margin_per_incremental_fan > 0
-        else None
-    )
-    roi = (incremental_profit / total_cost) if total_cost > 0 else None
+@app.route("/api/cube", methods=["GET"])
+def cube():
+    # /api/cube?by=season,competition&season=2024&season=2025&promotion=Family Night
+    # Repeat a dimension parameter to keep several of its values.
+    try:
+        group_by, filters, scope = _cube_query_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    snapshot = _default_snapshot(scope)
+    if snapshot is not None:
+        partition, game_cube = snapshot.artifacts["partition"], snapshot.artifacts["cube"]
+    else:
+        with ReadSession() as session:
+            partition, game_cube = _partition_artifact(session, scope, _load_cube)
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    groups = game_cube.query(
+        [SEGMENT_DIMENSIONS[key] for key in group_by],
+        {SEGMENT_DIMENSIONS[key]: labels for key, labels in filters.items()},
+    )
     return jsonify(
         {
-            "inputs": {
-                "promotion": promotion or "Blended historical avg",
-                "base_attendance": base_attendance,
-                "media_spend": round(media_spend, 2),
-                "variable_cost_per_incremental_fan": round(variable_cost_per_incremental_fan, 2),
-            },
-            "assumptions": {
-                "expected_uplift_attendance": expected_uplift,
-                "expected_uplift_ci80_low": ci_low,
-                "expected_uplift_ci80_high": ci_high,
-                "avg_ticket_revenue_per_attendee": round(avg_ticket_per_att, 2),
-                "avg_merch_revenue_per_attendee": round(avg_merch_per_att, 2),
-                "avg_total_revenue_per_attendee": round(avg_total_per_att, 2),
-                "margin_per_incremental_fan": round(margin_per_incremental_fan, 2),
-            },
-            "outputs": {
-                "projected_attendance": int(round(projected_attendance)),
-                "incremental_revenue": round(incremental_revenue, 2),
-                "total_campaign_cost": round(total_cost, 2),
-                "incremental_profit": round(incremental_profit, 2),
-                "roi": round(roi, 4) if roi is not None else None,
-                "break_even_uplift_attendance": break_even_uplift,
-                "break_even_media_spend": round(break_even_media_spend, 2) if break_even_media_spend is not None else None,
-            },
+            "games": game_cube.games,
+            "partition": _partition_meta(partition),
+            "by": list(group_by),
+            "filters": filters,
+            "cells": [_cube_row(group, group_by) for group in groups],
         }
     )
 
 
+def _payload_number(payload, key, default, kind):
+    try:
+        return kind(payload.get(key, default))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{key} must be a number") from e
+
+
+def _scoped_marketing_model(scope):
+    snapshot = _default_snapshot(scope)
+    if snapshot is not None:
+        return snapshot.artifacts["partition"], snapshot.artifacts["marketing_model"]
+    with ReadSession() as session:
+        return _partition_artifact(session, scope, _load_marketing_model)
+
+
+@app.route("/api/simulate_marketing", methods=["POST"])
+def simulate_marketing():
+    payload = request.get_json(silent=True) or {}
+
+    try:
+        promotion = payload.get("promotion")
+        if promotion is not None and not isinstance(promotion, str):
+            raise ValueError("promotion must be a promotion name or null")
+        base_attendance = _payload_number(payload, "base_attendance", 22000, int)
+        media_spend = _payload_number(payload, "media_spend", 0, float)
+        variable_cost_per_incremental_fan = _payload_number(payload, "variable_cost_per_incremental_fan", 0, float)
+        mode = payload.get("mode", "point")
+        if mode not in ("point", "monte_carlo"):
+            raise ValueError("mode must be one of: point, monte_carlo")
+        draws = _payload_number(payload, "draws", 10000, int)
+        if not 0 < draws <= MAX_MONTE_CARLO_DRAWS:
+            raise ValueError(f"draws must be between 1 and {MAX_MONTE_CARLO_DRAWS}")
+        seed = _payload_number(payload, "seed", DEFAULT_SEED, int)
+        if seed < 0:
+            raise ValueError("seed must be a non-negative integer")
+        scope = _partition_scope(payload.get("club"), payload.get("season"), payload.get("club_id"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    partition, model = _scoped_marketing_model(scope)
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    if model is None:
+        return jsonify({"error": "No games available for analysis"}), 404
+
+    assumptions = _marketing_assumptions(model, promotion)
+    outputs = _simulate_scenario(assumptions, base_attendance, media_spend, variable_cost_per_incremental_fan)
+
+    result = {
+        "inputs": {
+            "promotion": promotion or "Blended historical avg",
+            "base_attendance": base_attendance,
+            "media_spend": round(media_spend, 2),
+            "variable_cost_per_incremental_fan": round(variable_cost_per_incremental_fan, 2),
+        },
+        "assumptions": {
+            "expected_uplift_attendance": assumptions["expected_uplift"],
+            "expected_uplift_ci80_low": assumptions["ci80_low"],
+            "expected_uplift_ci80_high": assumptions["ci80_high"],
+            "avg_ticket_revenue_per_attendee": round(assumptions["avg_ticket_per_att"], 2),
+            "avg_merch_revenue_per_attendee": round(assumptions["avg_merch_per_att"], 2),
+            "avg_total_revenue_per_attendee": round(assumptions["avg_total_per_att"], 2),
+            "margin_per_incremental_fan": round(outputs.pop("margin_per_incremental_fan"), 2),
+        },
+        "outputs": outputs,
+    }
+    if mode == "monte_carlo":
+        result["monte_carlo"] = _simulate_monte_carlo(
+            assumptions, media_spend, variable_cost_per_incremental_fan, draws, seed
+        )
+    return jsonify(result)
+
+
+@app.route("/api/simulate_marketing/grid", methods=["POST"])
+def simulate_marketing_grid():
+    payload = request.get_json(silent=True) or {}
+
+    try:
+        promotions = payload.get("promotions", [None])
+        if not isinstance(promotions, list) or not promotions:
+            raise ValueError("promotions must be a non-empty list")
+        if not all(promotion is None or isinstance(promotion, str) for promotion in promotions):
+            raise ValueError("promotions must list promotion names or null")
+        base_attendance = _grid_axis(payload, "base_attendance", 22000, integer=True)
+        media_spend = _grid_axis(payload, "media_spend", 0)
+        variable_cost = _grid_axis(payload, "variable_cost_per_incremental_fan", 0)
+        scope = _partition_scope(payload.get("club"), payload.get("season"), payload.get("club_id"))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    cells = len(promotions) * base_attendance.size * media_spend.size * variable_cost.size
+    if cells > MAX_SCENARIO_GRID_CELLS:
+        return jsonify({"error": f"Scenario grid has {cells} cells; the limit is {MAX_SCENARIO_GRID_CELLS}"}), 400
+
+    partition, model = _scoped_marketing_model(scope)
+    if partition is None:
+        return jsonify(_unknown_club_payload(scope)), 404
+    if model is None:
+        return jsonify({"error": "No games available for analysis"}), 404
+
+    return jsonify(_simulate_scenario_grid(model, promotions, base_attendance, media_spend, variable_cost))
+
+
+def _game_details_query(game_ids):
+    # One round trip for any number of games: a game row (kind 0, carrying
+    # its promotion id and name), then its ticket (1) and merch (2) lines.
+    # Every branch is an index lookup and the sort only sees the output rows.
+    return union_all(
+        select(
+            Game.id.label("game_id"),
+            literal(0).label("kind"),
+            Promotion.id.label("line_id"),
+            Promotion.name.label("name"),
+            literal(None).label("quantity"),
+            literal(None).label("revenue"),
+        )
+        .outerjoin(Promotion, Promotion.id == Game.promotion_id)
+        .where(Game.id.in_(game_ids)),
+        select(Ticket.game_id, literal(1), Ticket.id, Ticket.type, Ticket.quantity, Ticket.revenue).where(
+            Ticket.game_id.in_(game_ids)
+        ),
+        select(
+            MerchSale.game_id,
+            literal(2),
+            MerchSale.id,
+            MerchSale.item,
+            MerchSale.quantity,
+            MerchSale.total_revenue,
+        ).where(MerchSale.game_id.in_(game_ids)),
+    ).order_by("game_id", "kind", "line_id")
+
+
+def _game_detail_payloads(rows):
+    details = {}
+    for game_id, kind, line_id, name, quantity, revenue in rows:
+        if kind == 0:
+            details[game_id] = {"promotion": name if line_id is not None else "None", "tickets": [], "merch": []}
+        elif game_id in details:
+            if kind == 1:
+                details[game_id]["tickets"].append({"type": name, "quantity": quantity, "revenue": revenue})
+            else:
+                details[game_id]["merch"].append({"item": name, "quantity": quantity, "total_revenue": revenue})
+    return details
+
+
+def _game_detail_ids_arg(raw):
+    try:
+        game_ids = list(dict.fromkeys(int(part) for part in (raw or "").split(",") if part.strip()))
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of game ids") from None
+    if not game_ids:
+        raise ValueError("ids must list at least one game id")
+    if len(game_ids) > MAX_GAME_DETAIL_BATCH:
+        raise ValueError(f"at most {MAX_GAME_DETAIL_BATCH} game ids per request")
+    return game_ids
+
+
+def _game_details_batch_payload(game_ids, details):
+    return {
+        "games": [dict(details[game_id], game_id=game_id) for game_id in game_ids if game_id in details],
+        "missing": [game_id for game_id in game_ids if game_id not in details],
+    }
+
+
 @app.route("/api/game_detail/<int:game_id>", methods=["GET"])
 def game_detail(game_id):
-    with Session() as session:
-        game = session.query(Game).filter_by(id=game_id).first()
-        if not game:
-            return jsonify({"error": "Game not found"}), 404
+    with ReadSession() as session:
+        details = _game_detail_payloads(session.execute(_game_details_query([game_id])))
+    if game_id not in details:
+        return jsonify({"error": "Game not found"}), 404
+    return jsonify(details[game_id])
 
-        tickets = session.query(Ticket).filter_by(game_id=game_id).all()
-        merch = session.query(MerchSale).filter_by(game_id=game_id).all()
 
-        ticket_summary = [{"type": t.type, "quantity": t.quantity, "revenue": t.revenue} for t in tickets]
-        merch_summary = [
-            {"item": m.item, "quantity": m.quantity, "total_revenue": m.total_revenue} for m in merch
-        ]
+@app.route("/api/game_details", methods=["GET"])
+def game_details():
+    try:
+        game_ids = _game_detail_ids_arg(request.args.get("ids"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    with ReadSession() as session:
+        details = _game_detail_payloads(session.execute(_game_details_query(game_ids)))
+    return jsonify(_game_details_batch_payload(game_ids, details))
+
+
+def _text_field(data, key, label=None, required=True):
+    # Names are bound as SQL parameters and used as dict keys, so anything
+    # but a string or null is rejected here rather than failing the batch.
+    value = data[key] if required else data.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{label or key} must be a string or null")
+    return value
+
+
+def _int_field(data, key, label=None, limit=SQLITE_MAX_INT):
+    # A value past the limit would only fail at insert, as an OverflowError
+    # that aborts the whole batch, so it is rejected with its item here.
+    try:
+        value = int(data[key])
+    except OverflowError:
+        value = None
+    if value is None or not -limit <= value <= limit:
+        raise ValueError(f"{label or key} must be an integer between {-limit} and {limit}")
+    return value
 
-        return jsonify(
+
+def _line_items(data, key):
+    items = data.get(key, [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError(f"{key} must be a list of objects")
+    return items
+
+
+def _parse_game_payload(data):
+    if not isinstance(data, dict):
+        raise ValueError("game must be a JSON object")
+    try:
+        game = {
+            "game_date": datetime.strptime(data["game_date"], "%Y-%m-%d").date(),
+            "opponent": _text_field(data, "opponent"),
+            "attendance": _int_field(data, "attendance", limit=MAX_GAME_ATTENDANCE),
+            "competition": _text_field(data, "competition"),
+            "venue": _text_field(data, "venue"),
+        }
+        # Seasons follow the calendar year unless the payload says otherwise.
+        game["season"] = _int_field(data, "season") if data.get("season") else game["game_date"].year
+        tickets = [
+            {
+                "type": _text_field(t, "type", "ticket type"),
+                "quantity": _int_field(t, "quantity", "ticket quantity", MAX_LINE_ITEM_VALUE),
+                "revenue": _int_field(t, "revenue", "ticket revenue", MAX_LINE_ITEM_VALUE),
+            }
+            for t in _line_items(data, "tickets")
+        ]
+        merch = [
             {
-                "promotion": game.promotion.name if game.promotion else "None",
-                "tickets": ticket_summary,
-                "merch": merch_summary,
+                "item": _text_field(m, "item", "merch item"),
+                "quantity": _int_field(m, "quantity", "merch quantity", MAX_LINE_ITEM_VALUE),
+                "total_revenue": _int_field(m, "total_revenue", "merch total_revenue", MAX_LINE_ITEM_VALUE),
             }
+            for m in _line_items(data, "merch")
+        ]
+        club = _text_field(data, "club", required=False)
+        promotion = _text_field(data, "promotion", required=False)
+    except KeyError as e:
+        raise ValueError(f"missing field: {e.args[0]}") from e
+    except TypeError as e:
+        raise ValueError(str(e)) from e
+
+    return {
+        "game": game,
+        "club": club or DEFAULT_CLUB_NAME,
+        "promotion": promotion or None,
+        "tickets": tickets,
+        "merch": merch,
+    }
+
+
+def _ids_by_name(session, model, names, **defaults):
+    # One lookup for every name, then one insert for the names not stored yet.
+    ids = dict(session.execute(select(model.name, model.id).where(model.name.in_(names))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        new_ids = session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [dict(defaults, name=name) for name in missing],
+        ).all()
+        ids.update(zip(missing, new_ids))
+    return ids
+
+
+def _insert_games(session, parsed_games):
+    # One club and one promotion lookup, then executemany inserts for every
+    # table; the caller owns the transaction. Each parsed game gets its
+    # club_id so later steps know which partition it landed in.
+    club_ids = _ids_by_name(session, Club, sorted({p["club"] for p in parsed_games}))
+    promo_ids = _ids_by_name(
+        session, Promotion, sorted({p["promotion"] for p in parsed_games if p["promotion"]}), description=""
+    )
+    venues_by_club = {}
+    for p in parsed_games:
+        p["game"]["club_id"] = club_ids[p["club"]]
+        venues_by_club.setdefault(p["game"]["club_id"], set()).add(p["game"]["venue"])
+    # A venue seen for the first time gets a row (with the default capacity)
+    # like seeded venues do, so its capacity can be set in one place.
+    for club_id, venues in venues_by_club.items():
+        register_venues(session.connection(), club_id, sorted(venue for venue in venues if venue))
+
+    game_ids = session.scalars(
+        insert(Game).returning(Game.id, sort_by_parameter_order=True),
+        [dict(p["game"], promotion_id=promo_ids.get(p["promotion"])) for p in parsed_games],
+    ).all()
+
+    tickets = [dict(t, game_id=game_id) for game_id, p in zip(game_ids, parsed_games) for t in p["tickets"]]
+    merch = [dict(m, game_id=game_id) for game_id, p in zip(game_ids, parsed_games) for m in p["merch"]]
+    if tickets:
+        session.execute(insert(Ticket), tickets)
+    if merch:
+        session.execute(insert(MerchSale), merch)
+
+    # New games only, so their summary rows come straight from the payload.
+    session.execute(
+        insert(GameSummary),
+        [dict(_payload_totals(p), game_id=game_id) for game_id, p in zip(game_ids, parsed_games)],
+    )
+    # Labelling reads the trend row as it was before these games.
+    _label_anomalies(session, game_ids, parsed_games)
+    _append_quantile_sketches(session, game_ids, parsed_games)
+    _append_attendance_trend(session, game_ids, parsed_games)
+    return game_ids
+
+
+def _games_by_partition(game_ids, parsed_games):
+    partitions = {}
+    for game_id, p in zip(game_ids, parsed_games):
+        partitions.setdefault((p["game"]["club_id"], p["game"]["season"]), []).append((game_id, p))
+    return partitions
+
+
+def _trend_row(session, partition):
+    club_id, season = partition
+    return session.execute(
+        select(AttendanceTrend.__table__).where(AttendanceTrend.club_id == club_id, AttendanceTrend.season == season)
+    ).first()
+
+
+def _append_attendance_trend(session, game_ids, parsed_games):
+    # Per club season: games dated on or after the last stored game extend
+    # the running sums in O(1) each; an earlier date renumbers later games
+    # (and a new season has no row yet), so that season is rebuilt instead.
+    stale = []
+    for partition, games in _games_by_partition(game_ids, parsed_games).items():
+        trend = _trend_row(session, partition)
+        new_games = sorted((p["game"]["game_date"], game_id, p["game"]["attendance"]) for game_id, p in games)
+        if trend is None or (trend.last_game_date is not None and new_games[0][0] < trend.last_game_date):
+            stale.append(partition)
+            continue
+
+        sums = RegressionSums.from_row(trend)
+        for _, _, attendance in new_games:
+            sums.add(attendance)
+        session.execute(
+            update(AttendanceTrend)
+            .where(AttendanceTrend.id == trend.id)
+            .values(last_game_date=new_games[-1][0], last_game_id=new_games[-1][1], **sums.to_dict())
+        )
+    if stale:
+        rebuild_attendance_trend(session.connection(), stale)
+
+
+def _load_anomaly_detector(session, partition, trend):
+    # The season's games up to the last one the trend row covers, which are
+    # exactly the games stored before this write.
+    games = session.execute(
+        select(Game.id, func.coalesce(Game.attendance, literal(0)))
+        .where(
+            _partition_clause(partition),
+            tuple_(Game.game_date, Game.id) <= (trend.last_game_date, trend.last_game_id),
         )
+        .order_by(Game.game_date, Game.id)
+    ).all()
+    return AnomalyDetector.from_history([game_id for game_id, _ in games], [attendance for _, attendance in games])
+
+
+def _label_anomalies(session, game_ids, parsed_games):
+    # Per club season: games dated on or after the last stored game are
+    # labelled by the season's detector in O(log n) each (the detector is
+    # reloaded from the database once if this process has none that matches
+    # the stored games); an earlier date changes which games came before
+    # later ones, so that season is relabelled instead. The detectors are
+    # published by _publish_anomaly_detectors once the write commits.
+    detectors = session.info.setdefault("anomaly_detectors", {})
+    stale = []
+    labels = []
+    for partition, games in _games_by_partition(game_ids, parsed_games).items():
+        trend = _trend_row(session, partition)
+        new_games = sorted((p["game"]["game_date"], game_id, p["game"]["attendance"]) for game_id, p in games)
+        if trend is None or (trend.last_game_date is not None and new_games[0][0] < trend.last_game_date):
+            stale.append(partition)
+            continue
+
+        detector = ANOMALY_DETECTORS.take(partition, trend.n, trend.last_game_id)
+        if detector is None:
+            detector = _load_anomaly_detector(session, partition, trend)
+        for _, game_id, attendance in new_games:
+            labels.extend(detector.observe(game_id, attendance))
+        detectors[partition] = detector
+    if labels:
+        session.execute(insert(AnomalyLabel), labels)
+    if stale:
+        detectors.update(rebuild_anomaly_labels(session.connection(), stale))
+
+
+def _append_quantile_sketches(session, game_ids, parsed_games):
+    # Digests merge in any order, so new games fold straight into their
+    # season and segment digests whatever their dates.
+    merge_sketches(
+        session.connection(),
+        [
+            {
+                "game_id": game_id,
+                "club_id": p["game"]["club_id"],
+                "season": p["game"]["season"],
+                "competition": p["game"]["competition"],
+                "game_date": p["game"]["game_date"],
+                "attendance": p["game"]["attendance"],
+                "digests": {
+                    "ticket_price": price_digest((t["quantity"], t["revenue"]) for t in p["tickets"]),
+                    "merch_price": price_digest((m["quantity"], m["total_revenue"]) for m in p["merch"]),
+                },
+            }
+            for game_id, p in zip(game_ids, parsed_games)
+        ],
+    )
+
+
+def _publish_anomaly_detectors(session):
+    ANOMALY_DETECTORS.put(session.info.pop("anomaly_detectors", {}))
+
+
+def _load_attendance_trend(session, frame, partition):
+    # The persisted sums are used only when they cover exactly the frame's
+    # games; otherwise (every season of a club, or rows written by another
+    # tool) sum the frame.
+    trend = _trend_row(session, partition) if partition[1] is not None else None
+    if trend is not None and trend.n == len(frame) and (not len(frame) or trend.last_game_id == frame["id"][-1]):
+        return RegressionSums.from_row(trend)
+    return RegressionSums.from_values(frame["attendance"])
+
+
+def _payload_totals(parsed_game):
+    return {
+        "ticket_revenue": sum(t["revenue"] for t in parsed_game["tickets"]),
+        "tickets_sold": sum(t["quantity"] for t in parsed_game["tickets"]),
+        "merch_revenue": sum(m["total_revenue"] for m in parsed_game["merch"]),
+        "merch_units": sum(m["quantity"] for m in parsed_game["merch"]),
+    }
+
+
+def _bump_data_versions(game_ids, parsed_games):
+    # A write to a club season also moves the club's all-season partition;
+    # every other partition keeps its version and its cached artifacts.
+    partitions = list(_games_by_partition(game_ids, parsed_games))
+    return DATA_VERSION.bump(partitions + sorted({(club_id, None) for club_id, _ in partitions}))
+
+
+def _advance_descriptive_distributions(before, game_ids, parsed_games):
+    # The inserted games are known exactly, so merge them into the cached
+    # distributions of each club season they belong to rather than
+    # re-sorting every column on the next read. Runs after the commit on a
+    # read session, so none of it holds the write connection or lock.
+    partitions = _games_by_partition(game_ids, parsed_games)
+    venues = sorted({p["game"]["venue"] for p in parsed_games if p["game"]["venue"] is not None})
+    with ReadSession() as session:
+        capacities = dict(session.execute(select(Venue.name, Venue.capacity).where(Venue.name.in_(venues))).all())
+        # The bump dropped each partition's fingerprint, so this re-reads it,
+        # and its game count is the partition's size after the write.
+        after = {partition: DATA_VERSION.current(session, partition) for partition in partitions}
+    for partition, games in partitions.items():
+        rows = []
+        for game_id, p in games:
+            game = p["game"]
+            totals = _payload_totals(p)
+            rows.append(
+                (
+                    game_id,
+                    game["game_date"],
+                    game["opponent"],
+                    game["attendance"],
+                    game["competition"],
+                    game["venue"],
+                    p["promotion"],
+                    totals["ticket_revenue"],
+                    totals["tickets_sold"],
+                    totals["merch_revenue"],
+                    totals["merch_units"],
+                    capacities.get(game["venue"]),
+                    game["season"],
+                )
+            )
+        size = after[partition][1][0]
+        DESCRIPTIVE_DISTRIBUTIONS.advance(before[partition], after[partition], size, _build_game_frame(rows), partition)
 
 
 @app.route("/api/add_game", methods=["POST"])
@@ -993,55 +2333,72 @@ def add_game():
     data = request.json
     with Session() as session:
         try:
-            promo_name = data.get("promotion")
-            promo_id = None
-
-            if promo_name:
-                promotion = session.query(Promotion).filter_by(name=promo_name).first()
-                if not promotion:
-                    promotion = Promotion(name=promo_name, description="")
-                    session.add(promotion)
-                    session.flush()
-                promo_id = promotion.id
-
-            game = Game(
-                game_date=datetime.strptime(data["game_date"], "%Y-%m-%d"),
-                opponent=data["opponent"],
-                attendance=int(data["attendance"]),
-                competition=data["competition"],
-                venue=data["venue"],
-                promotion_id=promo_id,
-            )
-            session.add(game)
-            session.flush()
-
-            for t in data.get("tickets", []):
-                ticket = Ticket(
-                    game_id=game.id,
-                    type=t["type"],
-                    quantity=int(t["quantity"]),
-                    revenue=int(t["revenue"]),
-                )
-                session.add(ticket)
-
-            for m in data.get("merch", []):
-                merch = MerchSale(
-                    game_id=game.id,
-                    item=m["item"],
-                    quantity=int(m["quantity"]),
-                    total_revenue=int(m["total_revenue"]),
-                )
-                session.add(merch)
-
+            parsed = [_parse_game_payload(data)]
+            game_ids = _insert_games(session, parsed)
             session.commit()
-            return jsonify({"message": "Game added successfully"}), 201
+        except (SQLAlchemyError, ValueError) as e:
+            session.rollback()
+            return jsonify({"error": str(e)}), 400
+        _publish_anomaly_detectors(session)
+
+    # The game is committed from here on: cache upkeep must never turn
+    # into an error response that invites a duplicate retry.
+    before = _bump_data_versions(game_ids, parsed)
+    _advance_descriptive_distributions(before, game_ids, parsed)
+    ANALYTICS_SNAPSHOTS.trigger()
+    return jsonify({"message": "Game added successfully"}), 201
+
+
+@app.route("/api/add_games", methods=["POST"])
+def add_games():
+    data = request.get_json(silent=True)
+    items = data.get("games") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Expected a non-empty list of games"}), 400
+    if len(items) > MAX_BATCH_GAMES:
+        return jsonify({"error": f"Batch has {len(items)} games; the limit is {MAX_BATCH_GAMES}"}), 400
+
+    parsed = []
+    indexes = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append(_parse_game_payload(item))
+            indexes.append(index)
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+
+    if not parsed:
+        return jsonify({"inserted": 0, "games": [], "errors": errors}), 400
 
-        except (SQLAlchemyError, KeyError, ValueError) as e:
+    with Session() as session:
+        try:
+            game_ids = _insert_games(session, parsed)
+            session.commit()
+        except SQLAlchemyError as e:
             session.rollback()
             return jsonify({"error": str(e)}), 400
+        _publish_anomaly_detectors(session)
+
+    before = _bump_data_versions(game_ids, parsed)
+    _advance_descriptive_distributions(before, game_ids, parsed)
+    ANALYTICS_SNAPSHOTS.trigger()
+    return (
+        jsonify(
+            {
+                "inserted": len(game_ids),
+                "games": [{"index": index, "game_id": game_id} for index, game_id in zip(indexes, game_ids)],
+                "errors": errors,
+            }
+        ),
+        201 if not errors else 207,
+    )
 
 
 if __name__ == "__main__":
+    # A single development process, so it can bring the schema up to date
+    # itself; deployments run `python migrations.py` before starting workers.
+    upgrade_schema(engine)
     host = os.getenv("FLASK_HOST", "127.0.0.1")
     port = int(os.getenv("FLASK_PORT", "5000"))
     app.run(host=host, port=port, debug=True)
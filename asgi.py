@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import (
+    ANALYTICS_PRECOMPUTE,
+    ANALYTICS_SNAPSHOTS,
+    CORS_EXPOSE_HEADERS,
+    GAME_COUNT_QUERY,
+    INFERENCE_MODES,
+    _build_advanced_analysis,
+    _game_detail_ids_arg,
+    _game_detail_payloads,
+    _game_details_batch_payload,
+    _game_details_query,
+    _health_error_payload,
+    _health_payload,
+    _inference_mode_arg,
+    _default_snapshot,
+    _load_holistic_entry,
+    _negotiate_json_entry,
+    _partition_artifact,
+    _partition_scope,
+    _snapshot_headers,
+    _unknown_club_payload,
+    app as flask_app,
+)
+from database import ReadSession, configure_sqlite, read_engine
+
+# Async serving mode: `uvicorn asgi:application`. The dashboard's hot read
+# endpoints are served natively on the event loop with DB reads through
+# aiosqlite; CPU-heavy analytics run on a thread pool so a slow resampling
+# request never blocks the loop. Every other route (writes, the simulator,
+# CSV export) is delegated to the Flask app on a2wsgi's own thread pool.
+
+ANALYTICS_THREADS = int(os.getenv("ASGI_ANALYTICS_THREADS", "4"))
+WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+
+analytics_executor = ThreadPoolExecutor(max_workers=ANALYTICS_THREADS, thread_name_prefix="analytics")
+async_engine = create_async_engine(read_engine.url.set(drivername="sqlite+aiosqlite"))
+configure_sqlite(async_engine.sync_engine, read_only=True)
+wsgi_application = WSGIMiddleware(flask_app, workers=WSGI_THREADS)
+
+GAME_DETAIL_PATH = re.compile(r"^/api/game_detail/(\d+)$")
+
+
+def _header(scope, name):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _cors_headers(scope):
+    # Mirrors the Flask-CORS setup in app.py: any origin, with credentials,
+    # and the same exposed response headers.
+    origin = _header(scope, b"origin")
+    if origin is None:
+        return {}
+    return {
+        "Access-Control-Allow-Origin": origin,
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Expose-Headers": ", ".join(sorted(CORS_EXPOSE_HEADERS)),
+        "Vary": "Origin",
+    }
+
+
+async def _send(scope, send, status, body, headers):
+    headers = dict(headers)
+    for name, value in _cors_headers(scope).items():
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    headers["Content-Length"] = str(len(body))
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(scope, send, status, payload, headers=None):
+    body = (flask_app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+    await _send(scope, send, status, body, {"Content-Type": "application/json", **(headers or {})})
+
+
+def _in_session(fn, *args, **kwargs):
+    with ReadSession() as session:
+        return fn(session, *args, **kwargs)
+
+
+async def _offload(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(analytics_executor, functools.partial(fn, *args, **kwargs))
+
+
+def _analysis_args(scope):
+    # (inference mode, partition scope) from the query string.
+    params = parse_qs(scope["query_string"].decode("latin-1"))
+    inference = _inference_mode_arg(params.get("inference", [INFERENCE_MODES[0]])[0])
+    return inference, _partition_scope(
+        params.get("club", [None])[0], params.get("season", [None])[0], params.get("club_id", [None])[0]
+    )
+
+
+async def health(scope, send):
+    try:
+        async with async_engine.connect() as conn:
+            game_count = (await conn.execute(GAME_COUNT_QUERY)).scalar()
+    except Exception as e:
+        await _send_json(scope, send, 500, _health_error_payload(e))
+        return
+    await _send_json(scope, send, 200, _health_payload(game_count))
+
+
+async def _game_details(game_ids):
+    async with async_engine.connect() as conn:
+        return _game_detail_payloads(await conn.execute(_game_details_query(game_ids)))
+
+
+async def game_detail(scope, send, game_id):
+    details = await _game_details([game_id])
+    if game_id not in details:
+        await _send_json(scope, send, 404, {"error": "Game not found"})
+        return
+    await _send_json(scope, send, 200, details[game_id])
+
+
+async def game_details(scope, send):
+    params = parse_qs(scope["query_string"].decode("latin-1"))
+    try:
+        game_ids = _game_detail_ids_arg(params.get("ids", [""])[0])
+    except ValueError as e:
+        await _send_json(scope, send, 400, {"error": str(e)})
+        return
+    await _send_json(scope, send, 200, _game_details_batch_payload(game_ids, await _game_details(game_ids)))
+
+
+async def holistic_analysis(scope, send):
+    try:
+        inference, partition_scope = _analysis_args(scope)
+    except ValueError as e:
+        await _send_json(scope, send, 400, {"error": str(e)})
+        return
+
+    snapshot = _default_snapshot(partition_scope)
+    if snapshot is not None:
+        partition, entry = snapshot.artifacts["partition"], snapshot.artifacts["holistic"][inference]
+    else:
+        partition, entry = await _offload(
+            _in_session, _partition_artifact, partition_scope, _load_holistic_entry, inference=inference
+        )
+
+    if partition is None:
+        await _send_json(scope, send, 404, _unknown_club_payload(partition_scope))
+        return
+    if entry is None:
+        await _send_json(scope, send, 404, {"error": "No games available for analysis"})
+        return
+    status, body, headers = _negotiate_json_entry(
+        entry, _header(scope, b"accept-encoding"), _header(scope, b"if-none-match")
+    )
+    await _send(scope, send, status, body, {**headers, **_snapshot_headers(snapshot)})
+
+
+async def advanced_analysis(scope, send):
+    try:
+        inference, partition_scope = _analysis_args(scope)
+    except ValueError as e:
+        await _send_json(scope, send, 400, {"error": str(e)})
+        return
+
+    snapshot = _default_snapshot(partition_scope)
+    if snapshot is not None:
+        partition, payload = snapshot.artifacts["partition"], snapshot.artifacts["advanced"][inference]
+    else:
+        partition, payload = await _offload(
+            _in_session, _partition_artifact, partition_scope, _build_advanced_analysis, inference=inference
+        )
+
+    if partition is None:
+        await _send_json(scope, send, 404, _unknown_club_payload(partition_scope))
+        return
+    if payload is None:
+        await _send_json(scope, send, 404, {"error": "No games available for analysis"})
+        return
+    await _send_json(scope, send, 200, payload, _snapshot_headers(snapshot))
+
+
+ROUTES = {
+    "/api/health": health,
+    "/api/holistic_analysis": holistic_analysis,
+    "/api/advanced_analysis": advanced_analysis,
+    "/api/game_details": game_details,
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if ANALYTICS_PRECOMPUTE:
+                ANALYTICS_SNAPSHOTS.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            ANALYTICS_SNAPSHOTS.stop(timeout=5)
+            analytics_executor.shutdown(wait=False)
+            await async_engine.dispose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] == "http" and scope["method"] == "GET":
+        handler = ROUTES.get(scope["path"])
+        if handler is not None:
+            await handler(scope, send)
+            return
+        match = GAME_DETAIL_PATH.match(scope["path"])
+        if match:
+            await game_detail(scope, send, int(match.group(1)))
+            return
+
+    await wsgi_application(scope, receive, send)
@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anomaly_detection import (  # noqa: E402
+    DEMAND_RISK,
+    DEMAND_SPIKE,
+    MIN_HISTORY,
+    ROLLING_WINDOW,
+    AnomalyDetector,
+)
+
+
+# Labelling a new game by recomputing the percentiles over its history from
+# scratch, as the per-request flagging did, kept as the reference.
+def rescan_label(history, value):
+    if len(history) < MIN_HISTORY:
+        return None, None, None
+    low, high = np.percentile(history, [20, 80])
+    tag = DEMAND_RISK if value <= low else DEMAND_SPIKE if value >= high else None
+    return tag, float(low), float(high)
+
+
+def rescan_labels(values):
+    # The first MIN_HISTORY games are labelled against those games, every
+    # later game against the games before it.
+    rows = []
+    for i, value in enumerate(values):
+        end = max(i, MIN_HISTORY)
+        if end > len(values):
+            break
+        for mode, history in (("expanding", values[:end]), ("rolling", values[max(0, end - ROLLING_WINDOW):end])):
+            rows.append((i, mode, *rescan_label(history, value)))
+    return rows
+
+
+def detector_labels(values):
+    detector = AnomalyDetector()
+    rows = []
+    for i, value in enumerate(values.tolist()):
+        for row in detector.observe(i, value):
+            rows.append((row["game_id"], row["mode"], row["tag"], row["low_threshold"], row["high_threshold"]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rescanning each game's history with streaming anomaly labels.")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--check-games", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    # Rounded to whole fans so ties sit exactly on the thresholds.
+    values = rng.normal(24000, 3500, args.check_games).round(-2).astype(np.int64)
+    expected = rescan_labels(values)
+    actual = detector_labels(values)
+    assert len(expected) == len(actual), (len(expected), len(actual))
+    for a, b in zip(expected, actual):
+        assert a[:3] == b[:3], (a, b)
+        if a[3] is not None:
+            assert abs(a[3] - b[3]) <= 1e-6 and abs(a[4] - b[4]) <= 1e-6, (a, b)
+    print(f"equivalence: {args.check_games} games labelled the same by both paths")
+
+    print(f"{'games':>9} {'rescan_us/game':>15} {'detector_us/game':>17}")
+    for size in [int(v) for v in args.sizes.split(",")]:
+        values = rng.normal(24000, 3500, size).round().astype(np.int64)
+        detector = AnomalyDetector.from_history(list(range(1, size + 1)), values.tolist())
+        incoming = rng.normal(24000, 3500, 1000).round().astype(np.int64).tolist()
+
+        # The cost of labelling one more game on top of `size` stored games.
+        start = time.perf_counter()
+        for value in incoming[:20]:
+            rescan_label(values, value)
+            rescan_label(values[-ROLLING_WINDOW:], value)
+        rescan_s = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for game_id, value in enumerate(incoming, start=size + 1):
+            detector.observe(game_id, value)
+        detector_s = (time.perf_counter() - start) / len(incoming)
+        print(f"{size:>9} {rescan_s * 1e6:>15.1f} {detector_s * 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def legacy_attendance(session_factory, game_model):
+    # The handler before projection and streaming: full ORM rows, one list.
+    from flask import jsonify
+
+    with session_factory() as session:
+        games = session.query(game_model).order_by(game_model.game_date).all()
+        return jsonify(
+            [
+                {
+                    "id": game.id,
+                    "game_date": game.game_date.strftime("%Y-%m-%d"),
+                    "opponent": game.opponent,
+                    "attendance": game.attendance,
+                }
+                for game in games
+            ]
+        )
+
+
+def _measure(fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the ORM /attendance handler with the streamed projection.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app binds its engines at import, so point it at a scratch database first.
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["ANALYTICS_PRECOMPUTE"] = "0"
+        from app import app
+        from bench_indexes import _populate
+        from database import ReadSession, engine
+        from migrations import backfill_partitions, upgrade
+        from models import Game
+
+        upgrade(engine)
+        _populate(engine, args.games, args.seed)
+        # The raw rows carry no club or season; file them as upgrading an
+        # existing database would, so /attendance?season=all sees them all.
+        with engine.begin() as conn:
+            backfill_partitions(conn)
+        client = app.test_client()
+
+        def run_legacy():
+            with app.app_context():
+                return legacy_attendance(ReadSession, Game).get_data()
+
+        def run_streamed():
+            response = client.get("/attendance", query_string={"season": "all"}, buffered=False)
+            # Consume chunk by chunk, as a WSGI server writing to a socket would.
+            return sum(len(chunk) for chunk in response.response)
+
+        def run_paged():
+            rows, cursor = 0, None
+            while True:
+                query = {"season": "all", "limit": args.page, **({"cursor": cursor} if cursor else {})}
+                response = client.get("/attendance", query_string=query)
+                rows += len(response.get_json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    return rows
+
+        legacy_body = run_legacy()
+        assert client.get("/attendance", query_string={"season": "all"}).get_data() == legacy_body
+        assert run_paged() == len(json.loads(legacy_body)) == args.games
+
+        print(f"{'handler':>28} {'seconds':>8} {'peak_MB':>8}")
+        for label, fn in (
+            ("legacy ORM + jsonify", run_legacy),
+            ("streamed projection", run_streamed),
+            (f"cursor pages of {args.page}", run_paged),
+        ):
+            elapsed, peak = _measure(fn)
+            print(f"{label:>28} {elapsed:8.3f} {peak / 1e6:8.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
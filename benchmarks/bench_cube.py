@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from bench_game_frame import _synthetic_query_rows  # noqa: E402
+from cube import GameCube  # noqa: E402
+from segmentation import SegmentCells  # noqa: E402
+
+
+def scan_query(frame, group_by, filters):
+    # The same answer straight from the rows: mask the frame, then group it.
+    mask = np.ones(len(frame), dtype=bool)
+    for key, labels in filters.items():
+        column = frame[key]
+        mask &= np.isin(column.codes, [column.code_of(label) for label in labels])
+    return SegmentCells.from_frame(frame.take(mask), group_by, app.CUBE_MEASURES).groups()
+
+
+def _random_query(rng, frame, columns):
+    group_by = rng.sample(columns, rng.randint(0, 2))
+    filters = {}
+    for key in rng.sample([c for c in columns if c not in group_by], rng.randint(0, 2)):
+        filters[key] = rng.sample(frame[key].categories, min(2, len(frame[key].categories)))
+    return group_by, filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the game cube and time slice/dice queries against row scans.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = app._build_game_frame(_synthetic_query_rows(args.games, args.seed))
+    columns = [app.SEGMENT_DIMENSIONS[key] for key in app.CUBE_DIMENSIONS]
+
+    started = time.perf_counter()
+    game_cube = GameCube(frame, columns, app.CUBE_MEASURES)
+    build_s = time.perf_counter() - started
+
+    rng = random.Random(args.seed)
+    queries = [_random_query(rng, frame, columns) for _ in range(args.queries)]
+    for group_by, filters in queries[:50]:
+        expected = scan_query(frame, group_by, filters)
+        actual = game_cube.query(group_by, filters)
+        assert [(g["labels"], g["games"]) for g in actual] == [(g["labels"], g["games"]) for g in expected]
+        for a, b in zip(actual, expected):
+            for name in app.CUBE_MEASURES:
+                assert abs(a["sums"][name] - b["sums"][name]) <= 1e-9 * max(1.0, abs(b["sums"][name])), name
+
+    def timed(fn):
+        latencies = []
+        for group_by, filters in queries:
+            query_started = time.perf_counter()
+            fn(group_by, filters)
+            latencies.append(time.perf_counter() - query_started)
+        return np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000
+
+    scan_p50, scan_p99 = timed(lambda g, f: scan_query(frame, g, f))
+    cube_p50, cube_p99 = timed(game_cube.query)
+
+    print(f"cube build: {build_s * 1000:.0f} ms, {len(game_cube.cuboids)} cuboids, "
+          f"{game_cube.cells():,} cells, {game_cube.nbytes() / 1e6:.1f} MB")
+    print(f"{'query path':>12} {'p50_ms':>8} {'p99_ms':>8}")
+    print(f"{'row scan':>12} {scan_p50:8.2f} {scan_p99:8.2f}")
+    print(f"{'cube':>12} {cube_p50:8.2f} {cube_p99:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
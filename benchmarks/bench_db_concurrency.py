@@ -0,0 +1,168 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from bench_indexes import _populate  # noqa: E402
+from database import create_db_engine  # noqa: E402
+from migrations import rebuild_game_summary, upgrade  # noqa: E402
+from models import Base, Game, GameSummary, Promotion, Ticket  # noqa: E402
+
+# Analytics read: the same join the game frame is loaded from.
+FRAME_QUERY = (
+    select(
+        Game.id,
+        Game.game_date,
+        Game.attendance,
+        Promotion.name,
+        GameSummary.ticket_revenue,
+        GameSummary.merch_revenue,
+    )
+    .outerjoin(Promotion, Promotion.id == Game.promotion_id)
+    .outerjoin(GameSummary, GameSummary.game_id == Game.id)
+    .order_by(Game.game_date, Game.id)
+)
+
+
+def _legacy_engines(url):
+    # What database.py built before: one default engine for reads and writes.
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    return engine, engine
+
+
+def _tuned_engines(url):
+    return create_db_engine(url), create_db_engine(url, read_only=True)
+
+
+CONFIGS = {"legacy": _legacy_engines, "tuned": _tuned_engines}
+
+
+def _prepare(path, games, seed):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    _populate(engine, games, seed)
+    upgrade(engine)
+    with engine.begin() as conn:
+        rebuild_game_summary(conn)
+    engine.dispose()
+
+
+def _reader(engine, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(FRAME_QUERY).all()
+        except OperationalError:
+            errors.append("read")
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def _writer(engine, deadline, latencies, errors, committed):
+    # Mirrors add_game: read the data version, then insert in one transaction.
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(select(func.count(), func.max(Game.id)).select_from(Game)).one()
+                game_id = conn.execute(
+                    insert(Game).returning(Game.id),
+                    {
+                        "game_date": date.today(),
+                        "opponent": "Load Test FC",
+                        "attendance": 20000,
+                        "competition": "MLS Regular Season",
+                        "venue": "GEODIS Park",
+                    },
+                ).scalar_one()
+                conn.execute(
+                    insert(Ticket), [{"game_id": game_id, "type": "VIP", "quantity": 10, "revenue": 1000}]
+                )
+                conn.execute(insert(GameSummary), {"game_id": game_id, "ticket_revenue": 1000, "tickets_sold": 10})
+        except OperationalError:
+            errors.append("write")
+            continue
+        latencies.append(time.perf_counter() - started)
+        committed.append(game_id)
+
+
+def run(config, path, readers, writers, seconds):
+    write_engine, read_engine = CONFIGS[config](f"sqlite:///{path}")
+    with write_engine.connect() as conn:
+        initial = conn.execute(select(func.count()).select_from(Game)).scalar()
+
+    read_latencies, write_latencies, errors, committed = [], [], [], []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_reader, args=(read_engine, deadline, read_latencies, errors)) for _ in range(readers)
+    ] + [
+        threading.Thread(target=_writer, args=(write_engine, deadline, write_latencies, errors, committed))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with write_engine.connect() as conn:
+        final = conn.execute(select(func.count()).select_from(Game)).scalar()
+    # Every write reported as committed is in the table, and nothing else is.
+    assert final == initial + len(committed), (config, initial, len(committed), final)
+    write_engine.dispose()
+    read_engine.dispose()
+
+    def pct(values, q):
+        return np.percentile(values, q) * 1000 if values else float("nan")
+
+    return {
+        "reads_per_s": len(read_latencies) / seconds,
+        "read_p50_ms": pct(read_latencies, 50),
+        "read_p99_ms": pct(read_latencies, 99),
+        "writes_per_s": len(committed) / seconds,
+        "write_p99_ms": pct(write_latencies, 99),
+        "lock_errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Concurrent analytics reads and add_game-style writes: legacy engine vs tuned WAL engines."
+    )
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'config':>7} {'reads/s':>8} {'read_p50':>9} {'read_p99':>9} {'writes/s':>9} {'write_p99':>10} {'locked':>7}")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for config in CONFIGS:
+            path = os.path.join(tmp, f"{config}.db")
+            _prepare(path, args.games, args.seed)
+            if config == "legacy":
+                with create_engine(f"sqlite:///{path}").connect() as conn:
+                    conn.execute(text("PRAGMA journal_mode=DELETE"))
+            results[config] = run(config, path, args.readers, args.writers, args.seconds)
+            r = results[config]
+            print(
+                f"{config:>7} {r['reads_per_s']:8.1f} {r['read_p50_ms']:8.1f}ms {r['read_p99_ms']:8.1f}ms "
+                f"{r['writes_per_s']:9.1f} {r['write_p99_ms']:9.1f}ms {r['lock_errors']:7d}"
+            )
+    assert results["tuned"]["lock_errors"] == 0, results["tuned"]
+
+
+if __name__ == "__main__":
+    main()
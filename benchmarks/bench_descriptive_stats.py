@@ -0,0 +1,92 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from descriptive_stats import StreamingDistribution  # noqa: E402
+
+
+def _legacy_percentile(values, q):
+    ordered = np.sort(values)
+    idx = (ordered.size - 1) * (q / 100)
+    lo = int(math.floor(idx))
+    hi = int(math.ceil(idx))
+    if lo == hi:
+        return ordered[lo].item()
+    weight = idx - lo
+    return ordered[lo].item() * (1 - weight) + ordered[hi].item() * weight
+
+
+# Summary as computed before the single-pass engine: one sort per percentile,
+# a separate median and the standard deviation twice.
+def legacy_summary(values):
+    mean_val = float(values.mean())
+    std_dev = math.sqrt(float(values.var(ddof=1)))
+    q1 = _legacy_percentile(values, 25)
+    q3 = _legacy_percentile(values, 75)
+    return {
+        "count": values.size,
+        "mean": mean_val,
+        "std_dev": math.sqrt(float(values.var(ddof=1))),
+        "min": values.min().item(),
+        "max": values.max().item(),
+        "median": float(np.median(values)),
+        "q1": q1,
+        "q3": q3,
+        "p10": _legacy_percentile(values, 10),
+        "p90": _legacy_percentile(values, 90),
+        "cv": std_dev / mean_val,
+    }
+
+
+def _timed(fn, *args, repeats=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-statistic sorting with the single-pass summary engine.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--appends", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(f"{'games':>9} {'legacy_ms':>10} {'single_ms':>10} {'append_us':>10} {'rescan_ms':>10}")
+    for size in [int(v) for v in args.sizes.split(",")]:
+        values = rng.normal(24000, 3500, size).round().astype(np.int64)
+        legacy_s, legacy = _timed(legacy_summary, values)
+        single_s, single = _timed(lambda v: StreamingDistribution(v).summary(), values)
+        for key, value in single.items():
+            assert math.isclose(legacy[key], value, rel_tol=1e-9), key
+
+        # Incremental mode: append one game at a time and compare with a rescan.
+        extra = rng.normal(24000, 3500, args.appends).round().astype(np.int64)
+        distribution = StreamingDistribution(values)
+        start = time.perf_counter()
+        for value in extra:
+            distribution.add(value)
+            distribution.summary()
+        append_s = (time.perf_counter() - start) / args.appends
+        combined = np.concatenate([values, extra])
+        rescan_s, rescanned = _timed(legacy_summary, combined)
+        for key, value in distribution.summary().items():
+            assert math.isclose(rescanned[key], value, rel_tol=1e-9), key
+
+        print(
+            f"{size:>9} {legacy_s * 1000:>10.2f} {single_s * 1000:>10.2f} "
+            f"{append_s * 1e6:>10.1f} {rescan_s * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
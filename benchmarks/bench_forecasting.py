@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecasting import DEFAULT_HORIZON, run_backtests  # noqa: E402
+
+
+def _synthetic_history(seasons, games_per_season, seed):
+    # Attendance with a slow trend, a within-season shape, and competition,
+    # weekday, month and promotion effects, in the shape app._forecast_history builds.
+    rng = np.random.default_rng(seed)
+    n = seasons * games_per_season
+    position = np.tile(np.arange(games_per_season), seasons)
+    competition = rng.integers(0, 3, n)
+    weekday = rng.integers(0, 7, n)
+    month = (2 + position * 9 // games_per_season) % 12
+    promotion = rng.integers(0, 5, n)
+    y = (
+        21000
+        + 15 * np.arange(n) / games_per_season
+        + 2500 * np.sin(np.pi * position / games_per_season)
+        + np.array([0, -3000, 1500])[competition]
+        + np.where(weekday == 5, 1800, 0)
+        + np.where(promotion > 0, 600, 0)
+        + rng.normal(0, 1200, n)
+    )
+    return {
+        "y": np.clip(y, 0, 30000).round(),
+        "features": np.column_stack([competition, weekday, month, promotion]),
+        "levels": [3, 7, 12, 5],
+        "season_length": games_per_season,
+        "linear_sums": None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time rolling-origin backtests serially and across a process pool.")
+    parser.add_argument("--seasons", default="5,50,500")
+    parser.add_argument("--games-per-season", type=int, default=17)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'games':>7} {'serial_s':>9} {'pool_s':>8} {'selected':>22}  mape by model")
+    for seasons in [int(v) for v in args.seasons.split(",")]:
+        history = _synthetic_history(seasons, args.games_per_season, seed=seasons)
+        start = time.perf_counter()
+        serial, _ = run_backtests(history, DEFAULT_HORIZON, workers=1)
+        serial_s = time.perf_counter() - start
+
+        # The first pooled run also pays for spawning workers, so warm up once.
+        run_backtests(history, DEFAULT_HORIZON, workers=args.workers)
+        start = time.perf_counter()
+        pooled, _ = run_backtests(history, DEFAULT_HORIZON, workers=args.workers)
+        pool_s = time.perf_counter() - start
+
+        for name in serial:
+            assert serial[name] is None or abs(serial[name] - pooled[name]) < 1e-9, name
+        selected = min(serial, key=lambda name: serial[name])
+        scores = ", ".join(f"{name}={mape:.2f}" for name, mape in serial.items())
+        print(f"{history['y'].size:>7} {serial_s:>9.3f} {pool_s:>8.3f} {selected:>22}  {scores}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import _game_detail_payloads, _game_details_query  # noqa: E402
+from bench_indexes import _populate  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import Base, Game, MerchSale, Ticket  # noqa: E402
+
+
+def legacy_game_detail(session, game_id):
+    # The ORM handler the endpoint used before: a Game load, a lazy load of
+    # game.promotion, then one query each for tickets and merch.
+    game = session.get(Game, game_id)
+    if game is None:
+        return None
+    tickets = session.query(Ticket).filter_by(game_id=game_id).order_by(Ticket.id).all()
+    merch = session.query(MerchSale).filter_by(game_id=game_id).order_by(MerchSale.id).all()
+    return {
+        "promotion": game.promotion.name if game.promotion else "None",
+        "tickets": [{"type": t.type, "quantity": t.quantity, "revenue": t.revenue} for t in tickets],
+        "merch": [{"item": m.item, "quantity": m.quantity, "total_revenue": m.total_revenue} for m in merch],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the per-click game detail queries before and after batching.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        _populate(engine, args.games, args.seed)
+        upgrade(engine)
+        Session = sessionmaker(bind=engine)
+        rng = random.Random(args.seed)
+        # A drilldown click plus its two neighbours, as the dashboard prefetches them.
+        clicks = [rng.randrange(2, args.games) for _ in range(args.lookups)]
+
+        with Session() as session:
+            for game_id in clicks[:50]:
+                details = _game_detail_payloads(session.execute(_game_details_query([game_id])))
+                assert details[game_id] == legacy_game_detail(session, game_id), game_id
+
+        def timed(fn):
+            with Session() as session:
+                started = time.perf_counter()
+                for game_id in clicks:
+                    fn(session, game_id)
+                    session.expunge_all()
+                return (time.perf_counter() - started) / len(clicks) * 1e6
+
+        legacy = timed(legacy_game_detail)
+        single = timed(lambda s, g: _game_detail_payloads(s.execute(_game_details_query([g]))))
+        legacy_neighbours = timed(lambda s, g: [legacy_game_detail(s, n) for n in (g - 1, g, g + 1)])
+        batch = timed(lambda s, g: _game_detail_payloads(s.execute(_game_details_query([g - 1, g, g + 1]))))
+        engine.dispose()
+
+    print(f"{'request':>22} {'queries':>8} {'us/click':>9}")
+    print(f"{'legacy detail':>22} {4:>8} {legacy:9.1f}")
+    print(f"{'single-query detail':>22} {1:>8} {single:9.1f}  ({legacy / single:.1f}x)")
+    print(f"{'legacy 3 neighbours':>22} {12:>8} {legacy_neighbours:9.1f}")
+    print(f"{'batch 3 neighbours':>22} {1:>8} {batch:9.1f}  ({legacy_neighbours / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
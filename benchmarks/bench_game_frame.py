@@ -0,0 +1,178 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+QueryRow = namedtuple(
+    "QueryRow",
+    "id game_date opponent attendance competition venue promotion_name ticket_revenue tickets_sold merch_revenue merch_units "
+    "capacity season",
+)
+
+
+def _synthetic_query_rows(games, seed):
+    rng = random.Random(seed)
+    start = date(2015, 2, 1)
+    rows = []
+    for game_id in range(1, games + 1):
+        attendance = rng.randrange(15000, 30000)
+        game_date = start + timedelta(days=game_id // 3)
+        rows.append(
+            QueryRow(
+                game_id,
+                game_date,
+                f"Opponent {rng.randrange(40)}",
+                attendance,
+                rng.choice(["MLS Regular Season", "US Open Cup", "Leagues Cup"]),
+                "GEODIS Park",
+                rng.choice([None, "Family Night", "Military Appreciation", "Student Discount", "Fan Giveaway"]),
+                attendance * rng.uniform(35, 50),
+                attendance,
+                attendance * rng.uniform(5, 15),
+                int(attendance * rng.uniform(0.1, 0.4)),
+                30000,
+                game_date.year,
+            )
+        )
+    return rows
+
+
+# List-of-dicts frame and pure-Python helpers as used before the columnar frame.
+def legacy_build(games):
+    rows = []
+    for g in games:
+        attendance = g.attendance
+        ticket_revenue = float(g.ticket_revenue)
+        merch_revenue = float(g.merch_revenue)
+        total_revenue = ticket_revenue + merch_revenue
+        rows.append(
+            {
+                "id": g.id,
+                "game_date": g.game_date,
+                "opponent": g.opponent,
+                "attendance": attendance,
+                "competition": g.competition,
+                "venue": g.venue,
+                "promotion_name": g.promotion_name or "None",
+                "ticket_revenue": ticket_revenue,
+                "tickets_sold": g.tickets_sold,
+                "merch_revenue": merch_revenue,
+                "merch_units": g.merch_units,
+                "total_revenue": total_revenue,
+                "occupancy_rate": attendance / g.capacity,
+                "ticket_price_per_seat": ticket_revenue / g.tickets_sold if g.tickets_sold else 0.0,
+                "revenue_per_attendee": total_revenue / attendance if attendance else 0.0,
+                "merch_rev_per_attendee": merch_revenue / attendance if attendance else 0.0,
+                "ticket_rev_per_attendee": ticket_revenue / attendance if attendance else 0.0,
+                "merch_attach_rate": g.merch_units / attendance if attendance else 0.0,
+                "weekday": g.game_date.strftime("%A"),
+                "month": g.game_date.strftime("%b"),
+            }
+        )
+    return rows
+
+
+def _legacy_mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _legacy_std(values):
+    avg = _legacy_mean(values)
+    return math.sqrt(sum((v - avg) ** 2 for v in values) / (len(values) - 1))
+
+
+def _legacy_corr(a_vals, b_vals):
+    a_mean, b_mean = _legacy_mean(a_vals), _legacy_mean(b_vals)
+    cov = sum((a - a_mean) * (b - b_mean) for a, b in zip(a_vals, b_vals)) / (len(a_vals) - 1)
+    return cov / (_legacy_std(a_vals) * _legacy_std(b_vals))
+
+
+def _legacy_segments(rows, key):
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row[key]].append(row)
+    return {
+        group: (
+            _legacy_mean([r["attendance"] for r in items]),
+            _legacy_mean([r["total_revenue"] for r in items]),
+            _legacy_mean([r["occupancy_rate"] for r in items]),
+            _legacy_mean([r["revenue_per_attendee"] for r in items]),
+        )
+        for group, items in grouped.items()
+    }
+
+
+def legacy_workload(rows):
+    attendance = [r["attendance"] for r in rows]
+    revenue = [r["total_revenue"] for r in rows]
+    merch_per_att = [r["merch_rev_per_attendee"] for r in rows]
+    _legacy_std(attendance)
+    _legacy_corr(attendance, revenue)
+    _legacy_corr(attendance, merch_per_att)
+    _legacy_corr([r["occupancy_rate"] for r in rows], [r["revenue_per_attendee"] for r in rows])
+    for key in ("competition", "weekday", "month"):
+        _legacy_segments(rows, key)
+    ordered = sorted(attendance)
+    return ordered[len(ordered) // 5], ordered[4 * len(ordered) // 5]
+
+
+def columnar_workload(frame):
+    attendance = frame["attendance"]
+    app._std_dev(attendance)
+    app._correlation(attendance, frame["total_revenue"])
+    app._correlation(attendance, frame["merch_rev_per_attendee"])
+    app._correlation(frame["occupancy_rate"], frame["revenue_per_attendee"])
+    app._segment_summaries(frame, [("competition",), ("weekday",), ("month",)])
+    return app._percentile(attendance, 20), app._percentile(attendance, 80)
+
+
+def _measure(fn, arg):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(arg)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _best_time(fn, arg, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the list-of-dicts game frame with the columnar GameFrame.")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'games':>8} {'frame':>10} {'build_ms':>10} {'build_peak_mb':>14} {'stats_ms':>10}")
+    for games in [int(v) for v in args.sizes.split(",")]:
+        query_rows = _synthetic_query_rows(games, seed=games)
+
+        rows, legacy_build_s, legacy_peak = _measure(legacy_build, query_rows)
+        legacy_stats_s = _best_time(legacy_workload, rows, args.repeats)
+        frame, columnar_build_s, columnar_peak = _measure(app._build_game_frame, query_rows)
+        columnar_stats_s = _best_time(columnar_workload, frame, args.repeats)
+
+        print(f"{games:>8} {'dicts':>10} {legacy_build_s * 1000:>10.1f} {legacy_peak / 2**20:>14.1f} {legacy_stats_s * 1000:>10.1f}")
+        print(f"{games:>8} {'columnar':>10} {columnar_build_s * 1000:>10.1f} {columnar_peak / 2**20:>14.1f} {columnar_stats_s * 1000:>10.1f}")
+        print(f"{'':>8} columnar frame holds {frame.nbytes() / 2**20:.1f} MB of column data")
+
+
+if __name__ == "__main__":
+    main()
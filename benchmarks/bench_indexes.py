@@ -0,0 +1,136 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select, text  # noqa: E402
+
+from migrations import upgrade  # noqa: E402
+from models import Base, Game, MerchSale, Promotion, Ticket  # noqa: E402
+
+TICKET_TYPES = ["General Admission", "VIP", "Season Ticket", "Group"]
+MERCH_ITEMS = ["Jersey", "Scarf", "Hat", "Poster"]
+
+
+def _populate(engine, games, seed):
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Promotion.__table__.insert(), [{"id": i, "name": f"Promo {i}", "description": ""} for i in range(1, 9)])
+        conn.execute(
+            Game.__table__.insert(),
+            [
+                {
+                    "id": game_id,
+                    "game_date": start + timedelta(days=rng.randrange(365 * 10)),
+                    "opponent": f"Opponent {rng.randrange(40)}",
+                    "attendance": rng.randrange(15000, 30000),
+                    "competition": rng.choice(["MLS Regular Season", "US Open Cup", "Leagues Cup"]),
+                    "venue": "GEODIS Park",
+                    "promotion_id": rng.choice([None, 1, 2, 3, 4, 5, 6, 7, 8]),
+                }
+                for game_id in range(1, games + 1)
+            ],
+        )
+        # Interleave game ids so fact rows are not already clustered by game.
+        order = list(range(1, games + 1))
+        rng.shuffle(order)
+        conn.execute(
+            Ticket.__table__.insert(),
+            [
+                {"game_id": g, "type": t, "quantity": rng.randrange(100, 5000), "revenue": rng.randrange(5000, 400000)}
+                for t in TICKET_TYPES
+                for g in order
+            ],
+        )
+        conn.execute(
+            MerchSale.__table__.insert(),
+            [
+                {"game_id": g, "item": m, "quantity": rng.randrange(0, 3000), "total_revenue": rng.randrange(0, 200000)}
+                for m in MERCH_ITEMS
+                for g in order
+            ],
+        )
+
+
+def _statements(sample_game_id):
+    ticket_totals = (
+        select(Ticket.game_id, func.sum(Ticket.revenue).label("ticket_revenue"), func.sum(Ticket.quantity).label("tickets_sold"))
+        .group_by(Ticket.game_id)
+        .subquery()
+    )
+    merch_totals = (
+        select(MerchSale.game_id, func.sum(MerchSale.total_revenue).label("merch_revenue"), func.sum(MerchSale.quantity).label("merch_units"))
+        .group_by(MerchSale.game_id)
+        .subquery()
+    )
+    game_frame = (
+        select(Game.id, Game.game_date, Game.attendance, Promotion.name, ticket_totals.c.ticket_revenue, merch_totals.c.merch_revenue)
+        .outerjoin(Promotion, Promotion.id == Game.promotion_id)
+        .outerjoin(ticket_totals, ticket_totals.c.game_id == Game.id)
+        .outerjoin(merch_totals, merch_totals.c.game_id == Game.id)
+        .order_by(Game.game_date, Game.id)
+    )
+    return {
+        "game_frame (aggregate join)": game_frame,
+        "game_detail tickets": select(Ticket).where(Ticket.game_id == sample_game_id).order_by(Ticket.id),
+        "game_detail merch": select(MerchSale).where(MerchSale.game_id == sample_game_id).order_by(MerchSale.id),
+        "ticket mix GROUP BY type": select(Ticket.type, func.sum(Ticket.quantity), func.sum(Ticket.revenue)).group_by(Ticket.type),
+        "merch mix GROUP BY item": select(MerchSale.item, func.sum(MerchSale.quantity), func.sum(MerchSale.total_revenue)).group_by(MerchSale.item),
+        "games by promotion": select(func.avg(Game.attendance)).where(Game.promotion_id == 3),
+    }
+
+
+def _measure(engine, statements, repeats):
+    results = {}
+    with engine.connect() as conn:
+        for name, stmt in statements.items():
+            compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+            plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                conn.execute(stmt).all()
+                best = min(best, time.perf_counter() - started)
+            results[name] = (best, plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the analytical queries with and without the model indexes.")
+    parser.add_argument("--games", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    conn.execute(text(f"DROP INDEX {index.name}"))
+        _populate(engine, args.games, args.seed)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+        statements = _statements(sample_game_id=args.games // 2)
+        before = _measure(engine, statements, args.repeats)
+        upgrade(engine)
+        after = _measure(engine, statements, args.repeats)
+
+    print(f"games={args.games:,} tickets={args.games * 4:,} merch_sales={args.games * 4:,}\n")
+    for name in statements:
+        (t_before, plan_before), (t_after, plan_after) = before[name], after[name]
+        print(f"{name}: {t_before * 1000:.2f}ms -> {t_after * 1000:.2f}ms ({t_before / t_after if t_after else 0:.1f}x)")
+        print("  before: " + " | ".join(plan_before))
+        print("  after:  " + " | ".join(plan_after))
+
+
+if __name__ == "__main__":
+    main()
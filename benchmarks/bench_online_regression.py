@@ -0,0 +1,105 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from online_regression import RegressionSums  # noqa: E402
+
+
+# Centred batch OLS the forecast used before the running sums, kept as the reference.
+def batch_linear_regression(values):
+    values = np.asarray(values, dtype=float)
+    n = values.size
+    if n < 2:
+        return 0.0, float(values[0]) if n else 0.0, 0.0, 0.0
+
+    x_vals = np.arange(1, n + 1, dtype=float)
+    x_mean = x_vals.mean()
+    y_mean = values.mean()
+    sxy = float(np.dot(x_vals - x_mean, values - y_mean))
+    sxx = float(np.dot(x_vals - x_mean, x_vals - x_mean))
+    slope = sxy / sxx if sxx else 0.0
+    intercept = y_mean - slope * x_mean
+    residuals = values - (intercept + slope * x_vals)
+    sse = float(np.dot(residuals, residuals))
+    sst = float(np.dot(values - y_mean, values - y_mean))
+    r_squared = 1 - (sse / sst) if sst else 0.0
+    return slope, float(intercept), r_squared, math.sqrt(sse / max(1, n - 2))
+
+
+def _assert_close(expected, actual, context):
+    for name, a, b in zip(("slope", "intercept", "r_squared", "residual_se"), expected, actual):
+        if not math.isclose(a, b, rel_tol=1e-7, abs_tol=1e-6):
+            raise AssertionError(f"{name} differs for {context}: batch={a!r} running={b!r}")
+
+
+def check_equivalence(cases, seed):
+    # Randomised property check: for any integer series, the running sums
+    # (built in one go, value by value, or split at a random point) fit the
+    # same line as the batch computation.
+    rng = random.Random(seed)
+    for case in range(cases):
+        n = rng.choice([0, 1, 2, 3, rng.randrange(4, 50), rng.randrange(50, 5000)])
+        shape = rng.choice(["noise", "trend", "constant", "spiky"])
+        base = rng.randrange(0, 40000)
+        if shape == "constant":
+            values = [base] * n
+        elif shape == "trend":
+            values = [max(0, base + i * rng.randrange(-30, 30) + rng.randrange(-500, 500)) for i in range(n)]
+        elif shape == "spiky":
+            values = [rng.choice([0, base, 10**6]) for _ in range(n)]
+        else:
+            values = [rng.randrange(0, 40000) for _ in range(n)]
+
+        expected = batch_linear_regression(values)
+        _assert_close(expected, RegressionSums.from_values(values).fit(), f"case {case} bulk")
+
+        running = RegressionSums()
+        for value in values:
+            running.add(value)
+        _assert_close(expected, running.fit(), f"case {case} one-by-one")
+
+        split = rng.randrange(0, n + 1)
+        chunked = RegressionSums.from_values(values[:split])
+        chunked.extend(np.asarray(values[split:], dtype=np.int64))
+        if chunked.to_dict() != running.to_dict():
+            raise AssertionError(f"case {case}: chunked sums differ from one-by-one sums")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare batch OLS with persisted running regression sums.")
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    check_equivalence(args.cases, args.seed)
+    print(f"equivalence: {args.cases} randomised series match the batch fit")
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'games':>9} {'batch_ms':>10} {'add_us':>8} {'fit_us':>8}")
+    for size in [int(v) for v in args.sizes.split(",")]:
+        values = rng.normal(24000, 3500, size).round().astype(np.int64)
+        start = time.perf_counter()
+        batch_linear_regression(values)
+        batch_s = time.perf_counter() - start
+
+        sums = RegressionSums.from_values(values)
+        start = time.perf_counter()
+        for value in range(1000):
+            sums.add(24000 + value)
+        add_s = (time.perf_counter() - start) / 1000
+        start = time.perf_counter()
+        sums.fit()
+        fit_s = time.perf_counter() - start
+        print(f"{size:>9} {batch_s * 1000:>10.2f} {add_s * 1e6:>8.2f} {fit_s * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TICKET_TYPES = ["General Admission", "VIP", "Season Ticket", "Group"]
+MERCH_ITEMS = ["Jersey", "Scarf", "Hat", "Poster"]
+PROMOTIONS = [None, "Family Night", "Military Appreciation", "Student Discount", "Fan Giveaway"]
+
+
+def _populate_season(engine, club_id, season, games, seed):
+    from migrations import (
+        rebuild_anomaly_labels,
+        rebuild_attendance_trend,
+        rebuild_game_summary,
+        rebuild_quantile_sketches,
+    )
+    from models import Game, MerchSale, Promotion, Ticket
+    from sqlalchemy import func, select
+
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        promo_ids = dict(conn.execute(select(Promotion.name, Promotion.id)).all())
+        first_id = (conn.execute(select(func.max(Game.id))).scalar() or 0) + 1
+        ids = range(first_id, first_id + games)
+        conn.execute(
+            Game.__table__.insert(),
+            [
+                {
+                    "id": game_id,
+                    "game_date": date(season, 2, 15) + timedelta(days=rng.randrange(270)),
+                    "opponent": f"Opponent {rng.randrange(40)}",
+                    "attendance": rng.randrange(15000, 30000),
+                    "competition": rng.choice(["MLS Regular Season", "US Open Cup", "Leagues Cup"]),
+                    "venue": "GEODIS Park",
+                    "season": season,
+                    "club_id": club_id,
+                    "promotion_id": promo_ids.get(rng.choice(PROMOTIONS)),
+                }
+                for game_id in ids
+            ],
+        )
+        conn.execute(
+            Ticket.__table__.insert(),
+            [
+                {"game_id": g, "type": t, "quantity": rng.randrange(100, 5000), "revenue": rng.randrange(5000, 400000)}
+                for g in ids
+                for t in TICKET_TYPES
+            ],
+        )
+        conn.execute(
+            MerchSale.__table__.insert(),
+            [
+                {"game_id": g, "item": m, "quantity": rng.randrange(0, 3000), "total_revenue": rng.randrange(0, 200000)}
+                for g in ids
+                for m in MERCH_ITEMS
+            ],
+        )
+        rebuild_game_summary(conn, [(club_id, season)])
+        rebuild_attendance_trend(conn, [(club_id, season)])
+        rebuild_anomaly_labels(conn, [(club_id, season)])
+        rebuild_quantile_sketches(conn, [(club_id, season)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time one season's analysis as the number of stored seasons grows.")
+    parser.add_argument("--seasons", type=int, default=50)
+    parser.add_argument("--games-per-season", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app binds its engines at import, so point it at a scratch database first.
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["ANALYTICS_PRECOMPUTE"] = "0"
+        import app
+        from database import ReadSession, engine
+        from migrations import upgrade
+        from models import Promotion
+
+        upgrade(engine)
+        with engine.begin() as conn:
+            conn.execute(Promotion.__table__.insert(), [{"name": name, "description": ""} for name in PROMOTIONS[1:]])
+        with ReadSession() as session:
+            club_id = app._resolve_partition(session)[0]
+
+        versions = itertools.count()
+
+        def timed(load):
+            # A fresh version per run, so every cache misses and the season is
+            # read and analysed from the database each time.
+            best, result = float("inf"), None
+            for _ in range(args.repeats):
+                with ReadSession() as session:
+                    started = time.perf_counter()
+                    result = load(session, ("bench", next(versions)))
+                    best = min(best, time.perf_counter() - started)
+            return best * 1000, result
+
+        target = (club_id, 2000)
+        history = (club_id, None)
+        results = []
+        bodies = []
+        populated = 0
+        for stored in (1, args.seasons):
+            for season in range(2000 + populated, 2000 + stored):
+                _populate_season(engine, club_id, season, args.games_per_season, args.seed + season)
+            populated = stored
+            frame_ms, frame = timed(lambda session, version: app._load_game_frame(session, target))
+            holistic_ms, entry = timed(lambda session, version: app._load_holistic_entry(session, version, target))
+            history_ms, history_frame = timed(lambda session, version: app._load_game_frame(session, history))
+            assert len(frame) == args.games_per_season
+            assert len(history_frame) == stored * args.games_per_season
+            bodies.append(entry["body"])
+            results.append((stored, len(history_frame), frame_ms, holistic_ms, history_ms))
+
+        # The season's payload is byte-identical however many other seasons are stored.
+        assert bodies[0] == bodies[1]
+
+        print(f"{'seasons':>8} {'games':>8} {'season_frame_ms':>16} {'season_analysis_ms':>19} {'all_games_frame_ms':>19}")
+        for stored, games, frame_ms, holistic_ms, history_ms in results:
+            print(f"{stored:8d} {games:8d} {frame_ms:16.1f} {holistic_ms:19.1f} {history_ms:19.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from descriptive_stats import sorted_percentile  # noqa: E402
+from quantile_sketch import TDigest, max_rank_error  # noqa: E402
+
+QUANTILES = (1, 10, 20, 25, 50, 75, 80, 90, 99)
+
+
+def check_exact(rng):
+    # Below the centroid budget every value keeps its own centroid, so the
+    # digest agrees with the sorted values to the last bit. Weighted values
+    # (a game's ticket rows) agree with the values expanded by weight
+    # whenever none of them had to share a centroid.
+    for size in (1, 2, 17, 60, 120):
+        values = rng.integers(10000, 30000, size)
+        digest = TDigest.from_values(values)
+        assert digest.means.size == size
+        for q in (0, *QUANTILES, 100):
+            assert digest.quantile(q) == sorted_percentile(np.sort(values), q), (size, q)
+    for size in (1, 2, 4, 8):
+        prices = rng.integers(10, 200, size).astype(float)
+        quantities = rng.integers(100, 5000, size)
+        weighted = TDigest.from_values(prices, quantities)
+        if weighted.means.size < size:
+            continue
+        for q in QUANTILES:
+            assert weighted.quantile(q) == sorted_percentile(np.sort(np.repeat(prices, quantities)), q), (size, q)
+
+
+def rank_errors(digest, ordered):
+    # Fraction of the values between each reported quantile and its target rank.
+    errors = {}
+    for q in QUANTILES:
+        value = digest.quantile(q)
+        below = np.searchsorted(ordered, value, side="left") / ordered.size
+        at_or_below = np.searchsorted(ordered, value, side="right") / ordered.size
+        target = q / 100
+        errors[q] = 0.0 if below <= target <= at_or_below else min(abs(below - target), abs(at_or_below - target))
+    return errors
+
+
+def check_bounds(rng, size, parts):
+    # Digests built in parts (games) and merged (into seasons, then across
+    # seasons) stay within the documented rank error.
+    for name, values in (
+        ("normal", rng.normal(24000, 3500, size)),
+        ("lognormal", rng.lognormal(4, 0.8, size)),
+        ("discrete", rng.choice([25.0, 35.0, 50.0, 100.0], size, p=[0.1, 0.5, 0.3, 0.1])),
+    ):
+        chunks = np.array_split(values, parts)
+        seasons = [TDigest.merge_all([TDigest.from_values(c) for c in group]) for group in np.array_split(chunks, 10)]
+        merged = TDigest.merge_all([TDigest.from_bytes(season.to_bytes()) for season in seasons])
+        assert merged.count == size and np.isclose(merged.mean, values.mean()) and merged.min == values.min()
+        for q, error in rank_errors(merged, np.sort(values)).items():
+            assert error <= max_rank_error(q), (name, q, error, max_rank_error(q))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check t-digest error bounds and compare with sorting every transaction.")
+    parser.add_argument("--sizes", default="100000,1000000,10000000")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    check_exact(rng)
+    check_bounds(rng, 200_000, args.games)
+    print("accuracy: exact below the centroid budget, merged digests within the documented rank error")
+
+    print(f"{'transactions':>13} {'sort_ms':>9} {'values_MB':>10} {'merge_ms':>9} {'digests_KB':>11} {'max_err':>8}")
+    for size in [int(v) for v in args.sizes.split(",")]:
+        values = rng.lognormal(4, 0.8, size)
+        start = time.perf_counter()
+        ordered = np.sort(values)
+        [sorted_percentile(ordered, q) for q in QUANTILES]
+        sort_s = time.perf_counter() - start
+
+        # What a read does with stored digests: merge ten season digests and
+        # read the quantiles, never touching the transactions.
+        seasons = [
+            TDigest.merge_all([TDigest.from_values(chunk) for chunk in np.array_split(season, args.games // 10)]).to_bytes()
+            for season in np.array_split(values, 10)
+        ]
+        start = time.perf_counter()
+        merged = TDigest.merge_all([TDigest.from_bytes(season) for season in seasons])
+        [merged.quantile(q) for q in QUANTILES]
+        merge_s = time.perf_counter() - start
+        worst = max(rank_errors(merged, ordered).values())
+        print(
+            f"{size:>13} {sort_s * 1000:>9.1f} {values.nbytes / 1e6:>10.1f} {merge_s * 1000:>9.2f} "
+            f"{sum(len(s) for s in seasons) / 1e3:>11.1f} {worst:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
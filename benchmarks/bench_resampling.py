@@ -0,0 +1,99 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resampling import bootstrap_diff_ci, permutation_p_value  # noqa: E402
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+# Pure-Python loops the API used before the batched engine, kept as the baseline.
+def legacy_bootstrap_diff_ci(sample_a, sample_b, iterations=2000, seed=42):
+    if not sample_a or not sample_b:
+        return 0.0, 0.0
+
+    rng = random.Random(seed)
+    boot_diffs = []
+    for _ in range(iterations):
+        resample_a = [rng.choice(sample_a) for _ in range(len(sample_a))]
+        resample_b = [rng.choice(sample_b) for _ in range(len(sample_b))]
+        boot_diffs.append(_mean(resample_a) - _mean(resample_b))
+
+    boot_diffs.sort()
+    return boot_diffs[int(0.1 * len(boot_diffs))], boot_diffs[int(0.9 * len(boot_diffs))]
+
+
+def legacy_permutation_p_value(sample_a, sample_b, iterations=2000, seed=42):
+    if not sample_a or not sample_b:
+        return 1.0
+
+    rng = random.Random(seed)
+    observed = abs(_mean(sample_a) - _mean(sample_b))
+    pooled = sample_a + sample_b
+    size_a = len(sample_a)
+    extreme_count = 0
+    for _ in range(iterations):
+        shuffled = pooled[:]
+        rng.shuffle(shuffled)
+        if abs(_mean(shuffled[:size_a]) - _mean(shuffled[size_a:])) >= observed:
+            extreme_count += 1
+    return (extreme_count + 1) / (iterations + 1)
+
+
+def _timed(fn, *args, repeats=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _synthetic_season(games, promotions, seed):
+    rng = random.Random(seed)
+    attendance = [int(rng.gauss(26000, 3500)) for _ in range(games)]
+    labels = [rng.randrange(promotions + 1) for _ in range(games)]
+    return attendance, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy resampling loops with the batched NumPy engine.")
+    parser.add_argument("--sizes", default="17,100,500", help="comma-separated game counts")
+    parser.add_argument("--promotions", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'games':>6} {'engine':>8} {'bootstrap_s':>12} {'permutation_s':>14} {'speedup':>8}")
+    for games in [int(v) for v in args.sizes.split(",")]:
+        attendance, labels = _synthetic_season(games, args.promotions, seed=games)
+        with_promo = [a for a, label in zip(attendance, labels) if label == 1]
+        without_promo = [a for a, label in zip(attendance, labels) if label != 1]
+
+        legacy_boot, legacy_ci = _timed(legacy_bootstrap_diff_ci, with_promo, without_promo, args.iterations, 42, repeats=args.repeats)
+        legacy_perm, legacy_p = _timed(legacy_permutation_p_value, with_promo, without_promo, args.iterations, 42, repeats=args.repeats)
+        fast_boot, fast_ci = _timed(bootstrap_diff_ci, with_promo, without_promo, args.iterations, 42, repeats=args.repeats)
+        fast_perm, fast_p = _timed(permutation_p_value, with_promo, without_promo, args.iterations, 42, repeats=args.repeats)
+
+        # Reproducibility contract: the same seed must give identical results.
+        assert fast_ci == bootstrap_diff_ci(with_promo, without_promo, args.iterations, 42)
+        assert fast_p == permutation_p_value(with_promo, without_promo, args.iterations, 42)
+
+        speedup = (legacy_boot + legacy_perm) / (fast_boot + fast_perm)
+        print(f"{games:>6} {'legacy':>8} {legacy_boot:>12.4f} {legacy_perm:>14.4f} {'':>8}")
+        print(f"{games:>6} {'numpy':>8} {fast_boot:>12.4f} {fast_perm:>14.4f} {speedup:>7.1f}x")
+        print(
+            f"{'':>6} ci80 legacy=({legacy_ci[0]:.1f}, {legacy_ci[1]:.1f}) numpy=({fast_ci[0]:.1f}, {fast_ci[1]:.1f}) "
+            f"p legacy={legacy_p:.4f} numpy={fast_p:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
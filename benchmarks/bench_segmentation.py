@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from bench_game_frame import _synthetic_query_rows  # noqa: E402
+
+GROUPINGS = [
+    ("competition",),
+    ("weekday",),
+    ("month",),
+    ("opponent",),
+    ("promotion",),
+    ("competition", "weekday"),
+    ("promotion", "month"),
+    ("opponent", "competition"),
+]
+
+
+def legacy_segment_summary(frame, keys):
+    # One scan per grouping, as _segment_summary did for each single key;
+    # combinations get a combined label per row first.
+    columns = [frame[app.SEGMENT_DIMENSIONS[key]] for key in keys]
+    if len(columns) == 1:
+        codes, categories = columns[0].codes, columns[0].categories
+        _, first_seen = np.unique(codes, return_index=True)
+    else:
+        labels = [" / ".join(parts) for parts in zip(*(column.labels() for column in columns))]
+        categories, first_seen, codes = np.unique(
+            np.asarray(labels, dtype=object), return_index=True, return_inverse=True
+        )
+        codes = codes.reshape(-1)
+        categories = categories.tolist()
+    counts = np.bincount(codes, minlength=len(categories))
+    present = codes[np.sort(first_seen)]
+
+    def group_mean(values):
+        return np.bincount(codes, weights=values, minlength=len(categories)) / np.maximum(counts, 1)
+
+    avg_attendance = group_mean(frame["attendance"])
+    avg_revenue = group_mean(frame["total_revenue"])
+    avg_occupancy = group_mean(frame["occupancy_rate"])
+    avg_rev_per_att = group_mean(frame["revenue_per_attendee"])
+    summary = [
+        {
+            "segment": categories[code],
+            "games": int(counts[code]),
+            "avg_attendance": int(round(avg_attendance[code])),
+            "avg_total_revenue": int(round(avg_revenue[code])),
+            "avg_occupancy_rate": round(float(avg_occupancy[code]), 4),
+            "avg_revenue_per_attendee": round(float(avg_rev_per_att[code]), 2),
+        }
+        for code in present.tolist()
+    ]
+    summary.sort(key=lambda x: x["avg_attendance"], reverse=True)
+    return summary
+
+
+def _strip_keys(rows):
+    return [{k: v for k, v in row.items() if k != "keys"} for row in rows]
+
+
+def _close(a, b):
+    # Cell roll-ups add the same values in a different order, so rounded
+    # means may differ in the last reported digit and nothing more.
+    if len(a) != len(b):
+        return False
+    by_segment = {row["segment"]: row for row in b}
+    for row in a:
+        other = by_segment.get(row["segment"])
+        if other is None or row["games"] != other["games"]:
+            return False
+        for key in ("avg_attendance", "avg_total_revenue", "avg_occupancy_rate", "avg_revenue_per_attendee"):
+            step = 1 if isinstance(row[key], int) else 10 ** -(2 if "revenue" in key else 4)
+            if abs(row[key] - other[key]) > 1.01 * step:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one scan per grouping with the single-scan segment cells.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = app._build_game_frame(_synthetic_query_rows(args.games, args.seed))
+
+    single = app._segment_summaries(frame, GROUPINGS)
+    for grouping, rows in zip(GROUPINGS, single):
+        assert _close(_strip_keys(rows), legacy_segment_summary(frame, grouping)), grouping
+
+    def timed(fn):
+        started = time.perf_counter()
+        for _ in range(args.repeats):
+            fn()
+        return (time.perf_counter() - started) / args.repeats * 1000
+
+    legacy_ms = timed(lambda: [legacy_segment_summary(frame, grouping) for grouping in GROUPINGS])
+    cells_ms = timed(lambda: app._segment_summaries(frame, GROUPINGS))
+    holistic = GROUPINGS[:3]
+    legacy_holistic_ms = timed(lambda: [legacy_segment_summary(frame, grouping) for grouping in holistic])
+    cells_holistic_ms = timed(lambda: app._segment_summaries(frame, holistic))
+
+    print(f"{'groupings':>28} {'per-grouping_ms':>16} {'single-scan_ms':>15} {'speedup':>8}")
+    for label, before, after in (
+        ("holistic (3 single keys)", legacy_holistic_ms, cells_holistic_ms),
+        (f"{len(GROUPINGS)} incl. 3 pairs", legacy_ms, cells_ms),
+    ):
+        print(f"{label:>28} {before:16.1f} {after:15.1f} {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
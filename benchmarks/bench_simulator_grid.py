@@ -0,0 +1,69 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import app  # noqa: E402
+
+
+def _reference_grid(model, promotions, base_attendance, media_spend, variable_cost):
+    # Per-cell loop over the scalar simulator, in the grid's row-major order.
+    results = []
+    for promotion in promotions:
+        assumptions = app._marketing_assumptions(model, promotion)
+        for base in base_attendance.tolist():
+            for media in media_spend.tolist():
+                for var_cost in variable_cost.tolist():
+                    outputs = app._simulate_scenario(assumptions, base, media, var_cost)
+                    outputs.pop("margin_per_incremental_fan")
+                    results.append(outputs)
+    return results
+
+
+def _assert_matches(grid, reference):
+    columns = grid["columns"]
+    assert grid["count"] == len(reference)
+    for key in reference[0]:
+        for i, expected in enumerate(reference):
+            actual = columns[key][i]
+            if expected[key] is None or actual is None:
+                assert actual == expected[key], (key, i, actual, expected[key])
+            else:
+                assert math.isclose(actual, expected[key], rel_tol=1e-9, abs_tol=0.011), (key, i, actual, expected[key])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the vectorized scenario grid with per-scenario simulation.")
+    parser.add_argument("--steps", type=int, default=40, help="values per numeric axis")
+    args = parser.parse_args()
+
+    with app.ReadSession() as session:
+        _, model = app._partition_artifact(session, app._partition_scope(), app._load_marketing_model)
+    if model is None:
+        raise SystemExit("No games available; seed the database first.")
+
+    promotions = [None] + sorted(model["promotions"])
+    base_attendance = np.linspace(18000, 30000, args.steps).astype(np.int64)
+    media_spend = np.linspace(0, 250000, args.steps)
+    variable_cost = np.linspace(0, 80, args.steps)
+
+    start = time.perf_counter()
+    grid = app._simulate_scenario_grid(model, promotions, base_attendance, media_spend, variable_cost)
+    grid_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = _reference_grid(model, promotions, base_attendance, media_spend, variable_cost)
+    loop_seconds = time.perf_counter() - start
+
+    _assert_matches(grid, reference)
+    print(f"cells={grid['count']:,} grid={grid_seconds * 1000:.1f}ms loop={loop_seconds * 1000:.1f}ms "
+          f"speedup={loop_seconds / grid_seconds:.1f}x (results match reference)")
+
+
+if __name__ == "__main__":
+    main()
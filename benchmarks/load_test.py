@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "sync": ["gunicorn", "--workers", "{workers}", "--bind", "127.0.0.1:{port}", "app:app"],
+    "async": [
+        "uvicorn",
+        "asgi:application",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        "{port}",
+        "--workers",
+        "{workers}",
+        "--log-level",
+        "warning",
+    ],
+}
+
+
+def _dashboard_paths(game_count, rng):
+    # One dashboard load: the parallel fan-out the React app fires on open.
+    game_id = rng.randint(1, max(1, game_count))
+    return [
+        "/api/health",
+        "/api/holistic_analysis",
+        rng.choice(["/api/advanced_analysis", "/api/advanced_analysis?inference=joint"]),
+        f"/api/game_detail/{game_id}",
+    ]
+
+
+def _new_game(rng):
+    return json.dumps(
+        {
+            "game_date": f"2031-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "opponent": "Load Test FC",
+            "attendance": rng.randint(15000, 30000),
+            "competition": "MLS Regular Season",
+            "venue": "GEODIS Park",
+            "tickets": [{"type": "General Admission", "quantity": 100, "revenue": 3500}],
+        }
+    ).encode("utf-8")
+
+
+def _fetch(base_url, request, timeout):
+    path, body = request if isinstance(request, tuple) else (request, None)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    start = time.perf_counter()
+    try:
+        http_request = urllib.request.Request(base_url + path, data=body, headers=headers)
+        with urllib.request.urlopen(http_request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def _wait_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/api/health", timeout=2) as response:
+                return json.loads(response.read())["game_count"]
+        except Exception:
+            time.sleep(0.25)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run_mode(mode, args, port):
+    # Each mode gets its own copy of the database so writes never touch the
+    # repo's file and both modes start from the same data.
+    workdir = tempfile.mkdtemp(prefix=f"load_test_{mode}_")
+    shutil.copy(os.path.join(ROOT, args.db), os.path.join(workdir, "nashville_sc_business.db"))
+    command = [part.format(port=port, workers=args.workers) for part in SERVERS[mode]]
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+        ANALYTICS_PRECOMPUTE="1" if args.precompute else "0",
+    )
+    # Servers do not migrate on import, so upgrade the copy first as a deploy would.
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, "migrations.py")], cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+    server = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        game_count = _wait_ready(base_url)
+        rng = random.Random(args.seed)
+        paths = []
+        while len(paths) < args.requests:
+            paths.extend(_dashboard_paths(game_count, rng))
+        paths = paths[: args.requests]
+        if args.write_every:
+            # Writes invalidate the analytics caches, so the next analytics
+            # request pays for a full recompute.
+            for i in range(args.write_every - 1, len(paths), args.write_every):
+                paths[i] = ("/api/add_game", _new_game(rng))
+
+        # Warm caches (and the snapshot, when enabled) before timing.
+        for path in _dashboard_paths(game_count, rng) + ["/api/advanced_analysis?inference=joint"]:
+            _fetch(base_url, path, args.timeout)
+        time.sleep(args.warmup_seconds)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda path: _fetch(base_url, path, args.timeout), paths))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for status, _ in results if status == 0 or status >= 500)
+    return {
+        "mode": mode,
+        "requests": len(results),
+        "errors": errors,
+        "rps": len(results) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare throughput and tail latency of the sync (gunicorn app:app) and async "
+        "(uvicorn asgi:application) serving modes under a dashboard-like request mix."
+    )
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="server processes per mode")
+    parser.add_argument("--port", type=int, default=8731)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--warmup-seconds", type=float, default=2.0)
+    parser.add_argument("--db", default="nashville_sc_business.db", help="database copied for each run")
+    parser.add_argument("--write-every", type=int, default=0, help="make every Nth request an add_game write")
+    parser.add_argument("--no-precompute", dest="precompute", action="store_false")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50_ms':>9} {'p99_ms':>9} {'max_ms':>9}")
+    for offset, mode in enumerate(args.modes.split(",")):
+        row = run_mode(mode, args, args.port + offset)
+        print(
+            f"{row['mode']:>6} {row['requests']:>9} {row['errors']:>7} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from itertools import combinations
+
+import numpy as np
+
+from segmentation import SegmentCells
+
+
+# A cuboid is kept only if it has at most this fraction of its parent's
+# cells; otherwise queries roll up from the parent, which costs about the same.
+MATERIALIZE_RATIO = 0.5
+
+
+class GameCube:
+    # The cuboid lattice (a group-by over each subset of the dimensions) of
+    # the game frame, built once per data version. The base cuboid is the only
+    # scan over the rows; every other cuboid is rolled up from its smallest
+    # parent, and cuboids that barely shrink share their parent instead.
+
+    def __init__(self, frame, dimensions, measures):
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+        self.games = len(frame)
+        base = SegmentCells.from_frame(frame, self.dimensions, self.measures)
+        self.cuboids = {frozenset(self.dimensions): base}
+        for size in range(len(self.dimensions) - 1, -1, -1):
+            for keys in combinations(self.dimensions, size):
+                parent = min(
+                    (self.cuboids[frozenset(keys) | {extra}] for extra in self.dimensions if extra not in keys),
+                    key=len,
+                )
+                cuboid = parent.aggregate(keys)
+                self.cuboids[frozenset(keys)] = cuboid if len(cuboid) <= MATERIALIZE_RATIO * len(parent) else parent
+
+    def _materialized(self):
+        return list({id(cuboid): cuboid for cuboid in self.cuboids.values()}.values())
+
+    def cells(self):
+        return sum(len(cuboid) for cuboid in self._materialized())
+
+    def nbytes(self):
+        total = 0
+        for cuboid in self._materialized():
+            arrays = [cuboid.counts, cuboid.first_seen, *cuboid.codes.values(), *cuboid.sums.values()]
+            total += sum(array.nbytes for array in arrays)
+        return total
+
+    def query(self, group_by=(), filters=None):
+        # Dice by group_by and slice by filters ({dimension: [labels]}) from the
+        # one cuboid that covers both; labels not present match no cells.
+        filters = filters or {}
+        group_by = tuple(group_by)
+        unknown = [key for key in (*group_by, *filters) if key not in self.dimensions]
+        if unknown:
+            raise KeyError(f"unknown cube dimensions: {', '.join(unknown)}")
+
+        cuboid = self.cuboids[frozenset(group_by) | frozenset(filters)]
+        mask = np.ones(len(cuboid), dtype=bool)
+        for key, labels in filters.items():
+            categories = cuboid.categories[key]
+            wanted = [categories.index(label) for label in labels if label in categories]
+            mask &= np.isin(cuboid.codes[key], wanted)
+        if not filters and cuboid.dimensions == group_by:
+            return cuboid.groups()
+        return cuboid.aggregate(group_by, mask).groups()
@@ -1,8 +1,93 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Set DATABASE_URL to use a different database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///nashville_sc_business.db")
+
+# Applied to every new SQLite connection. In WAL mode synchronous=NORMAL
+# survives application crashes; only a power loss can drop the last commits.
+SQLITE_PRAGMAS = {
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "journal_mode": "WAL",
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+def _is_sqlite(url):
+    return url.get_backend_name() == "sqlite"
+
+
+def _is_memory(url):
+    return _is_sqlite(url) and url.database in (None, "", ":memory:")
+
+
+def configure_sqlite(engine, read_only=False):
+    # Takes transactions away from pysqlite so every one starts with an
+    # explicit BEGIN. Writers use BEGIN IMMEDIATE: they queue for the write
+    # lock up front (honouring busy_timeout) instead of failing with
+    # "database is locked" when a deferred read upgrades to a write. Readers
+    # use a plain BEGIN, which in WAL mode is a snapshot that never waits on
+    # a writer, and query_only turns any stray write into an error.
+    memory = _is_memory(engine.url)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            if not (memory and name in ("journal_mode", "mmap_size")):
+                cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN" if read_only else "BEGIN IMMEDIATE")
+
+    return engine
+
+
+def _pool_options(url, read_only):
+    if _is_memory(url):
+        # One shared connection, or every checkout would see an empty database.
+        return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+
+    prefix = "DB_READ" if read_only else "DB_WRITE"
+    options = {
+        "pool_size": int(os.getenv(f"{prefix}_POOL_SIZE", "8" if read_only else "1")),
+        "max_overflow": int(os.getenv(f"{prefix}_MAX_OVERFLOW", "8" if read_only else "0")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+    }
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def create_db_engine(url=DATABASE_URL, read_only=False):
+    # SQLite admits one writer at a time, so the write engine keeps a single
+    # connection per process by default: concurrent writers in one process
+    # wait on the pool, which hands the connection over as soon as it is
+    # released, rather than polling SQLite's busy handler. Readers get a
+    # wider pool of their own so they never queue behind a writer.
+    url = make_url(url)
+    engine = create_engine(url, echo=False, **_pool_options(url, read_only))
+    if _is_sqlite(url):
+        configure_sqlite(engine, read_only=read_only)
+    return engine
+
+
+engine = create_db_engine()
+Session = sessionmaker(bind=engine)
 
-# Update this path if you're using a different database
-engine = create_engine("sqlite:///nashville_sc_business.db", 
-                       connect_args={"check_same_thread": False},
-                       echo=False)
-Session = sessionmaker(bind=engine)
\ No newline at end of file
+# Analytics endpoints read through their own pool. An in-memory database
+# exists once per connection, so it has to share the write engine.
+read_engine = engine if _is_memory(engine.url) else create_db_engine(read_only=True)
+ReadSession = sessionmaker(bind=read_engine)
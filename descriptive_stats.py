@@ -0,0 +1,158 @@
+import math
+import threading
+
+import numpy as np
+
+
+def sorted_percentile(ordered, q):
+    # Linear interpolation between closest ranks on an already sorted array.
+    if not ordered.size:
+        return 0.0
+    if q <= 0:
+        return ordered[0].item()
+    if q >= 100:
+        return ordered[-1].item()
+
+    idx = (ordered.size - 1) * (q / 100)
+    lo = int(math.floor(idx))
+    hi = int(math.ceil(idx))
+    if lo == hi:
+        return ordered[lo].item()
+    weight = idx - lo
+    return ordered[lo].item() * (1 - weight) + ordered[hi].item() * weight
+
+
+class StreamingDistribution:
+    # Welford mean/M2 accumulators plus one sorted copy of the values. Every
+    # order statistic is read straight off the sorted array, so a summary costs
+    # one sort up front and appends only merge the new values in.
+
+    __slots__ = ("count", "mean", "_m2", "_ordered")
+
+    def __init__(self, values=()):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._ordered = np.zeros(0)
+        self.extend(values)
+
+    def extend(self, values):
+        batch = values if isinstance(values, np.ndarray) else np.asarray(values)
+        if not batch.size:
+            return
+        batch_mean = float(batch.mean())
+        batch_m2 = float(((batch - batch_mean) ** 2).sum())
+        batch_sorted = np.sort(batch)
+
+        if not self.count:
+            self.count = batch.size
+            self.mean = batch_mean
+            self._m2 = batch_m2
+            self._ordered = batch_sorted
+            return
+
+        # Chan et al. pairwise combination of two Welford states.
+        total = self.count + batch.size
+        delta = batch_mean - self.mean
+        self.mean += delta * batch.size / total
+        self._m2 += batch_m2 + delta * delta * self.count * batch.size / total
+        self.count = total
+        positions = np.searchsorted(self._ordered, batch_sorted, side="right")
+        self._ordered = np.insert(self._ordered, positions, batch_sorted)
+
+    def add(self, value):
+        self.extend([value])
+
+    def copy(self):
+        clone = StreamingDistribution()
+        clone.count = self.count
+        clone.mean = self.mean
+        clone._m2 = self._m2
+        clone._ordered = self._ordered
+        return clone
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, q):
+        return sorted_percentile(self._ordered, q)
+
+    def summary(self):
+        if not self.count:
+            return None
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std_dev": self.std_dev,
+            "min": self._ordered[0].item(),
+            "max": self._ordered[-1].item(),
+            "median": float(self.percentile(50)),
+            "q1": self.percentile(25),
+            "q3": self.percentile(75),
+            "p10": self.percentile(10),
+            "p90": self.percentile(90),
+        }
+
+
+class DistributionSet:
+    # Named distributions over frame columns, one set per key (e.g. a data
+    # partition), each valid for one data version. Writers that know exactly
+    # which rows they added can advance a key to the next version by
+    # appending those rows instead of rebuilding it.
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._rebuilds = 0
+        self._appends = 0
+
+    def build(self, frame):
+        return {name: StreamingDistribution(frame[column]) for name, column in self.columns.items()}
+
+    def get(self, version, frame, key=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[2]
+        distributions = self.build(frame)
+        with self._lock:
+            # Versions are per key, so only this key's older set is replaced.
+            self._entries[key] = (version, len(frame), distributions)
+            self._rebuilds += 1
+        return distributions
+
+    def advance(self, from_version, to_version, rows, new_frame, key=None):
+        # rows is the size the key's data is expected to have at the new
+        # version; a mismatch means someone else also wrote, so drop the set.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != from_version or entry[1] + len(new_frame) != rows:
+                self._entries.pop(key, None)
+                return False
+            current = entry[2]
+        updated = {}
+        for name, column in self.columns.items():
+            updated[name] = current[name].copy()
+            updated[name].extend(new_frame[column])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != from_version:
+                return False
+            self._entries[key] = (to_version, rows, updated)
+            self._appends += 1
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "keys": len(self._entries),
+                "rows": sum(entry[1] for entry in self._entries.values()),
+                "rebuilds": self._rebuilds,
+                "incremental_appends": self._appends,
+            }
@@ -0,0 +1,211 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from online_regression import RegressionSums
+
+Z_80 = 1.2816
+DEFAULT_HORIZON = 3
+MIN_TRAIN_GAMES = 8
+MAX_BACKTEST_ORIGINS = 24
+SES_ALPHAS = np.linspace(0.05, 0.95, 19)
+
+# Backtests move to a process pool once (games x origins) passes this much
+# work; below it, worker start-up costs more than the fits themselves.
+PARALLEL_MIN_WORK = 50_000
+
+
+def _fit_summary(actual, residuals, dof):
+    if not residuals.size:
+        return {"r_squared": 0.0, "residual_se": 0.0}
+    sse = float(np.dot(residuals, residuals))
+    sst = float(np.dot(actual - actual.mean(), actual - actual.mean()))
+    return {"r_squared": 1 - sse / sst if sst else 0.0, "residual_se": math.sqrt(sse / max(1, dof))}
+
+
+def forecast_linear(history, horizon, future_features):
+    sums = history.get("linear_sums") or RegressionSums.from_values(history["y"])
+    slope, intercept, r_squared, residual_se = sums.fit()
+    steps = np.arange(sums.n + 1, sums.n + horizon + 1, dtype=float)
+    return intercept + slope * steps, {"r_squared": r_squared, "residual_se": residual_se}
+
+
+def forecast_seasonal_naive(history, horizon, future_features):
+    # Repeats the last full season; falls back to the last game until there
+    # are two seasons, so the seasonal errors behind the interval exist.
+    y = history["y"]
+    period = history["season_length"] if y.size >= 2 * history["season_length"] > 2 else 1
+    last_season = y[-period:]
+    predictions = last_season[np.arange(horizon) % period]
+    residuals = y[period:] - y[:-period]
+    return predictions, _fit_summary(y[period:], residuals, residuals.size - 1)
+
+
+def forecast_exponential_smoothing(history, horizon, future_features):
+    # Simple exponential smoothing; every alpha on the grid is run in the same
+    # pass and the one with the smallest one-step-ahead SSE is kept.
+    y = history["y"]
+    level = np.full(SES_ALPHAS.size, y[0])
+    sse = np.zeros(SES_ALPHAS.size)
+    for value in y[1:]:
+        error = value - level
+        sse += error * error
+        level += SES_ALPHAS * error
+    best = int(np.argmin(sse))
+
+    fitted = np.empty(y.size - 1)
+    smoothed = y[0]
+    for i, value in enumerate(y[1:]):
+        fitted[i] = smoothed
+        smoothed += SES_ALPHAS[best] * (value - smoothed)
+    summary = _fit_summary(y[1:], y[1:] - fitted, fitted.size - 1)
+    summary["alpha"] = round(float(SES_ALPHAS[best]), 2)
+    return np.full(horizon, smoothed), summary
+
+
+def _design_matrix(codes, levels):
+    # Intercept plus one-hot columns for every level except the first of each
+    # feature; unknown codes (-1) fall back to the baseline level.
+    columns = [np.ones(codes.shape[0])]
+    for j, count in enumerate(levels):
+        for level in range(1, count):
+            columns.append((codes[:, j] == level).astype(float))
+    return np.column_stack(columns)
+
+
+def forecast_feature_regression(history, horizon, future_features):
+    y = history["y"]
+    design = _design_matrix(history["features"], history["levels"])
+    coefficients, _, rank, _ = np.linalg.lstsq(design, y, rcond=None)
+    fitted = design @ coefficients
+    predictions = _design_matrix(future_features, history["levels"]) @ coefficients
+    return predictions, _fit_summary(y, y - fitted, y.size - rank)
+
+
+FORECASTERS = {
+    "linear": forecast_linear,
+    "seasonal_naive": forecast_seasonal_naive,
+    "exponential_smoothing": forecast_exponential_smoothing,
+    "feature_regression": forecast_feature_regression,
+}
+
+# Display names of the forecasters, reported with the selected model.
+FORECASTER_LABELS = {
+    "linear": "Linear trend (OLS)",
+    "seasonal_naive": "Seasonal naive",
+    "exponential_smoothing": "Simple exponential smoothing",
+    "feature_regression": "Feature regression",
+}
+
+
+def backtest_origins(n, horizon, max_origins=MAX_BACKTEST_ORIGINS):
+    # Forecast origins spread evenly over the history so multi-season data is
+    # scored on every season, not just the most recent games.
+    if n <= MIN_TRAIN_GAMES:
+        return []
+    origins = np.linspace(MIN_TRAIN_GAMES, n - 1, num=min(max_origins, n - MIN_TRAIN_GAMES))
+    return sorted({int(round(origin)) for origin in origins})
+
+
+def _slice_history(history, end):
+    return {
+        "y": history["y"][:end],
+        "features": history["features"][:end],
+        "levels": history["levels"],
+        "season_length": history["season_length"],
+    }
+
+
+def _backtest_task(name, history, origins, horizon):
+    # Returns (sum of absolute percentage errors, scored forecasts) for one
+    # model over a chunk of origins. Module-level so worker processes can run it.
+    forecaster = FORECASTERS[name]
+    y = history["y"]
+    ape_sum = 0.0
+    scored = 0
+    for origin in origins:
+        steps = min(horizon, y.size - origin)
+        predictions, _ = forecaster(_slice_history(history, origin), steps, history["features"][origin:origin + steps])
+        actual = y[origin:origin + steps]
+        nonzero = actual != 0
+        ape_sum += float(np.sum(np.abs(actual[nonzero] - predictions[nonzero]) / np.abs(actual[nonzero])))
+        scored += int(nonzero.sum())
+    return ape_sum, scored
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _backtest_pool(workers):
+    # One long-lived pool per process. Spawned workers import only this module,
+    # never the Flask app, and avoid forking a multi-threaded server.
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _POOL
+
+
+def run_backtests(history, horizon, names=None, workers=None):
+    names = list(names or FORECASTERS)
+    origins = backtest_origins(history["y"].size, horizon)
+    if not origins:
+        return {name: None for name in names}, 0
+
+    if workers is None:
+        workers = int(os.getenv("FORECAST_BACKTEST_WORKERS", os.cpu_count() or 1))
+    totals = {name: [0.0, 0] for name in names}
+    if workers > 1 and history["y"].size * len(origins) >= PARALLEL_MIN_WORK:
+        chunks = [chunk.tolist() for chunk in np.array_split(np.array(origins), min(workers, len(origins)))]
+        pool = _backtest_pool(workers)
+        futures = [
+            (name, pool.submit(_backtest_task, name, history, chunk, horizon)) for name in names for chunk in chunks
+        ]
+        for name, future in futures:
+            ape_sum, scored = future.result()
+            totals[name][0] += ape_sum
+            totals[name][1] += scored
+    else:
+        for name in names:
+            totals[name] = list(_backtest_task(name, history, origins, horizon))
+
+    return {name: (100 * ape_sum / scored if scored else None) for name, (ape_sum, scored) in totals.items()}, len(origins)
+
+
+def forecast_attendance(history, future_features, horizon=DEFAULT_HORIZON, workers=None):
+    # history: y (attendance in game order), features (n x k integer codes),
+    # levels (category count per feature), season_length (games per season)
+    # and optionally linear_sums (prebuilt RegressionSums for y).
+    mapes, origin_count = run_backtests(history, horizon, workers=workers)
+    scored = {name: mape for name, mape in mapes.items() if mape is not None}
+    # The linear baseline wins ties and is used when there is too little history to backtest.
+    selected = min(scored, key=lambda name: (scored[name], name != "linear")) if scored else "linear"
+
+    predictions, fit = FORECASTERS[selected](history, horizon, future_features)
+    n = history["y"].size
+    margin = Z_80 * fit["residual_se"]
+    return {
+        "model": selected,
+        "model_label": FORECASTER_LABELS[selected],
+        "predictions": [
+            {
+                "game_number": n + step,
+                "predicted_attendance": int(round(prediction)),
+                "pi80_low": int(round(max(0.0, prediction - margin))),
+                "pi80_high": int(round(prediction + margin)),
+            }
+            for step, prediction in enumerate(predictions.tolist(), start=1)
+        ],
+        "r_squared": round(fit["r_squared"], 4),
+        "backtest": {
+            "metric": "mape",
+            "origins": origin_count,
+            "horizon": horizon,
+            "models": {name: round(mape, 2) if mape is not None else None for name, mape in mapes.items()},
+        },
+    }
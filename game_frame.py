@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class Categorical:
+    # Integer codes into a sorted list of category labels.
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes, categories):
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.categories = list(categories)
+
+    @classmethod
+    def from_values(cls, values):
+        if not len(values):
+            return cls(np.zeros(0, dtype=np.int32), [])
+        categories, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        return cls(codes, categories.tolist())
+
+    def __len__(self):
+        return self.codes.size
+
+    def code_of(self, label):
+        try:
+            return self.categories.index(label)
+        except ValueError:
+            return -1
+
+    def mask(self, label):
+        return self.codes == self.code_of(label)
+
+    def labels(self):
+        return np.asarray(self.categories, dtype=object)[self.codes].tolist() if self.categories else []
+
+    def take(self, selector):
+        return Categorical(self.codes[selector], self.categories)
+
+    def with_label(self, positions, label):
+        categories = list(self.categories)
+        if label not in categories:
+            categories.append(label)
+        codes = self.codes.copy()
+        codes[positions] = categories.index(label)
+        # Re-sort so categories stay in label order after the insertion.
+        order = sorted(range(len(categories)), key=categories.__getitem__)
+        remap = np.empty(len(categories), dtype=np.int32)
+        remap[order] = np.arange(len(categories), dtype=np.int32)
+        return Categorical(remap[codes], [categories[i] for i in order])
+
+
+class GameFrame:
+    # Column-oriented, read-only game table: NumPy arrays for numeric and date
+    # columns, Categorical for text dimensions. Shared between requests through
+    # the frame cache, so columns must never be mutated in place.
+
+    def __init__(self, columns):
+        lengths = {len(col) for col in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("all GameFrame columns must have the same length")
+        self._columns = dict(columns)
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    @property
+    def column_names(self):
+        return list(self._columns)
+
+    def is_categorical(self, name):
+        return isinstance(self._columns[name], Categorical)
+
+    def labels(self, name):
+        column = self._columns[name]
+        return column.labels() if isinstance(column, Categorical) else column.tolist()
+
+    def take(self, selector):
+        return GameFrame(
+            {
+                name: col.take(selector) if isinstance(col, Categorical) else col[selector]
+                for name, col in self._columns.items()
+            }
+        )
+
+    def with_column(self, name, values):
+        columns = dict(self._columns)
+        columns[name] = values
+        return GameFrame(columns)
+
+    def nbytes(self):
+        total = 0
+        for col in self._columns.values():
+            if isinstance(col, Categorical):
+                total += col.codes.nbytes + sum(len(str(c)) for c in col.categories)
+            else:
+                total += col.nbytes
+        return total
+
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def weekday_labels(dates):
+    # 1970-01-01 was a Thursday (index 3 with Monday = 0).
+    valid = ~np.isnat(dates)
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    names = np.asarray(WEEKDAY_NAMES, dtype=object)[(days + 3) % 7]
+    return np.where(valid, names, "Unknown")
+
+
+def month_labels(dates):
+    valid = ~np.isnat(dates)
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12
+    names = np.asarray(MONTH_NAMES, dtype=object)[months]
+    return np.where(valid, names, "Unknown")
+
+
+def date_strings(dates):
+    return np.datetime_as_string(dates, unit="D").tolist()
@@ -0,0 +1,375 @@
+import os
+import sys
+from itertools import groupby
+
+from sqlalchemy import Integer, bindparam, cast, delete, func, insert, inspect, literal, select, text, tuple_, update
+
+from anomaly_detection import AnomalyDetector
+from database import engine
+from game_frame import MONTH_NAMES, WEEKDAY_NAMES
+from models import (
+    AnomalyLabel,
+    AttendanceTrend,
+    Base,
+    Club,
+    Game,
+    GameSummary,
+    MerchSale,
+    QuantileSketch,
+    Ticket,
+    Venue,
+)
+from online_regression import RegressionSums
+from quantile_sketch import TDigest
+
+# Games written before clubs and venues existed belong to this club, and
+# venues registered without a known capacity get this one.
+DEFAULT_CLUB_NAME = os.getenv("DEFAULT_CLUB", "Nashville SC")
+DEFAULT_VENUE_CAPACITY = int(os.getenv("DEFAULT_VENUE_CAPACITY", "30000"))
+
+# Season and segment digests are kept for these metrics and dimensions; games
+# keep only their price digests (one attendance value says nothing alone).
+SKETCH_METRICS = ("ticket_price", "merch_price", "attendance")
+SKETCH_DIMENSIONS = ("competition", "weekday", "month")
+
+
+def _in_partitions(stmt, columns, partitions):
+    # partitions is a list of (club_id, season) pairs; None means every game.
+    if partitions is None:
+        return stmt
+    return stmt.where(tuple_(*columns).in_(partitions))
+
+
+def partition_game_ids(partitions):
+    return _in_partitions(select(Game.id), (Game.club_id, Game.season), partitions)
+
+
+def ensure_club(conn, name):
+    club_id = conn.execute(select(Club.id).where(Club.name == name)).scalar()
+    if club_id is None:
+        club_id = conn.execute(insert(Club).values(name=name)).inserted_primary_key[0]
+    return club_id
+
+
+def register_venues(conn, club_id, names, capacity=DEFAULT_VENUE_CAPACITY):
+    # Adds the venues that are not registered yet; existing capacities are kept.
+    known = set(conn.execute(select(Venue.name).where(Venue.name.in_(names))).scalars())
+    missing = sorted({name for name in names if name and name not in known})
+    if missing:
+        conn.execute(insert(Venue), [{"name": name, "capacity": capacity, "club_id": club_id} for name in missing])
+    return missing
+
+
+def backfill_partitions(conn):
+    # Assigns games from before partitioning to the default club and to the
+    # calendar year they were played in, and registers their venues.
+    club_id = ensure_club(conn, DEFAULT_CLUB_NAME)
+    conn.execute(update(Game).where(Game.club_id.is_(None)).values(club_id=club_id))
+    conn.execute(
+        update(Game).where(Game.season.is_(None)).values(season=cast(func.strftime("%Y", Game.game_date), Integer))
+    )
+    register_venues(conn, club_id, conn.execute(select(Game.venue).distinct()).scalars().all())
+
+
+def rebuild_game_summary(conn, partitions=None):
+    # Recomputes the game_summary rows of the given partitions (default: all)
+    # from the fact tables in one statement.
+    ticket_totals = (
+        select(
+            Ticket.game_id,
+            func.sum(Ticket.revenue).label("ticket_revenue"),
+            func.sum(Ticket.quantity).label("tickets_sold"),
+        )
+        .group_by(Ticket.game_id)
+        .subquery()
+    )
+    merch_totals = (
+        select(
+            MerchSale.game_id,
+            func.sum(MerchSale.total_revenue).label("merch_revenue"),
+            func.sum(MerchSale.quantity).label("merch_units"),
+        )
+        .group_by(MerchSale.game_id)
+        .subquery()
+    )
+    totals = _in_partitions(
+        select(
+            Game.id,
+            func.coalesce(ticket_totals.c.ticket_revenue, literal(0)),
+            func.coalesce(ticket_totals.c.tickets_sold, literal(0)),
+            func.coalesce(merch_totals.c.merch_revenue, literal(0)),
+            func.coalesce(merch_totals.c.merch_units, literal(0)),
+        )
+        .outerjoin(ticket_totals, ticket_totals.c.game_id == Game.id)
+        .outerjoin(merch_totals, merch_totals.c.game_id == Game.id),
+        (Game.club_id, Game.season),
+        partitions,
+    )
+    if partitions is None:
+        conn.execute(delete(GameSummary))
+    else:
+        conn.execute(delete(GameSummary).where(GameSummary.game_id.in_(partition_game_ids(partitions))))
+    return conn.execute(
+        insert(GameSummary).from_select(
+            ["game_id", "ticket_revenue", "tickets_sold", "merch_revenue", "merch_units"], totals
+        )
+    ).rowcount
+
+
+def rebuild_attendance_trend(conn, partitions=None):
+    # Recomputes the persisted trend sums of the given partitions (default:
+    # all), one row per club season, from their games in forecast order.
+    games = conn.execute(
+        _in_partitions(
+            select(
+                Game.club_id, Game.season, Game.id, Game.game_date, func.coalesce(Game.attendance, literal(0))
+            ).order_by(Game.club_id, Game.season, Game.game_date, Game.id),
+            (Game.club_id, Game.season),
+            partitions,
+        )
+    ).all()
+    conn.execute(
+        _in_partitions(delete(AttendanceTrend), (AttendanceTrend.club_id, AttendanceTrend.season), partitions)
+    )
+    trends = []
+    for (club_id, season), rows in groupby(games, key=lambda row: (row[0], row[1])):
+        rows = list(rows)
+        sums = RegressionSums.from_values([attendance for *_, attendance in rows])
+        trends.append(
+            dict(
+                club_id=club_id,
+                season=season,
+                last_game_date=rows[-1][3],
+                last_game_id=rows[-1][2],
+                **sums.to_dict(),
+            )
+        )
+    if trends:
+        conn.execute(insert(AttendanceTrend), trends)
+    return len(games)
+
+
+def rebuild_anomaly_labels(conn, partitions=None):
+    # Relabels every game of the given partitions (default: all) by replaying
+    # each club season in date order through a fresh detector. Returns the
+    # detectors, which are left positioned after the last game.
+    games = conn.execute(
+        _in_partitions(
+            select(Game.club_id, Game.season, Game.id, func.coalesce(Game.attendance, literal(0))).order_by(
+                Game.club_id, Game.season, Game.game_date, Game.id
+            ),
+            (Game.club_id, Game.season),
+            partitions,
+        )
+    ).all()
+    if partitions is None:
+        conn.execute(delete(AnomalyLabel))
+    else:
+        conn.execute(delete(AnomalyLabel).where(AnomalyLabel.game_id.in_(partition_game_ids(partitions))))
+    detectors = {}
+    labels = []
+    for partition, rows in groupby(games, key=lambda row: (row[0], row[1])):
+        detector = detectors[partition] = AnomalyDetector()
+        for *_, game_id, attendance in rows:
+            labels.extend(detector.observe(game_id, attendance))
+    if labels:
+        conn.execute(insert(AnomalyLabel), labels)
+    return detectors
+
+
+def sketch_segments(competition, game_date):
+    # The segment labels a game rolls up into, matching the game frame's.
+    competition = str(competition).strip() if competition is not None else ""
+    return {
+        "competition": competition or "Unknown",
+        "weekday": WEEKDAY_NAMES[game_date.weekday()] if game_date else "Unknown",
+        "month": MONTH_NAMES[game_date.month - 1] if game_date else "Unknown",
+    }
+
+
+def price_digest(rows):
+    # Unit prices of (quantity, revenue) rows, each weighted by its quantity.
+    rows = [(revenue / quantity, quantity) for quantity, revenue in rows if quantity and quantity > 0]
+    if not rows:
+        return None
+    prices, quantities = zip(*rows)
+    return TDigest.from_values(prices, quantities)
+
+
+def merge_sketches(conn, games):
+    # games are dicts of club_id, season, game_id, competition, game_date,
+    # attendance and the game's price digests by metric. Stores the game
+    # digests and merges them, with attendance, into the stored season and
+    # segment digests of their club seasons: one read, then batched writes.
+    game_rows = []
+    pending = {}
+    for game in games:
+        partition = (game["club_id"], game["season"])
+        digests = {metric: digest for metric, digest in game["digests"].items() if digest is not None}
+        game_rows.extend(
+            {
+                "club_id": partition[0],
+                "season": partition[1],
+                "metric": metric,
+                "game_id": game["game_id"],
+                "digest": digest.to_bytes(),
+            }
+            for metric, digest in digests.items()
+        )
+        digests["attendance"] = TDigest.from_values([game["attendance"]])
+        scopes = [(None, None), *sketch_segments(game["competition"], game["game_date"]).items()]
+        for metric, digest in digests.items():
+            for dimension, segment in scopes:
+                pending.setdefault((*partition, metric, dimension, segment), []).append(digest)
+    if game_rows:
+        conn.execute(insert(QuantileSketch), game_rows)
+
+    sketches = QuantileSketch.__table__
+    stored = {
+        (row.club_id, row.season, row.metric, row.dimension, row.segment): row
+        for row in conn.execute(
+            _in_partitions(
+                select(sketches).where(sketches.c.game_id.is_(None)),
+                (sketches.c.club_id, sketches.c.season),
+                sorted({key[:2] for key in pending}),
+            )
+        )
+    }
+    inserts = []
+    updates = []
+    for key, digests in pending.items():
+        row = stored.get(key)
+        if row is not None:
+            digests = [TDigest.from_bytes(row.digest), *digests]
+        digest = TDigest.merge_all(digests).to_bytes()
+        if row is None:
+            inserts.append(dict(zip(("club_id", "season", "metric", "dimension", "segment"), key), digest=digest))
+        else:
+            updates.append({"sketch_id": row.id, "sketch_digest": digest})
+    if inserts:
+        conn.execute(insert(QuantileSketch), inserts)
+    if updates:
+        conn.execute(
+            update(sketches).where(sketches.c.id == bindparam("sketch_id")).values(digest=bindparam("sketch_digest")),
+            updates,
+        )
+
+
+def rebuild_quantile_sketches(conn, partitions=None):
+    # Recomputes every digest of the given partitions (default: all) from
+    # their games and fact tables.
+    conn.execute(_in_partitions(delete(QuantileSketch), (QuantileSketch.club_id, QuantileSketch.season), partitions))
+    prices = {}
+    for metric, model, revenue in (
+        ("ticket_price", Ticket, Ticket.revenue),
+        ("merch_price", MerchSale, MerchSale.total_revenue),
+    ):
+        rows = conn.execute(
+            select(model.game_id, model.quantity, revenue)
+            .where(model.game_id.in_(partition_game_ids(partitions)))
+            .order_by(model.game_id)
+        )
+        for game_id, game_rows in groupby(rows, key=lambda row: row[0]):
+            prices.setdefault(game_id, {})[metric] = price_digest((quantity, value) for _, quantity, value in game_rows)
+    games = conn.execute(
+        _in_partitions(
+            select(
+                Game.id,
+                Game.club_id,
+                Game.season,
+                Game.competition,
+                Game.game_date,
+                func.coalesce(Game.attendance, literal(0)),
+            ).order_by(Game.game_date, Game.id),
+            (Game.club_id, Game.season),
+            partitions,
+        )
+    ).all()
+    merge_sketches(
+        conn,
+        [
+            {
+                "game_id": game_id,
+                "club_id": club_id,
+                "season": season,
+                "competition": competition,
+                "game_date": game_date,
+                "attendance": attendance,
+                "digests": prices.get(game_id, {}),
+            }
+            for game_id, club_id, season, competition, game_date, attendance in games
+        ],
+    )
+    return len(games)
+
+
+def upgrade(bind=engine):
+    # Brings an existing database file up to the current models: creates any
+    # missing tables, adds missing nullable columns to tables that already
+    # existed, then any missing indexes on them (create_all skips both for
+    # tables it does not create itself), and backfills the club/season
+    # partitions, game_summary, attendance_trend, anomaly_labels and
+    # quantile_sketches the first time they appear. It all runs in one
+    # BEGIN IMMEDIATE transaction, so processes upgrading the same file at
+    # once take turns and the later ones find nothing left to do.
+    created = []
+    with bind.begin() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        Base.metadata.create_all(conn)
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {column["name"] for column in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    conn.execute(
+                        text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}")
+                    )
+                    created.append(f"{table.name}.{column.name}")
+        existing = {
+            table_name: {ix["name"] for ix in inspect(conn).get_indexes(table_name)}
+            for table_name in Base.metadata.tables
+        }
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing[table.name]:
+                    index.create(conn)
+                    created.append(index.name)
+        if Club.__tablename__ not in existing_tables:
+            backfill_partitions(conn)
+            created.append(Club.__tablename__)
+        else:
+            ensure_club(conn, DEFAULT_CLUB_NAME)
+        if GameSummary.__tablename__ not in existing_tables:
+            rebuild_game_summary(conn)
+            created.append(GameSummary.__tablename__)
+        if AttendanceTrend.__tablename__ not in existing_tables or "attendance_trend.season" in created:
+            rebuild_attendance_trend(conn)
+            created.append(AttendanceTrend.__tablename__)
+        if AnomalyLabel.__tablename__ not in existing_tables:
+            rebuild_anomaly_labels(conn)
+            created.append(AnomalyLabel.__tablename__)
+        if QuantileSketch.__tablename__ not in existing_tables:
+            rebuild_quantile_sketches(conn)
+            created.append(QuantileSketch.__tablename__)
+        if created:
+            conn.execute(text("ANALYZE"))
+    return created
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["rebuild-summary"]:
+        with engine.begin() as conn:
+            print(f"Rebuilt game_summary rows: {rebuild_game_summary(conn)}")
+            print(f"Rebuilt attendance_trend over games: {rebuild_attendance_trend(conn)}")
+            print(f"Relabelled anomalies in club seasons: {len(rebuild_anomaly_labels(conn))}")
+            print(f"Rebuilt quantile_sketches over games: {rebuild_quantile_sketches(conn)}")
+    elif sys.argv[1:] == ["backfill-partitions"]:
+        with engine.begin() as conn:
+            backfill_partitions(conn)
+            print(f"Backfilled partitions; rebuilt attendance_trend over games: {rebuild_attendance_trend(conn)}")
+            print(f"Relabelled anomalies in club seasons: {len(rebuild_anomaly_labels(conn))}")
+            print(f"Rebuilt quantile_sketches over games: {rebuild_quantile_sketches(conn)}")
+    else:
+        created = upgrade()
+        print(f"Created: {', '.join(created)}" if created else "Schema is up to date")
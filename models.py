@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -11,6 +11,21 @@ class Promotion(Base):
     description = Column(String)
     games = relationship("Game", back_populates="promotion")
 
+class Club(Base):
+    __tablename__ = 'clubs'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    games = relationship("Game", back_populates="club")
+
+class Venue(Base):
+    # Games reference their venue by name; capacity lives here so occupancy
+    # is measured against the ground each game was actually played at.
+    __tablename__ = 'venues'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    capacity = Column(Integer, nullable=False)
+    club_id = Column(Integer, ForeignKey('clubs.id'))
+
 class Game(Base):
     __tablename__ = 'games'
     id = Column(Integer, primary_key=True)
@@ -19,10 +34,20 @@ class Game(Base):
     attendance = Column(Integer)
     competition = Column(String)
     venue = Column(String)
+    season = Column(Integer)
+    club_id = Column(Integer, ForeignKey('clubs.id'))
     promotion_id = Column(Integer, ForeignKey('promotions.id'))
     promotion = relationship("Promotion", back_populates="games")
+    club = relationship("Club", back_populates="games")
     merch_sales = relationship("MerchSale", back_populates="game")
     tickets = relationship("Ticket", back_populates="game")
+    __table_args__ = (
+        Index("ix_games_game_date", "game_date", "id"),
+        Index("ix_games_promotion_id", "promotion_id"),
+        # Partition pruning: one club's season is a single range of this index,
+        # already in forecast order, however many other seasons are stored.
+        Index("ix_games_partition", "club_id", "season", "game_date", "id"),
+    )
 
 class Ticket(Base):
     __tablename__ = 'tickets'
@@ -32,6 +57,11 @@ class Ticket(Base):
     quantity = Column(Integer)
     revenue = Column(Integer)
     game = relationship("Game", back_populates="tickets")
+    # Covering indexes: per-game totals and the ticket mix GROUP BY read only the index.
+    __table_args__ = (
+        Index("ix_tickets_game_id", "game_id", "quantity", "revenue"),
+        Index("ix_tickets_type", "type", "quantity", "revenue"),
+    )
 
 class MerchSale(Base):
     __tablename__ = 'merch_sales'
@@ -41,3 +71,70 @@ class MerchSale(Base):
     quantity = Column(Integer)
     total_revenue = Column(Integer)
     game = relationship("Game", back_populates="merch_sales")
+    __table_args__ = (
+        Index("ix_merch_sales_game_id", "game_id", "quantity", "total_revenue"),
+        Index("ix_merch_sales_item", "item", "quantity", "total_revenue"),
+    )
+
+
+class GameSummary(Base):
+    # Per-game ticket/merch totals maintained on write so analytics read one
+    # narrow row per game instead of aggregating the fact tables.
+    __tablename__ = 'game_summary'
+    game_id = Column(Integer, ForeignKey('games.id'), primary_key=True)
+    ticket_revenue = Column(Integer, nullable=False, default=0)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    merch_revenue = Column(Integer, nullable=False, default=0)
+    merch_units = Column(Integer, nullable=False, default=0)
+
+
+class AttendanceTrend(Base):
+    # Running OLS sums of attendance against game number (games ordered by
+    # date, then id), one row per club season, updated on write so the trend
+    # forecast needs no rescan.
+    __tablename__ = 'attendance_trend'
+    id = Column(Integer, primary_key=True)
+    club_id = Column(Integer, ForeignKey('clubs.id'))
+    season = Column(Integer)
+    n = Column(Integer, nullable=False, default=0)
+    sum_x = Column(Integer, nullable=False, default=0)
+    sum_y = Column(Integer, nullable=False, default=0)
+    sum_xy = Column(Integer, nullable=False, default=0)
+    sum_xx = Column(Integer, nullable=False, default=0)
+    sum_yy = Column(Integer, nullable=False, default=0)
+    last_game_date = Column(Date)
+    last_game_id = Column(Integer)
+    __table_args__ = (Index("ix_attendance_trend_partition", "club_id", "season", unique=True),)
+
+
+class AnomalyLabel(Base):
+    # Demand risk/spike label of each game against the attendance percentiles
+    # of the games before it in its club season, under expanding (every
+    # earlier game) and rolling (the most recent games) thresholds. Assigned
+    # once when the game is written, except that a season's first games get
+    # their rows once it has enough of them; tag is NULL when unflagged.
+    __tablename__ = 'anomaly_labels'
+    game_id = Column(Integer, ForeignKey('games.id'), primary_key=True)
+    mode = Column(String, primary_key=True)
+    tag = Column(String)
+    low_threshold = Column(Float)
+    high_threshold = Column(Float)
+
+
+class QuantileSketch(Base):
+    # Serialized t-digest of one metric, kept per game (game_id set), per
+    # segment of a club season (dimension and segment set) and per club
+    # season (neither set). Game digests merge into the other two on write.
+    __tablename__ = 'quantile_sketches'
+    id = Column(Integer, primary_key=True)
+    club_id = Column(Integer, ForeignKey('clubs.id'))
+    season = Column(Integer)
+    metric = Column(String, nullable=False)
+    game_id = Column(Integer, ForeignKey('games.id'))
+    dimension = Column(String)
+    segment = Column(String)
+    digest = Column(LargeBinary, nullable=False)
+    __table_args__ = (
+        Index("ix_quantile_sketches_partition", "club_id", "season", "metric", "dimension", "segment"),
+        Index("ix_quantile_sketches_game_id", "game_id"),
+    )
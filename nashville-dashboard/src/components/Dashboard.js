@@ -58,10 +58,12 @@ function Dashboard() {
   const executiveRef = useRef(null);
   const methodsRef = useRef(null);
   const opsRef = useRef(null);
+  const gameDetailCache = useRef(new Map());
 
   const loadDashboard = async () => {
     setLoading(true);
     setLoadErrors([]);
+    gameDetailCache.current.clear();
 
     const endpoints = [
       { key: 'health', path: '/api/health' },
@@ -94,18 +96,6 @@ function Dashboard() {
     loadDashboard();
   }, []);
 
-  useEffect(() => {
-    if (!selectedGame) {
-      setGameDetail(null);
-      return;
-    }
-
-    axios
-      .get(apiPath(`/api/game_detail/${Number(selectedGame)}`))
-      .then((res) => setGameDetail(res.data || null))
-      .catch((err) => console.error('Failed to fetch game detail:', err));
-  }, [selectedGame]);
-
   useEffect(() => {
     if (selectedGame && drilldownRef.current) {
       drilldownRef.current.scrollIntoView({ behavior: 'smooth', block: 'start' });
@@ -185,6 +175,37 @@ function Dashboard() {
   };
 
   const series = holisticAnalysis?.attendance_time_series || EMPTY_ARR;
+
+  useEffect(() => {
+    if (!selectedGame) {
+      setGameDetail(null);
+      return undefined;
+    }
+
+    const gameId = Number(selectedGame);
+    const cache = gameDetailCache.current;
+    setGameDetail(cache.get(gameId) || null);
+
+    // Fetch the selected game together with its neighbours in one call, so
+    // stepping through the drilldown is usually served from the cache.
+    const index = series.findIndex((row) => row.game_id === gameId);
+    const neighbours = index >= 0 ? [series[index - 1]?.game_id, series[index + 1]?.game_id] : [];
+    const ids = [gameId, ...neighbours].filter((id) => id && !cache.has(id));
+    if (!ids.length) return undefined;
+
+    let active = true;
+    axios
+      .get(apiPath('/api/game_details'), { params: { ids: ids.join(',') } })
+      .then((res) => {
+        (res.data?.games || EMPTY_ARR).forEach((game) => cache.set(game.game_id, game));
+        if (active) setGameDetail(cache.get(gameId) || null);
+      })
+      .catch((err) => console.error('Failed to fetch game detail:', err));
+    return () => {
+      active = false;
+    };
+  }, [selectedGame, series]);
+
   const kpis = holisticAnalysis?.kpis || EMPTY_OBJ;
   const stats = holisticAnalysis?.statistics?.descriptive || EMPTY_OBJ;
   const methods = holisticAnalysis?.methods || EMPTY_OBJ;
@@ -204,7 +225,8 @@ function Dashboard() {
 
   const selectedGameData = series.find((row) => row.game_id === Number(selectedGame));
   const selectedAttendance = Number(selectedGameData?.attendance || 0);
-  const remainingSeats = Math.max(0, STADIUM_CAPACITY - selectedAttendance);
+  const stadiumCapacity = holisticAnalysis?.meta?.stadium_capacity || STADIUM_CAPACITY;
+  const remainingSeats = Math.max(0, stadiumCapacity - selectedAttendance);
 
   const {
     attendanceTrendChart,
@@ -248,7 +270,7 @@ function Dashboard() {
     if (forecast?.predictions?.length) {
       const next = forecast.predictions[0];
       highlights.push(
-        `Next-game baseline forecast: ${fmtInt(next.predicted_attendance)} (80% PI ${fmtInt(next.pi80_low)}-${fmtInt(next.pi80_high)}).`
+        `Next-game forecast: ${fmtInt(next.predicted_attendance)} (80% PI ${fmtInt(next.pi80_low)}-${fmtInt(next.pi80_high)}).`
       );
     }
     return highlights;
@@ -257,9 +279,9 @@ function Dashboard() {
   const summaryCards = [
     { label: 'Average Attendance', value: fmtInt(kpis.avg_attendance), note: `Median ${fmtInt(kpis.median_attendance)}` },
     { label: 'Total Revenue', value: fmtMoney(kpis.total_revenue), note: `${fmtMoney(kpis.revenue_per_attendee, 2)} per attendee` },
-    { label: 'Average Occupancy', value: fmtPctRatio(kpis.avg_occupancy_rate), note: `Capacity ${fmtInt(holisticAnalysis?.meta?.stadium_capacity || STADIUM_CAPACITY)}` },
+    { label: 'Average Occupancy', value: fmtPctRatio(kpis.avg_occupancy_rate), note: `Capacity ${fmtInt(stadiumCapacity)}` },
     { label: 'Trend per Game', value: fmtNum(kpis.attendance_trend_per_game, 2), note: 'OLS slope estimate' },
-    { label: 'Forecast Fit (R²)', value: fmtNum(kpis.forecast_r_squared, 4), note: 'In-sample explanatory fit' },
+    { label: 'Trend Fit (R²)', value: fmtNum(kpis.forecast_r_squared, 4), note: 'In-sample fit of the linear trend' },
     { label: 'Merch Units / 1K', value: fmtNum(kpis.merch_units_per_1000_attendees, 2), note: 'Commercial attachment proxy' },
   ];
 
@@ -311,7 +333,6 @@ function Dashboard() {
         forecastChart={forecastChart}
         chartBaseOptions={chartBaseOptions}
         forecast={forecast}
-        kpis={kpis}
       />
 
       <PromotionSection
@@ -3,12 +3,14 @@ import { Line } from 'react-chartjs-2';
 import { Panel } from '../Shared';
 import { fmtInt, fmtNum } from '../utils';
 
-function ForecastSection({ forecastChart, chartBaseOptions, forecast, kpis }) {
+function ForecastSection({ forecastChart, chartBaseOptions, forecast }) {
+  const modelLabel = forecast.model_label || 'Selected model';
+  const modelMape = forecast.backtest?.models?.[forecast.model];
   return (
     <div className="two-col-layout">
       <Panel
         title="Forecasting and Uncertainty"
-        subtitle="Interpretable OLS baseline with 3-game outlook and 80% prediction intervals for planning under uncertainty."
+        subtitle={`${modelLabel} forecast, chosen by backtest error, with 3-game outlook and 80% prediction intervals for planning under uncertainty.`}
       >
         <div className="chart-box lg"><Line data={forecastChart} options={chartBaseOptions} /></div>
         <div className="table-wrap compact">
@@ -35,22 +37,24 @@ function ForecastSection({ forecastChart, chartBaseOptions, forecast, kpis }) {
 
       <Panel
         title="Model Framing"
-        subtitle="Why a simple model? This portfolio intentionally emphasizes interpretability and communication."
-        right={<span className="soft-pill">R² = {fmtNum(kpis.forecast_r_squared, 4)}</span>}
+        subtitle="Why simple models? This portfolio intentionally emphasizes interpretability and communication."
+        right={<span className="soft-pill">{modelLabel} R² = {fmtNum(forecast.model_r_squared, 4)}</span>}
       >
         <div className="narrative-stack">
           <div className="info-card">
             <h3>Why this forecast model?</h3>
             <p>
-              A linear trend baseline is easy to audit and explain. It demonstrates model-building discipline, residual uncertainty handling,
-              and decision relevance without hiding assumptions inside a black-box model.
+              {modelLabel} had the lowest rolling-origin backtest error
+              {modelMape != null ? ` (MAPE ${fmtNum(modelMape, 2)}%)` : ''} among a linear trend, seasonal-naive, exponential smoothing and
+              a feature regression. Each candidate is easy to audit and explain, so the forecast stays decision-relevant without hiding
+              assumptions inside a black-box model.
             </p>
           </div>
           <div className="info-card alt">
             <h3>How to read the results</h3>
             <ul className="clean-list">
-              <li><strong>Slope per game:</strong> directional change in attendance across the season.</li>
-              <li><strong>R²:</strong> in-sample fit only; not a guarantee of future predictive accuracy.</li>
+              <li><strong>Slope per game:</strong> directional change in attendance across the season, from the linear trend.</li>
+              <li><strong>R²:</strong> in-sample fit of the selected model only; not a guarantee of future predictive accuracy.</li>
               <li><strong>Prediction interval:</strong> planning range for staffing, inventory, and media pacing.</li>
             </ul>
           </div>
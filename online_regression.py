@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+
+SUM_FIELDS = ("n", "sum_x", "sum_y", "sum_xy", "sum_xx", "sum_yy")
+
+
+def _sum_of_squares(m):
+    return m * (m + 1) * (2 * m + 1) // 6
+
+
+class RegressionSums:
+    # Running sums for an OLS fit of y against its 1-based position x. With
+    # integer y the sums stay exact Python ints, so appending values one at a
+    # time and summing a whole series in one go give bit-identical fits.
+
+    __slots__ = SUM_FIELDS
+
+    def __init__(self, n=0, sum_x=0, sum_y=0, sum_xy=0, sum_xx=0, sum_yy=0):
+        self.n = n
+        self.sum_x = sum_x
+        self.sum_y = sum_y
+        self.sum_xy = sum_xy
+        self.sum_xx = sum_xx
+        self.sum_yy = sum_yy
+
+    @classmethod
+    def from_values(cls, values):
+        sums = cls()
+        sums.extend(values)
+        return sums
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*(getattr(row, field) for field in SUM_FIELDS))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in SUM_FIELDS}
+
+    def add(self, y):
+        self.n += 1
+        self.sum_x += self.n
+        self.sum_y += y
+        self.sum_xy += self.n * y
+        self.sum_xx += self.n * self.n
+        self.sum_yy += y * y
+
+    def extend(self, values):
+        ys = values if isinstance(values, np.ndarray) else np.asarray(values)
+        if not ys.size:
+            return
+        first = self.n + 1
+        last = self.n + ys.size
+
+        if np.issubdtype(ys.dtype, np.integer):
+            peak = int(np.abs(ys).max())
+            if max(peak * last * last, peak * peak * ys.size) < 2**62:
+                # Every partial sum fits in int64, so NumPy is still exact.
+                x = np.arange(first, last + 1, dtype=np.int64)
+                ys = ys.astype(np.int64)
+                sum_y, sum_xy, sum_yy = int(ys.sum()), int(x @ ys), int(ys @ ys)
+            else:
+                ys = ys.tolist()
+                sum_y = sum(ys)
+                sum_xy = sum(x * y for x, y in zip(range(first, last + 1), ys))
+                sum_yy = sum(y * y for y in ys)
+        else:
+            x = np.arange(first, last + 1, dtype=float)
+            ys = ys.astype(float)
+            sum_y, sum_xy, sum_yy = float(ys.sum()), float(x @ ys), float(ys @ ys)
+
+        self.sum_x += (first + last) * (last - first + 1) // 2
+        self.sum_xx += _sum_of_squares(last) - _sum_of_squares(first - 1)
+        self.sum_y += sum_y
+        self.sum_xy += sum_xy
+        self.sum_yy += sum_yy
+        self.n = last
+
+    def fit(self):
+        # Returns (slope, intercept, r_squared, residual_std_error). The
+        # centred sums are formed as n * S, which is exact for integer data.
+        n = self.n
+        if n < 2:
+            return 0.0, float(self.sum_y), 0.0, 0.0
+
+        sxx = n * self.sum_xx - self.sum_x * self.sum_x
+        sxy = n * self.sum_xy - self.sum_x * self.sum_y
+        syy = n * self.sum_yy - self.sum_y * self.sum_y
+        slope = sxy / sxx
+        intercept = self.sum_y / n - slope * (self.sum_x / n)
+
+        unexplained = max(0, syy * sxx - sxy * sxy)
+        sse = unexplained / (sxx * n)
+        r_squared = 1 - unexplained / (sxx * syy) if syy else 0.0
+        residual_std_error = math.sqrt(sse / max(1, n - 2))
+        return slope, intercept, r_squared, residual_std_error
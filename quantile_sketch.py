@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+
+# Centroid budget of every persisted digest. A digest keeps on the order of
+# `compression` centroids however many values it has seen. Below about
+# 2 * compression / pi (~127) values of equal weight no two of them can share
+# a centroid, so e.g. a season's attendance quantiles stay exact.
+DEFAULT_COMPRESSION = 200
+_HEADER = 6
+
+
+def max_rank_error(q, compression=DEFAULT_COMPRESSION):
+    # Bound on the rank error of quantile(q), as a fraction of the total
+    # weight: a quantile is read off the centroid covering its rank, and the
+    # k1 scale function caps a merged centroid's share of the weight at about
+    # 2*pi/compression * sqrt(q(1-q)). A value that alone outweighs the cap
+    # stays its own centroid and is exact.
+    q = min(max(q / 100, 0.0), 1.0)
+    return 2 * math.pi / compression * math.sqrt(q * (1 - q))
+
+
+class TDigest:
+    # Merging t-digest (Dunning & Ertl) over weighted values: sorted centroids
+    # (mean, weight) whose sizes are limited by the k1 scale function, so they
+    # stay small near the tails and only grow mid-distribution. The exact
+    # count, mean, M2, min and max ride alongside. Digests merge by
+    # compressing the union of their centroids, so per-game digests roll up
+    # into segments and seasons, and season digests into any set of partitions.
+
+    __slots__ = ("compression", "means", "weights", "count", "mean", "_m2", "min", "max")
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.count = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def from_values(cls, values, weights=None, compression=DEFAULT_COMPRESSION):
+        digest = cls(compression)
+        digest.extend(values, weights)
+        return digest
+
+    @classmethod
+    def merge_all(cls, digests, compression=DEFAULT_COMPRESSION):
+        merged = cls(compression)
+        for digest in digests:
+            merged._absorb_moments(digest.count, digest.mean, digest._m2, digest.min, digest.max)
+        merged._compress(
+            np.concatenate([merged.means, *(d.means for d in digests)]),
+            np.concatenate([merged.weights, *(d.weights for d in digests)]),
+        )
+        return merged
+
+    def extend(self, values, weights=None):
+        values = np.asarray(values, dtype=float)
+        weights = np.ones(values.size) if weights is None else np.asarray(weights, dtype=float)
+        keep = weights > 0
+        values, weights = values[keep], weights[keep]
+        if not values.size:
+            return
+        count = float(weights.sum())
+        mean = float(np.dot(values, weights) / count)
+        m2 = float(np.dot(weights, (values - mean) ** 2))
+        self._absorb_moments(count, mean, m2, float(values.min()), float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, weights]))
+
+    def add(self, value, weight=1):
+        self.extend([value], [weight])
+
+    def merge(self, other):
+        self._absorb_moments(other.count, other.mean, other._m2, other.min, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _absorb_moments(self, count, mean, m2, low, high):
+        if not count:
+            return
+        if not self.count:
+            self.count, self.mean, self._m2, self.min, self.max = count, mean, m2, low, high
+            return
+        # Chan et al. pairwise combination, as StreamingDistribution does.
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def _compress(self, means, weights):
+        if not means.size:
+            self.means, self.weights = means, weights
+            return
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order].tolist(), weights[order].tolist()
+        total = sum(weights)
+        scale = self.compression / (2 * math.pi)
+        out_means, out_weights = [], []
+        before = 0.0
+        k_before = scale * math.asin(-1.0)
+        current_mean, current_weight = means[0], weights[0]
+        for mean, weight in zip(means[1:], weights[1:]):
+            q_after = min(1.0, (before + current_weight + weight) / total)
+            if scale * math.asin(2 * q_after - 1) - k_before <= 1:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+                continue
+            out_means.append(current_mean)
+            out_weights.append(current_weight)
+            before += current_weight
+            k_before = scale * math.asin(min(1.0, 2 * before / total - 1))
+            current_mean, current_weight = mean, weight
+        out_means.append(current_mean)
+        out_weights.append(current_weight)
+        self.means = np.asarray(out_means)
+        self.weights = np.asarray(out_weights)
+
+    def quantile(self, q):
+        # q in percent, on the same rank scale as np.percentile's linear
+        # method: rank (count - 1) * q / 100 of the values, expanded by weight.
+        # A rank inside a centroid reads its mean; a rank between two centroids
+        # interpolates their means, so singletons reproduce np.percentile.
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 100:
+            return self.max
+        rank = (self.count - 1) * (q / 100)
+        last = np.cumsum(self.weights) - 1
+        i = min(int(np.searchsorted(last, rank, side="left")), last.size - 1)
+        if i == 0 or last[i] - self.weights[i] + 1 <= rank:
+            return float(self.means[i])
+        weight = rank - last[i - 1]
+        return float(self.means[i - 1]) * (1 - weight) + float(self.means[i]) * weight
+
+    percentile = quantile
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def summary(self):
+        if not self.count:
+            return None
+        return {
+            "count": int(self.count) if float(self.count).is_integer() else self.count,
+            "mean": self.mean,
+            "std_dev": self.std_dev,
+            "min": self.min,
+            "max": self.max,
+            "median": self.quantile(50),
+            "q1": self.quantile(25),
+            "q3": self.quantile(75),
+            "p10": self.quantile(10),
+            "p90": self.quantile(90),
+        }
+
+    def to_bytes(self):
+        header = [self.compression, self.count, self.mean, self._m2, self.min, self.max]
+        return np.concatenate([np.asarray(header, dtype=float), self.means, self.weights]).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        values = np.frombuffer(data, dtype=float)
+        compression, count, mean, m2, low, high = values[:_HEADER].tolist()
+        digest = cls(int(compression))
+        digest.count, digest.mean, digest._m2, digest.min, digest.max = count, mean, m2, low, high
+        centroids = (values.size - _HEADER) // 2
+        digest.means = values[_HEADER : _HEADER + centroids].copy()
+        digest.weights = values[_HEADER + centroids :].copy()
+        return digest
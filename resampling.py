@@ -0,0 +1,154 @@
+import numpy as np
+
+DEFAULT_ITERATIONS = 2000
+DEFAULT_SEED = 42
+
+# Upper bound on elements in one resample index matrix; larger jobs are drawn in
+# row blocks so memory stays flat as the number of games grows.
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=float)
+
+
+def _block_rows(iterations, width):
+    # Block size depends only on the problem shape, so a given seed always walks
+    # the generator stream the same way and results stay reproducible.
+    return max(1, min(iterations, MAX_BLOCK_ELEMENTS // max(1, width)))
+
+
+def bootstrap_mean_diffs(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    a_vals = _as_array(sample_a)
+    b_vals = _as_array(sample_b)
+    if not a_vals.size or not b_vals.size:
+        return np.zeros(0)
+
+    rng = np.random.default_rng(seed)
+    diffs = np.empty(iterations)
+    step = _block_rows(iterations, a_vals.size + b_vals.size)
+    for start in range(0, iterations, step):
+        rows = min(step, iterations - start)
+        idx_a = rng.integers(0, a_vals.size, size=(rows, a_vals.size))
+        idx_b = rng.integers(0, b_vals.size, size=(rows, b_vals.size))
+        diffs[start:start + rows] = a_vals[idx_a].mean(axis=1) - b_vals[idx_b].mean(axis=1)
+    return diffs
+
+
+def bootstrap_means(sample, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    vals = _as_array(sample)
+    if not vals.size:
+        return np.zeros(0)
+
+    rng = np.random.default_rng(seed)
+    means = np.empty(iterations)
+    step = _block_rows(iterations, vals.size)
+    for start in range(0, iterations, step):
+        rows = min(step, iterations - start)
+        means[start:start + rows] = vals[rng.integers(0, vals.size, size=(rows, vals.size))].mean(axis=1)
+    return means
+
+
+def bootstrap_diff_ci(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    diffs = bootstrap_mean_diffs(sample_a, sample_b, iterations=iterations, seed=seed)
+    if not diffs.size:
+        return 0.0, 0.0
+
+    diffs.sort()
+    lower = diffs[int(0.1 * diffs.size)]
+    upper = diffs[int(0.9 * diffs.size)]
+    return float(lower), float(upper)
+
+
+def permutation_mean_diffs(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    a_vals = _as_array(sample_a)
+    b_vals = _as_array(sample_b)
+    if not a_vals.size or not b_vals.size:
+        return np.zeros(0)
+
+    pooled = np.concatenate([a_vals, b_vals])
+    total = pooled.sum()
+    size_a = a_vals.size
+    size_b = b_vals.size
+
+    rng = np.random.default_rng(seed)
+    diffs = np.empty(iterations)
+    step = _block_rows(iterations, pooled.size)
+    for start in range(0, iterations, step):
+        rows = min(step, iterations - start)
+        shuffled = rng.permuted(np.broadcast_to(pooled, (rows, pooled.size)), axis=1)
+        sum_a = shuffled[:, :size_a].sum(axis=1)
+        diffs[start:start + rows] = sum_a / size_a - (total - sum_a) / size_b
+    return diffs
+
+
+def permutation_p_value(sample_a, sample_b, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    a_vals = _as_array(sample_a)
+    b_vals = _as_array(sample_b)
+    if not a_vals.size or not b_vals.size:
+        return 1.0
+
+    # Observed statistic uses the same sum-based arithmetic as the shuffles so
+    # the identity permutation compares equal instead of drifting by rounding.
+    sum_a = a_vals.sum()
+    total = sum_a + b_vals.sum()
+    observed = abs(sum_a / a_vals.size - (total - sum_a) / b_vals.size)
+
+    diffs = np.abs(permutation_mean_diffs(a_vals, b_vals, iterations=iterations, seed=seed))
+    tolerance = 1e-9 * max(1.0, observed)
+    extreme_count = int(np.count_nonzero(diffs >= observed - tolerance))
+    return (extreme_count + 1) / (iterations + 1)
+
+
+def joint_permutation_test(values, group_labels, groups, iterations=DEFAULT_ITERATIONS, seed=DEFAULT_SEED):
+    # Scores every group against the rest from one shared set of shuffles and
+    # returns raw and single-step max-T (Westfall-Young) adjusted p-values.
+    vals = _as_array(values)
+    labels = np.asarray(list(group_labels), dtype=object)
+    groups = list(groups)
+    if not vals.size or not groups:
+        return {}
+
+    membership = (labels[:, None] == np.asarray(groups, dtype=object)[None, :]).astype(float)
+    sizes = membership.sum(axis=0)
+    others = vals.size - sizes
+    testable = (sizes > 0) & (others > 0)
+    if not testable.any():
+        return {}
+
+    membership = membership[:, testable]
+    sizes = sizes[testable]
+    others = others[testable]
+    tested = [group for group, ok in zip(groups, testable) if ok]
+
+    # The pooled variance is invariant under relabelling, so scaling each
+    # |difference| by sqrt(1/n_a + 1/n_b) puts every group on the same footing.
+    scale = np.sqrt(1.0 / sizes + 1.0 / others)
+    total = vals.sum()
+
+    def _abs_diffs(sums):
+        return np.abs(sums / sizes - (total - sums) / others)
+
+    observed = _abs_diffs(vals @ membership)
+    observed_t = observed / scale
+    tolerance = 1e-9 * np.maximum(1.0, observed)
+
+    rng = np.random.default_rng(seed)
+    extreme = np.zeros(len(tested), dtype=np.int64)
+    max_t_extreme = np.zeros(len(tested), dtype=np.int64)
+    step = _block_rows(iterations, vals.size)
+    for start in range(0, iterations, step):
+        rows = min(step, iterations - start)
+        shuffled = rng.permuted(np.broadcast_to(vals, (rows, vals.size)), axis=1)
+        diffs = _abs_diffs(shuffled @ membership)
+        extreme += np.count_nonzero(diffs >= observed - tolerance, axis=0)
+        max_t = (diffs / scale).max(axis=1)
+        max_t_extreme += np.count_nonzero(max_t[:, None] >= observed_t - tolerance / scale, axis=0)
+
+    return {
+        group: {
+            "p_value": (int(extreme[i]) + 1) / (iterations + 1),
+            "max_t_adjusted_p_value": (int(max_t_extreme[i]) + 1) / (iterations + 1),
+        }
+        for i, group in enumerate(tested)
+    }
@@ -1,106 +1,216 @@
+import argparse
 import random
+import time
 
 import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from models import Base, Game, MerchSale, Promotion, Ticket
-
-DB_URL = "sqlite:///nashville_sc_business.db"
+from sqlalchemy import delete, func, select
+
+from database import DATABASE_URL, create_db_engine
+from migrations import (
+    DEFAULT_CLUB_NAME,
+    DEFAULT_VENUE_CAPACITY,
+    ensure_club,
+    partition_game_ids,
+    rebuild_anomaly_labels,
+    rebuild_attendance_trend,
+    rebuild_game_summary,
+    rebuild_quantile_sketches,
+    register_venues,
+    upgrade,
+)
+from models import AnomalyLabel, Game, GameSummary, MerchSale, Promotion, QuantileSketch, Ticket
+
+DB_URL = DATABASE_URL
+CSV_PATH = "Attendance.csv"
 RNG_SEED = 42
+CHUNK_SIZE = 50_000
+
+PROMO_NAMES = [
+    "Family Night",
+    "Military Appreciation",
+    "Student Discount",
+    "Fan Giveaway",
+]
+MERCH_ITEMS = ["Jersey", "Scarf", "Hat", "Poster"]
+MERCH_PRICE = {"Jersey": 90, "Scarf": 25, "Hat": 30, "Poster": 15}
 
 
 def normalize_text(value):
     return str(value).strip() if value is not None else ""
 
 
-def main():
-    random.seed(RNG_SEED)
-    engine = create_engine(DB_URL)
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    try:
-        # Idempotent reset so the DB exactly matches Attendance.csv rows.
-        session.query(Ticket).delete()
-        session.query(MerchSale).delete()
-        session.query(Game).delete()
-        session.query(Promotion).delete()
-        session.commit()
-
-        promo_names = [
-            "Family Night",
-            "Military Appreciation",
-            "Student Discount",
-            "Fan Giveaway",
-        ]
-        promotions = [Promotion(name=name, description=f"{name} special event") for name in promo_names]
-        session.add_all(promotions)
-        session.commit()
-
-        promo_ids = [p.id for p in promotions]
-
-        data = pd.read_csv("Attendance.csv")
+def read_attendance_chunks(csv_path, chunk_size=CHUNK_SIZE):
+    for data in pd.read_csv(csv_path, chunksize=chunk_size):
         data["game_date"] = pd.to_datetime(data["game_date"]).dt.date
         data["attendance"] = pd.to_numeric(data["attendance"])
         data["opponent"] = data["opponent"].astype(str).str.strip()
         data["competition"] = data["competition"].astype(str).str.strip()
         data["venue"] = data["venue"].astype(str).str.strip()
-
-        games = []
-        for _, row in data.iterrows():
-            game = Game(
-                game_date=row["game_date"],
-                opponent=normalize_text(row["opponent"]),
-                attendance=int(row["attendance"]),
-                competition=normalize_text(row["competition"]),
-                venue=normalize_text(row["venue"]),
-                promotion_id=random.choice(promo_ids),
+        yield data
+
+
+def read_partition_keys(csv_path):
+    data = pd.read_csv(csv_path, usecols=["game_date", "venue"])
+    seasons = sorted(int(year) for year in pd.to_datetime(data["game_date"]).dt.year.unique())
+    venues = sorted({normalize_text(venue) for venue in data["venue"]})
+    return seasons, venues
+
+
+def ticket_rows(game_id, total_attendance, next_id):
+    general = int(total_attendance * 0.65)
+    season = int(total_attendance * 0.20)
+    group = int(total_attendance * 0.10)
+    vip = total_attendance - general - season - group
+    lines = [
+        ("General Admission", general, general * 35),
+        ("VIP", vip, vip * 100),
+        ("Season Ticket", season, season * 50),
+        ("Group", group, group * 25),
+    ]
+    return [
+        {"id": next_id + i, "game_id": game_id, "type": ticket_type, "quantity": quantity, "revenue": revenue}
+        for i, (ticket_type, quantity, revenue) in enumerate(lines)
+    ]
+
+
+def merch_rows(game_id, total_attendance, next_id):
+    merch_buyers_cap = int(total_attendance * 0.20)
+    rows = []
+    for i, item in enumerate(MERCH_ITEMS):
+        quantity = random.randint(0, merch_buyers_cap)
+        rows.append(
+            {
+                "id": next_id + i,
+                "game_id": game_id,
+                "item": item,
+                "quantity": quantity,
+                "total_revenue": quantity * MERCH_PRICE[item],
+            }
+        )
+    return rows
+
+
+def _next_id(conn, model):
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def main(
+    db_url=DB_URL,
+    csv_path=CSV_PATH,
+    chunk_size=CHUNK_SIZE,
+    club=DEFAULT_CLUB_NAME,
+    venue_capacity=DEFAULT_VENUE_CAPACITY,
+):
+    random.seed(RNG_SEED)
+    engine = create_db_engine(db_url)
+    upgrade(engine)
+    seasons, venues = read_partition_keys(csv_path)
+    started = time.perf_counter()
+    rows_written = 0
+    games_inserted = 0
+
+    # Everything runs in one transaction with executemany inserts. Ids are
+    # assigned explicitly in the same order the per-row ORM seeding produced
+    # them, and the RNG is consumed in the same order (every promotion draw
+    # first, then merch quantities game by game), so output is unchanged.
+    with engine.begin() as conn:
+        # Idempotent reset of this club's seasons in Attendance.csv, so they
+        # exactly match its rows; other clubs and seasons are left alone.
+        club_id = ensure_club(conn, club)
+        partitions = [(club_id, season) for season in seasons]
+        for model in (GameSummary, AnomalyLabel, QuantileSketch, Ticket, MerchSale):
+            conn.execute(delete(model).where(model.game_id.in_(partition_game_ids(partitions))))
+        conn.execute(delete(Game).where(Game.id.in_(partition_game_ids(partitions))))
+        register_venues(conn, club_id, venues, venue_capacity)
+
+        # Promotions are shared by every club: reuse the stored ones by name.
+        promo_by_name = dict(
+            conn.execute(select(Promotion.name, Promotion.id).where(Promotion.name.in_(PROMO_NAMES))).all()
+        )
+        missing = [name for name in PROMO_NAMES if name not in promo_by_name]
+        promo_start = _next_id(conn, Promotion)
+        if missing:
+            conn.execute(
+                Promotion.__table__.insert(),
+                [
+                    {"id": promo_start + i, "name": name, "description": f"{name} special event"}
+                    for i, name in enumerate(missing)
+                ],
             )
-            games.append(game)
-
-        session.add_all(games)
-        session.commit()
-
-        merch_items = ["Jersey", "Scarf", "Hat", "Poster"]
-        merch_price = {"Jersey": 90, "Scarf": 25, "Hat": 30, "Poster": 15}
-
-        for game in games:
-            total_attendance = int(game.attendance)
-            general = int(total_attendance * 0.65)
-            season = int(total_attendance * 0.20)
-            group = int(total_attendance * 0.10)
-            vip = total_attendance - general - season - group
-
-            tickets = [
-                Ticket(game_id=game.id, type="General Admission", quantity=general, revenue=general * 35),
-                Ticket(game_id=game.id, type="VIP", quantity=vip, revenue=vip * 100),
-                Ticket(game_id=game.id, type="Season Ticket", quantity=season, revenue=season * 50),
-                Ticket(game_id=game.id, type="Group", quantity=group, revenue=group * 25),
-            ]
-            session.add_all(tickets)
-
-            merch_buyers_cap = int(total_attendance * 0.20)
-            for item in merch_items:
-                quantity = random.randint(0, merch_buyers_cap)
-                total_revenue = quantity * merch_price[item]
-                session.add(
-                    MerchSale(
-                        game_id=game.id,
-                        item=item,
-                        quantity=quantity,
-                        total_revenue=total_revenue,
-                    )
+            promo_by_name.update((name, promo_start + i) for i, name in enumerate(missing))
+        promo_ids = [promo_by_name[name] for name in PROMO_NAMES]
+        rows_written += len(missing)
+
+        first_game_id = _next_id(conn, Game)
+        for data in read_attendance_chunks(csv_path, chunk_size):
+            games = [
+                {
+                    "id": first_game_id + games_inserted + i,
+                    "game_date": game_date,
+                    "opponent": normalize_text(opponent),
+                    "attendance": int(attendance),
+                    "competition": normalize_text(competition),
+                    "venue": normalize_text(venue),
+                    "season": game_date.year,
+                    "club_id": club_id,
+                    "promotion_id": random.choice(promo_ids),
+                }
+                for i, (game_date, opponent, attendance, competition, venue) in enumerate(
+                    zip(data["game_date"], data["opponent"], data["attendance"], data["competition"], data["venue"])
                 )
-
-        session.commit()
-        print("Database reset and seeded from Attendance.csv")
-        print(f"Games inserted: {len(games)}")
-
-    finally:
-        session.close()
+            ]
+            if games:
+                conn.execute(Game.__table__.insert(), games)
+            games_inserted += len(games)
+
+        next_ticket_id = _next_id(conn, Ticket)
+        next_merch_id = _next_id(conn, MerchSale)
+        game_id = first_game_id
+        for data in read_attendance_chunks(csv_path, chunk_size):
+            tickets = []
+            merch = []
+            for attendance in data["attendance"]:
+                total_attendance = int(attendance)
+                game_tickets = ticket_rows(game_id, total_attendance, next_ticket_id)
+                game_merch = merch_rows(game_id, total_attendance, next_merch_id)
+                tickets.extend(game_tickets)
+                merch.extend(game_merch)
+                next_ticket_id += len(game_tickets)
+                next_merch_id += len(game_merch)
+                game_id += 1
+            if tickets:
+                conn.execute(Ticket.__table__.insert(), tickets)
+                conn.execute(MerchSale.__table__.insert(), merch)
+            rows_written += len(tickets) + len(merch)
+
+        rows_written += rebuild_game_summary(conn, partitions)
+        rebuild_attendance_trend(conn, partitions)
+        rebuild_anomaly_labels(conn, partitions)
+        rebuild_quantile_sketches(conn, partitions)
+
+    rows_written += games_inserted
+    elapsed = time.perf_counter() - started
+    print(f"{club} seasons {', '.join(map(str, seasons))} reset and seeded from {csv_path}")
+    print(f"Games inserted: {games_inserted}")
+    print(f"Rows written: {rows_written} in {elapsed:.2f}s ({rows_written / elapsed if elapsed else 0:,.0f} rows/s)")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Reset one club's seasons from a CSV and seed synthetic ticket/merch data for them."
+    )
+    parser.add_argument("--db-url", default=DB_URL)
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--club", default=DEFAULT_CLUB_NAME)
+    parser.add_argument(
+        "--venue-capacity", type=int, default=DEFAULT_VENUE_CAPACITY, help="capacity for venues not registered yet"
+    )
+    args = parser.parse_args()
+    main(
+        db_url=args.db_url,
+        csv_path=args.csv,
+        chunk_size=args.chunk_size,
+        club=args.club,
+        venue_capacity=args.venue_capacity,
+    )
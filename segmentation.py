@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def _group(code_columns, sizes, length):
+    # Groups rows by several categorical code columns at once. Returns the
+    # group of every row, each group's code per column, and the first row of
+    # each group. Codes are packed into one int64 key (mixed radix) when the
+    # combination space fits, otherwise grouped on the stacked columns.
+    radices = [max(1, size) for size in sizes]
+    if int(np.prod(radices, dtype=object)) < 2**62:
+        combined = np.zeros(length, dtype=np.int64)
+        for codes, radix in zip(code_columns, radices):
+            combined = combined * radix + codes
+        keys, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        decoded = []
+        for radix in reversed(radices):
+            decoded.append((keys % radix).astype(np.int32))
+            keys = keys // radix
+        return inverse.reshape(-1), decoded[::-1], first
+    keys, first, inverse = np.unique(np.column_stack(code_columns), axis=0, return_index=True, return_inverse=True)
+    return inverse.reshape(-1), [keys[:, j].astype(np.int32) for j in range(keys.shape[1])], first
+
+
+class SegmentCells:
+    # Counts, sums and first-seen row for every combination of the given
+    # categorical dimensions that occurs in the frame, built in one scan.
+    # Any grouping over a subset of those dimensions is rolled up from the
+    # cells, which never outnumber the rows, without touching the frame again.
+
+    def __init__(self, dimensions, measures, categories, codes, counts, sums, first_seen):
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+        self.categories = categories
+        self.codes = codes
+        self.counts = counts
+        self.sums = sums
+        self.first_seen = first_seen
+
+    @classmethod
+    def from_frame(cls, frame, dimensions, measures):
+        categories = {name: frame[name].categories for name in dimensions}
+        inverse, cell_codes, first_rows = _group(
+            [frame[name].codes for name in dimensions], [len(categories[name]) for name in dimensions], len(frame)
+        )
+        cells = first_rows.size
+        return cls(
+            dimensions,
+            measures,
+            categories,
+            dict(zip(dimensions, cell_codes)),
+            np.bincount(inverse, minlength=cells),
+            {name: np.bincount(inverse, weights=frame[name], minlength=cells) for name in measures},
+            first_rows,
+        )
+
+    def __len__(self):
+        return self.counts.size
+
+    def aggregate(self, keys, mask=None):
+        # New cells over a subset of the dimensions, optionally from only the
+        # cells selected by a boolean mask.
+        keys = tuple(keys)
+        unknown = [key for key in keys if key not in self.codes]
+        if unknown:
+            raise KeyError(f"not a dimension of these cells: {', '.join(unknown)}")
+        selected = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+
+        # Visiting cells in first-seen order makes the first cell of each
+        # group (as np.unique reports it) also the group's earliest row.
+        order = selected[np.argsort(self.first_seen[selected], kind="stable")]
+        inverse, group_codes, first_cells = _group(
+            [self.codes[key][order] for key in keys], [len(self.categories[key]) for key in keys], order.size
+        )
+        groups = first_cells.size
+        return SegmentCells(
+            keys,
+            self.measures,
+            {key: self.categories[key] for key in keys},
+            dict(zip(keys, group_codes)),
+            np.bincount(inverse, weights=self.counts[order], minlength=groups).astype(np.int64),
+            {name: np.bincount(inverse, weights=self.sums[name][order], minlength=groups) for name in self.measures},
+            self.first_seen[order][first_cells],
+        )
+
+    def groups(self):
+        # One dict per cell in order of first appearance in the frame: labels
+        # (one per dimension), games, first_seen and summed measures.
+        return [
+            {
+                "labels": tuple(self.categories[key][int(self.codes[key][cell])] for key in self.dimensions),
+                "games": int(self.counts[cell]),
+                "first_seen": int(self.first_seen[cell]),
+                "sums": {name: float(values[cell]) for name, values in self.sums.items()},
+            }
+            for cell in np.argsort(self.first_seen, kind="stable").tolist()
+        ]
+
+    def rollup(self, keys):
+        return self.aggregate(keys).groups()
+
+
+def segment_groupings(frame, groupings, measures):
+    # Every grouping (a tuple of dimension names) from one scan over the
+    # union of their dimensions.
+    dimensions = list(dict.fromkeys(key for grouping in groupings for key in grouping))
+    cells = SegmentCells.from_frame(frame, dimensions, measures)
+    return {tuple(grouping): cells.rollup(grouping) for grouping in groupings}
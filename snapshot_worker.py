@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    # One immutable set of precomputed artifacts for a single data version.
+    __slots__ = ("version", "artifacts", "published_at", "compute_seconds")
+
+    def __init__(self, version, artifacts, compute_seconds):
+        self.version = version
+        self.artifacts = artifacts
+        self.published_at = time.time()
+        self.compute_seconds = compute_seconds
+
+    def age_seconds(self):
+        return time.time() - self.published_at
+
+
+class SnapshotWorker:
+    # Background thread that rebuilds analytics artifacts whenever the data
+    # version moves and publishes them with a single reference swap, so
+    # readers see either the previous snapshot or the new one, never a mix.
+    # Writers call trigger() to skip the rest of the poll interval.
+
+    def __init__(self, version_fn, build_fn, poll_seconds=1.0, name="analytics-snapshot"):
+        self._version_fn = version_fn
+        self._build_fn = build_fn
+        self._poll_seconds = poll_seconds
+        self._name = name
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._published = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._snapshot = None
+        self._seen_version = None
+        self._builds = 0
+        self._failures = 0
+        self._last_error = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def trigger(self):
+        self._wake.set()
+
+    def latest(self):
+        return self._snapshot
+
+    def wait(self, timeout=None):
+        return self._published.wait(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                version = self._version_fn()
+                self._seen_version = version
+                current = self._snapshot
+                if current is None or current.version != version:
+                    started = time.perf_counter()
+                    artifacts = self._build_fn(version)
+                    self._snapshot = Snapshot(version, artifacts, time.perf_counter() - started)
+                    self._builds += 1
+                    self._last_error = None
+                    self._published.set()
+                    # Data may have moved again while building; check at once.
+                    continue
+            except Exception as e:
+                self._failures += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.exception("analytics snapshot rebuild failed")
+            self._wake.wait(self._poll_seconds)
+
+    def status(self):
+        snapshot = self._snapshot
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "published": snapshot is not None,
+            "age_seconds": round(snapshot.age_seconds(), 3) if snapshot else None,
+            "compute_ms": round(snapshot.compute_seconds * 1000, 3) if snapshot else None,
+            "stale": snapshot is not None and self._seen_version != snapshot.version,
+            "builds": self._builds,
+            "failures": self._failures,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests never touch nashville_sc_business.db: app is imported against an
+# in-memory database, without the background snapshot worker.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ANALYTICS_PRECOMPUTE", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,44 @@
+import pytest
+
+import app
+from database import engine
+from migrations import upgrade
+
+GAME = {
+    "game_date": "2070-04-04",
+    "opponent": "Synthetic FC",
+    "attendance": 21000,
+    "competition": "MLS",
+    "venue": "Synthetic Park",
+    "tickets": [{"type": "GA", "quantity": 100, "revenue": 3000}],
+    "merch": [{"item": "Scarf", "quantity": 5, "total_revenue": 100}],
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    upgrade(engine)
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"attendance": 2**63},
+        {"attendance": 10**400},
+        {"attendance": 1e400},
+        {"season": 2**64},
+        {"tickets": [{"type": "GA", "quantity": 2**63, "revenue": 3000}]},
+        {"tickets": [{"type": "GA", "quantity": 100, "revenue": -(2**70)}]},
+        {"merch": [{"item": "Scarf", "quantity": 5, "total_revenue": 2**63}]},
+    ],
+)
+def test_out_of_range_integers_fail_only_their_item(client, bad):
+    response = client.post("/api/add_games", json=[dict(GAME, **bad), GAME])
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body["inserted"] == 1
+    assert [error["index"] for error in body["errors"]] == [0]
+    assert "must be an integer between" in body["errors"][0]["error"]
+
+    assert client.post("/api/add_game", json=dict(GAME, **bad)).status_code == 400
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+import app
+from anomaly_detection import DEMAND_RISK, DEMAND_SPIKE, MIN_HISTORY, AnomalyDetector
+from database import engine
+from migrations import upgrade
+from models import AnomalyLabel, Game
+
+ATTENDANCE = [21000, 26500, 19800, 24000, 29900, 23000, 27750]
+
+
+def expected_label(history, value):
+    low, high = np.percentile(history, [20, 80])
+    return DEMAND_RISK if value <= low else DEMAND_SPIKE if value >= high else None, float(low), float(high)
+
+
+def test_first_games_wait_for_history_then_are_labelled_together():
+    detector = AnomalyDetector()
+    for game_id, value in enumerate(ATTENDANCE[: MIN_HISTORY - 1], start=1):
+        assert detector.observe(game_id, value) == []
+
+    rows = detector.observe(MIN_HISTORY, ATTENDANCE[MIN_HISTORY - 1])
+    assert len(rows) == 2 * MIN_HISTORY
+    first = ATTENDANCE[:MIN_HISTORY]
+    for row in rows:
+        tag, low, high = expected_label(first, first[row["game_id"] - 1])
+        assert row["tag"] == tag
+        assert (row["low_threshold"], row["high_threshold"]) == pytest.approx((low, high))
+
+    # The next game is judged against the same games, the ones before it.
+    rows = detector.observe(MIN_HISTORY + 1, ATTENDANCE[MIN_HISTORY])
+    assert [row["game_id"] for row in rows] == [MIN_HISTORY + 1] * 2
+    assert rows[0]["tag"] == expected_label(first, ATTENDANCE[MIN_HISTORY])[0]
+
+
+def test_reloaded_detector_still_labels_held_back_games():
+    held_back = ATTENDANCE[: MIN_HISTORY - 2]
+    detector = AnomalyDetector.from_history(list(range(1, len(held_back) + 1)), held_back)
+    labelled = []
+    for game_id, value in enumerate(ATTENDANCE[len(held_back) : MIN_HISTORY], start=len(held_back) + 1):
+        labelled.extend(detector.observe(game_id, value))
+    assert sorted({row["game_id"] for row in labelled}) == list(range(1, MIN_HISTORY + 1))
+
+
+@pytest.fixture(scope="module")
+def client():
+    upgrade(engine)
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_early_season_games_are_backfilled_through_the_api(client, reload):
+    season = 2060 + reload
+    games = [
+        {
+            "game_date": (date(season, 3, 1) + timedelta(days=7 * i)).isoformat(),
+            "opponent": "Synthetic FC",
+            "attendance": attendance,
+            "competition": "MLS",
+            "venue": "Synthetic Park",
+        }
+        for i, attendance in enumerate(ATTENDANCE[:MIN_HISTORY])
+    ]
+    for game in games[:-2]:
+        assert client.post("/api/add_game", json=game).status_code == 201
+
+    def stored_labels():
+        with engine.connect() as conn:
+            return conn.execute(
+                select(Game.attendance, AnomalyLabel.mode, AnomalyLabel.tag)
+                .join(AnomalyLabel, AnomalyLabel.game_id == Game.id)
+                .where(Game.season == season)
+            ).all()
+
+    assert stored_labels() == []
+    if reload:
+        # A fresh process has no detector and rebuilds it from the stored games.
+        app.ANOMALY_DETECTORS._detectors.clear()
+    assert client.post("/api/add_games", json=games[-2:]).status_code == 201
+
+    labels = stored_labels()
+    assert len(labels) == 2 * MIN_HISTORY
+    first = ATTENDANCE[:MIN_HISTORY]
+    for attendance, _, tag in labels:
+        assert tag == expected_label(first, attendance)[0]
@@ -0,0 +1,129 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+import app
+from database import engine
+from migrations import upgrade
+from models import AttendanceTrend, Game
+from online_regression import RegressionSums
+
+
+def polyfit_reference(values):
+    # (slope, intercept, r_squared, residual_std_error) of the batch
+    # least-squares fit of y against its 1-based position.
+    y = np.asarray(values, dtype=float)
+    x = np.arange(1, y.size + 1, dtype=float)
+    slope, intercept = np.polyfit(x, y, 1)
+    residuals = y - (intercept + slope * x)
+    sse = float(residuals @ residuals)
+    sst = float((y - y.mean()) @ (y - y.mean()))
+    return slope, intercept, 1 - sse / sst if sst else 0.0, math.sqrt(sse / max(1, y.size - 2))
+
+
+def assert_fit_matches(values, sums):
+    for name, expected, actual in zip(
+        ("slope", "intercept", "r_squared", "residual_std_error"), polyfit_reference(values), sums.fit()
+    ):
+        assert math.isclose(expected, actual, rel_tol=1e-7, abs_tol=1e-6), (name, expected, actual)
+
+
+def random_series(rng):
+    n = int(rng.choice([2, 3, 4, rng.integers(5, 50), rng.integers(50, 3000)]))
+    shape = rng.choice(["noise", "trend", "constant", "spiky"])
+    base = int(rng.integers(0, 40000))
+    if shape == "constant":
+        return [base] * n
+    if shape == "trend":
+        step = int(rng.integers(-30, 30))
+        return [max(0, base + i * step + int(rng.integers(-500, 500))) for i in range(n)]
+    if shape == "spiky":
+        return [int(v) for v in rng.choice([0, base, 10**6], n)]
+    return [int(v) for v in rng.integers(0, 40000, n)]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_running_sums_match_batch_fit(seed):
+    rng = np.random.default_rng(seed)
+    values = random_series(rng)
+
+    bulk = RegressionSums.from_values(values)
+    running = RegressionSums()
+    for value in values:
+        running.add(value)
+    # Sums built from consecutive chunks, as appends to a stored row are.
+    cuts = sorted(int(c) for c in rng.integers(0, len(values) + 1, int(rng.integers(1, 5))))
+    chunked = RegressionSums()
+    for chunk in np.split(np.asarray(values, dtype=np.int64), cuts):
+        chunked.extend(chunk)
+
+    assert bulk.to_dict() == running.to_dict() == chunked.to_dict()
+    assert_fit_matches(values, running)
+
+
+def test_sums_stay_exact_beyond_int64():
+    # Large enough that the partial sums overflow int64, so extend falls
+    # back to Python ints; appending one by one must agree bit for bit.
+    values = np.random.default_rng(1).integers(0, 10**9, 200_000)
+    running = RegressionSums()
+    for value in values.tolist():
+        running.add(value)
+    assert RegressionSums.from_values(values).to_dict() == running.to_dict()
+    assert_fit_matches(values, running)
+
+
+def test_short_series():
+    assert RegressionSums().fit() == (0.0, 0.0, 0.0, 0.0)
+    assert RegressionSums.from_values([21000]).fit() == (0.0, 21000.0, 0.0, 0.0)
+
+
+@pytest.fixture(scope="module")
+def client():
+    upgrade(engine)
+    return app.app.test_client()
+
+
+def stored_season(season):
+    with engine.connect() as conn:
+        attendance = conn.execute(
+            select(Game.attendance).where(Game.season == season).order_by(Game.game_date, Game.id)
+        ).scalars().all()
+        trend = conn.execute(select(AttendanceTrend.__table__).where(AttendanceTrend.season == season)).one()
+    return attendance, RegressionSums.from_row(trend)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_persisted_sums_follow_appends_and_back_dated_rebuilds(client, seed):
+    # Games arrive in random date order, singly and in batches. Appends in
+    # date order extend the stored row; a back-dated game rebuilds the
+    # season. Either way the row fits the season's games in date order.
+    rng = np.random.default_rng(seed)
+    season = 2040 + seed
+    days = rng.permutation(120)[:40]
+    games = [
+        {
+            "game_date": (date(season, 2, 1) + timedelta(days=int(day))).isoformat(),
+            "opponent": "Synthetic FC",
+            "attendance": int(rng.integers(12000, 30000)),
+            "competition": "MLS",
+            "venue": "Synthetic Park",
+        }
+        for day in days
+    ]
+    position = 0
+    while position < len(games):
+        size = int(rng.integers(1, 6))
+        batch = games[position : position + size]
+        position += size
+        if len(batch) == 1:
+            assert client.post("/api/add_game", json=batch[0]).status_code == 201
+        else:
+            assert client.post("/api/add_games", json=batch).status_code == 201
+
+        attendance, stored = stored_season(season)
+        assert stored.to_dict() == RegressionSums.from_values(attendance).to_dict()
+        if len(attendance) >= 2:
+            assert_fit_matches(attendance, stored)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import resampling
+
+SAMPLE_A = [24100, 26350, 22980, 27410, 25020, 28890, 23760]
+SAMPLE_B = [21870, 23310, 24450, 20990, 22600, 25180]
+
+
+@pytest.fixture(params=[resampling.MAX_BLOCK_ELEMENTS, 40], ids=["one_block", "many_blocks"])
+def block_elements(request, monkeypatch):
+    # Small blocks draw the same iterations over several generator calls.
+    monkeypatch.setattr(resampling, "MAX_BLOCK_ELEMENTS", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "draw",
+    [
+        lambda seed: resampling.bootstrap_mean_diffs(SAMPLE_A, SAMPLE_B, iterations=500, seed=seed),
+        lambda seed: resampling.bootstrap_means(SAMPLE_A, iterations=500, seed=seed),
+        lambda seed: resampling.permutation_mean_diffs(SAMPLE_A, SAMPLE_B, iterations=500, seed=seed),
+    ],
+    ids=["bootstrap_mean_diffs", "bootstrap_means", "permutation_mean_diffs"],
+)
+def test_same_seed_same_draws(block_elements, draw):
+    first = draw(7)
+    assert np.array_equal(first, draw(7))
+    assert not np.array_equal(first, draw(8))
+
+
+def test_same_seed_same_inference(block_elements):
+    def run(seed):
+        labels = ["Fireworks"] * len(SAMPLE_A) + [None] * len(SAMPLE_B)
+        return (
+            resampling.bootstrap_diff_ci(SAMPLE_A, SAMPLE_B, iterations=500, seed=seed),
+            resampling.permutation_p_value(SAMPLE_A, SAMPLE_B, iterations=500, seed=seed),
+            resampling.joint_permutation_test(SAMPLE_A + SAMPLE_B, labels, ["Fireworks"], iterations=500, seed=seed),
+        )
+
+    assert run(7) == run(7)
+    assert run(7) != run(8)
@@ -0,0 +1,93 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import app
+
+PROMOTIONS = (None, "Family Night", "Fireworks", "Scarf Giveaway")
+
+
+@pytest.fixture(scope="module")
+def model():
+    # A season of synthetic games, a quarter of them without a promotion,
+    # run through the same effect and model builders as the API.
+    rng = np.random.default_rng(7)
+    rows = []
+    for i in range(48):
+        promotion = PROMOTIONS[i % len(PROMOTIONS)]
+        attendance = int(rng.integers(14000, 29000)) + (1500 if promotion == "Fireworks" else 0)
+        tickets_sold = int(attendance * rng.uniform(0.8, 0.95))
+        merch_units = int(attendance * rng.uniform(0.05, 0.2))
+        rows.append(
+            (
+                i + 1,
+                date(2025, 2, 22) + timedelta(days=7 * i),
+                f"Opponent {i % 9}",
+                attendance,
+                "MLS",
+                "Synthetic Park",
+                promotion,
+                tickets_sold * int(rng.integers(25, 60)),
+                tickets_sold,
+                merch_units * int(rng.integers(15, 45)),
+                merch_units,
+                30000,
+                2025,
+            )
+        )
+    frame = app._build_game_frame(rows)
+    return app._build_marketing_model(frame, app._compute_promotion_effects(frame))
+
+
+def _scalar_cells(model, promotions, base_attendance, media_spend, variable_cost):
+    # The scalar simulator over every cell, in the grid's row-major order.
+    cells = []
+    for promotion in promotions:
+        assumptions = app._marketing_assumptions(model, promotion)
+        for base in base_attendance.tolist():
+            for media in media_spend.tolist():
+                for var_cost in variable_cost.tolist():
+                    outputs = app._simulate_scenario(assumptions, base, media, var_cost)
+                    outputs.pop("margin_per_incremental_fan")
+                    cells.append(outputs)
+    return cells
+
+
+def test_model_has_negative_and_positive_uplifts(model):
+    uplifts = [assumptions["expected_uplift"] for assumptions in model["promotions"].values()]
+    assert len(uplifts) == len(PROMOTIONS) - 1
+    assert min(uplifts) < 0 < max(uplifts)
+
+
+def test_grid_matches_scalar_simulator(model):
+    # Zero spend and cost, and variable costs above revenue per attendee,
+    # reach the branches where ROI and the break-even figures are null.
+    promotions = [None, *sorted(model["promotions"]), "Unknown Promotion"]
+    base_attendance = np.array([0, 18000, 22000, 29999], dtype=np.int64)
+    media_spend = np.array([0.0, 1250.5, 40000.0, 250000.0])
+    variable_cost = np.array([0.0, 7.25, 35.0, 500.0])
+
+    grid = app._simulate_scenario_grid(model, promotions, base_attendance, media_spend, variable_cost)
+    cells = _scalar_cells(model, promotions, base_attendance, media_spend, variable_cost)
+
+    assert grid["count"] == len(cells) == len(promotions) * 4 * 4 * 4
+    assert grid["promotion_labels"][0] == "Blended historical avg"
+    for key in cells[0]:
+        column = grid["columns"][key]
+        for i, expected in enumerate(cells):
+            if expected[key] is None or column[i] is None:
+                assert column[i] == expected[key], (key, i)
+            else:
+                assert math.isclose(column[i], expected[key], rel_tol=1e-9, abs_tol=0.011), (key, i)
+
+
+@pytest.mark.parametrize(
+    "promotions",
+    [[{"name": "Family Night"}], ["Family Night", ["Fireworks"]], [7], "Family Night", []],
+)
+def test_grid_rejects_malformed_promotions(promotions):
+    response = app.app.test_client().post("/api/simulate_marketing/grid", json={"promotions": promotions})
+    assert response.status_code == 400
+    assert "promotions" in response.get_json()["error"]